@@ -0,0 +1,125 @@
+"""
+AutoCrate Artifact Store
+Optional on-disk store for generated export files, with a retention policy.
+
+Generation itself is in-memory; persisting is opt-in for deployments that
+want exports to be downloadable again later. Artifacts are content-addressed
+(a short SHA-256 prefix in front of the original filename), so storing the
+same export twice keeps one file. Files older than the retention period are
+removed, then the oldest files until the store is under its size cap; pruning
+runs at most once per PRUNE_INTERVAL on writes.
+
+Configuration (environment variables):
+    AUTOCRATE_ARTIFACT_DIR              Store directory; unset disables the store
+    AUTOCRATE_ARTIFACT_RETENTION_HOURS  Max artifact age (default: 168)
+    AUTOCRATE_ARTIFACT_MAX_BYTES        Max total size (default: 536870912)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+PRUNE_INTERVAL = 60.0
+
+# Stored names: 16 hex chars, underscore, sanitized original filename
+ARTIFACT_NAME_RE = re.compile(r"^[0-9a-f]{16}_[A-Za-z0-9._-]+$")
+
+
+def _safe_filename(filename: str) -> str:
+    name = os.path.basename(filename)
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name) or "artifact"
+
+
+class ArtifactStore:
+    """Content-addressed export files with age and size based retention"""
+
+    def __init__(self, root: Optional[str] = None, retention_hours: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        root = root if root is not None else os.environ.get("AUTOCRATE_ARTIFACT_DIR")
+        self.root = Path(root) if root else None
+        self.retention_seconds = 3600 * (retention_hours if retention_hours is not None else float(
+            os.environ.get("AUTOCRATE_ARTIFACT_RETENTION_HOURS", 168)))
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.environ.get("AUTOCRATE_ARTIFACT_MAX_BYTES", 512 * 1024 * 1024))
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.stored = 0
+        self.pruned = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def put(self, filename: str, content: bytes) -> Optional[str]:
+        """Persist content under a content-addressed name; returns the name (None if disabled)"""
+        if not self.enabled:
+            return None
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        name = f"{digest}_{_safe_filename(filename)}"
+        path = self.root / name
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                os.utime(path)  # refresh for retention
+            else:
+                tmp_path = path.with_name(f".{name}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, path)
+                self.stored += 1
+            if time.time() - self._last_prune >= PRUNE_INTERVAL:
+                self._prune_locked()
+        return name
+
+    def path_for(self, name: str) -> Optional[Path]:
+        """Path of a stored artifact, or None for unknown or malformed names"""
+        if not self.enabled or not ARTIFACT_NAME_RE.match(name):
+            return None
+        path = self.root / name
+        return path if path.is_file() else None
+
+    def prune(self) -> int:
+        with self._lock:
+            return self._prune_locked()
+
+    def _prune_locked(self) -> int:
+        self._last_prune = time.time()
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - self.retention_seconds
+        files = []
+        removed = 0
+        for path in self.root.iterdir():
+            if not path.is_file() or not ARTIFACT_NAME_RE.match(path.name):
+                continue
+            stat = path.stat()
+            if stat.st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self.pruned += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "root": str(self.root) if self.root else None,
+            "retention_hours": self.retention_seconds / 3600,
+            "max_bytes": self.max_bytes,
+            "stored": self.stored,
+            "pruned": self.pruned,
+        }
+
+
+artifact_store = ArtifactStore()
@@ -0,0 +1,122 @@
+"""
+AutoCrate BOM Export
+Streams bill-of-materials take-off lines as CSV or XLSX.
+
+Take-off lines come from autocrate.quantity_takeoff, one list per crate.
+Multi-crate exports consume crates one at a time from an async iterator:
+CSV rows are yielded as each crate's lines arrive, and XLSX rows go into an
+openpyxl write-only workbook (rows are flushed to temporary files instead of
+kept as cell objects). The finished workbook is spooled through a temporary
+file and streamed back in chunks.
+"""
+
+import asyncio
+import csv
+import io
+import tempfile
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from autocrate.crate_geometry import crate_glb
+from autocrate.quantity_takeoff import TAKEOFF_COLUMNS, summarize_takeoff, takeoff_from_components
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# "excel" is accepted for backwards compatibility with the old query default
+BOM_FORMATS = {"json": "json", "csv": "csv", "xlsx": "xlsx", "excel": "xlsx"}
+
+BOM_COLUMNS = ["crate"] + TAKEOFF_COLUMNS
+
+# Workbook spool stays in memory up to this size, then moves to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+CrateLines = Tuple[int, List[Dict[str, Any]]]  # (crate number, take-off lines)
+
+
+def crate_takeoff(**params: Any) -> List[Dict[str, Any]]:
+    """Calculate one crate's components and take off its BOM lines (runs in a worker)"""
+    from nx_expression_service import calculate_nx_components
+    return takeoff_from_components(calculate_nx_components(**params))
+
+
+def render_crate_glb(**params: Any) -> bytes:
+    """Calculate one crate's components and pack its instanced geometry (runs in a worker)"""
+    from nx_expression_service import calculate_nx_components
+    return crate_glb(calculate_nx_components(**params))
+
+
+def normalize_format(value: str) -> str:
+    try:
+        return BOM_FORMATS[value.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported BOM format '{value}' (use json, csv or xlsx)")
+
+
+def bom_row(crate: int, line: Dict[str, Any]) -> List[Any]:
+    return [crate] + [line.get(column) for column in TAKEOFF_COLUMNS]
+
+
+async def stream_csv(crates: AsyncIterator[CrateLines]) -> AsyncIterator[bytes]:
+    """CSV header, then each crate's rows as soon as that crate is taken off"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(BOM_COLUMNS)
+    async for crate, lines in crates:
+        for line in lines:
+            writer.writerow(bom_row(crate, line))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def build_xlsx(crates: AsyncIterator[CrateLines]):
+    """
+    Write-only workbook with a line-item sheet and a purchase summary sheet,
+    saved into a spooled temporary file positioned at the start.
+    """
+    if Workbook is None:
+        raise RuntimeError("XLSX export requires openpyxl")
+
+    workbook = Workbook(write_only=True)
+    items = workbook.create_sheet("BOM")
+    summary_sheet = workbook.create_sheet("Summary")
+    items.append(BOM_COLUMNS)
+
+    # Purchase totals are accumulated per crate so line items never need to be kept
+    totals: Dict[Tuple[str, str, str], float] = {}
+    async for crate, lines in crates:
+        for line in lines:
+            items.append(bom_row(crate, line))
+        for row in summarize_takeoff(lines):
+            key = (row["category"], row["material"], row["unit"])
+            totals[key] = totals.get(key, 0) + row["quantity"]
+
+    summary_sheet.append(["category", "material", "quantity", "unit"])
+    for (category, material, unit), quantity in sorted(totals.items()):
+        summary_sheet.append([category, material, round(quantity, 2), unit])
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    # Zipping the sheets is CPU-bound; keep it off the event loop
+    await asyncio.get_running_loop().run_in_executor(None, workbook.save, spool)
+    spool.seek(0)
+    return spool
+
+
+def iter_file(spool, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Read a spooled file in chunks and close it at the end"""
+    try:
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        spool.close()
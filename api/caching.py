@@ -0,0 +1,119 @@
+"""
+AutoCrate API Caching
+Canonical request keys and a thread-safe LRU shared by the API endpoints.
+
+Calculation and export results are a pure function of the request body, so
+identical requests (within a batch or across calls) reuse one result, and
+HTTP validators (ETags) can be derived from the request alone - a matching
+If-None-Match is answered without running the engine at all.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional
+
+from pydantic import BaseModel
+
+# Bump when calculation output changes so stale cache entries are not reused
+CACHE_SCHEMA_VERSION = "1"
+
+
+def canonical_request_key(request: BaseModel) -> str:
+    """Stable SHA-256 hex digest of a request model (field order independent)"""
+    payload = request.model_dump(mode="json")
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{CACHE_SCHEMA_VERSION}:{canonical}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe LRU cache with hit/miss counters"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def etag_for(namespace: str, key: str, weak: bool = False) -> str:
+    """ETag for a rendered response; weak when the body carries cosmetic volatility"""
+    tag = hashlib.sha256(f"{namespace}:{key}".encode("utf-8")).hexdigest()[:32]
+    return f'W/"{tag}"' if weak else f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 7232 3.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+@dataclass
+class RenderedBody:
+    """A fully serialized response body plus the headers that belong to it"""
+    body: bytes
+    media_type: str
+    etag: str
+    generated_at: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # content-encoding -> body
+
+
+# Engine results keyed by canonical request key
+calculation_cache = LRUCache(max_entries=512)
+
+# Generated NX expression file contents keyed by canonical request key
+nx_expression_cache = LRUCache(max_entries=128)
+
+# BOM take-off lines keyed by canonical request key
+takeoff_cache = LRUCache(max_entries=512)
+
+# Serialized response bodies keyed by (endpoint namespace, canonical request key, variant)
+rendered_body_cache = LRUCache(max_entries=256)
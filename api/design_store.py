@@ -0,0 +1,115 @@
+"""
+AutoCrate Design Store
+Compute-once design records with lazily derived, per-design cached artifacts.
+
+A web session usually calculates a design and then exports expressions, BOM,
+geometry and a report for the same spec. `POST /api/designs` runs the engine
+once; each artifact is derived from the stored result on first request and
+kept on the record until the design expires.
+
+Configuration (environment variables):
+    AUTOCRATE_DESIGN_TTL           Seconds since last access before eviction (default: 3600)
+    AUTOCRATE_DESIGN_MAX_ENTRIES   Max designs held in memory (default: 1000)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class DesignRecord:
+    """A calculated design and the artifacts derived from it so far"""
+    design_id: str
+    request: Any
+    result: Dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    _locks: Dict[str, asyncio.Lock] = field(default_factory=dict, repr=False)
+
+    def lock_for(self, name: str) -> asyncio.Lock:
+        if name not in self._locks:
+            self._locks[name] = asyncio.Lock()
+        return self._locks[name]
+
+
+class DesignStore:
+    """In-memory design records with TTL and size-bounded eviction"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.environ.get("AUTOCRATE_DESIGN_TTL", 3600))
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.environ.get("AUTOCRATE_DESIGN_MAX_ENTRIES", 1000))
+        self._records: "OrderedDict[str, DesignRecord]" = OrderedDict()
+        self.artifact_hits = 0
+        self.artifact_builds = 0
+        self.evictions = 0
+
+    def put(self, design_id: str, request: Any, result: Dict[str, Any]) -> DesignRecord:
+        self.evict_expired()
+        record = self._records.get(design_id)
+        if record is None:
+            record = DesignRecord(design_id=design_id, request=request, result=result)
+            self._records[design_id] = record
+        record.last_access = time.time()
+        self._records.move_to_end(design_id)
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+            self.evictions += 1
+        return record
+
+    def get(self, design_id: str) -> Optional[DesignRecord]:
+        self.evict_expired()
+        record = self._records.get(design_id)
+        if record is not None:
+            record.last_access = time.time()
+            self._records.move_to_end(design_id)
+        return record
+
+    async def artifact(self, record: DesignRecord, name: str,
+                       build: Callable[[DesignRecord], Awaitable[Any]]) -> Any:
+        """Return a named artifact, building it from the stored result on first use"""
+        if name in record.artifacts:
+            self.artifact_hits += 1
+            return record.artifacts[name]
+        async with record.lock_for(name):
+            if name not in record.artifacts:
+                self.artifact_builds += 1
+                record.artifacts[name] = await build(record)
+            else:
+                self.artifact_hits += 1
+        return record.artifacts[name]
+
+    def evict_expired(self) -> int:
+        """Drop designs idle for longer than the TTL; records are kept in access order"""
+        cutoff = time.time() - self.ttl_seconds
+        evicted = 0
+        while self._records:
+            oldest = next(iter(self._records.values()))
+            if oldest.last_access >= cutoff:
+                break
+            self._records.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "designs": len(self._records),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "artifact_builds": self.artifact_builds,
+            "artifact_hits": self.artifact_hits,
+            "evictions": self.evictions,
+        }
+
+    def artifact_names(self, record: DesignRecord) -> List[str]:
+        return sorted(record.artifacts)
+
+
+design_store = DesignStore()
@@ -0,0 +1,251 @@
+"""
+AutoCrate Compute Executor
+Runs CPU-bound crate calculations off the FastAPI event loop.
+
+Light calls (panel calculations) go to a thread pool, heavy exports (full NX
+expression generation) go to a warm process pool whose workers pre-import the
+calculation modules. Every submission is bounded by a per-request timeout and
+a per-pool queue-depth limit so a burst of requests fails fast instead of
+piling up behind the event loop.
+
+Configuration (environment variables):
+    AUTOCRATE_THREAD_WORKERS     Thread pool size (default: min(8, cpu + 4))
+    AUTOCRATE_PROCESS_WORKERS    Process pool size, 0 disables it (default: cpu count)
+    AUTOCRATE_REQUEST_TIMEOUT    Seconds to wait for a result (default: 30)
+    AUTOCRATE_MAX_QUEUE_DEPTH    Max in-flight jobs per pool (default: 64)
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(API_DIR)
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from autocrate.stage_timing import run_timed, record_stages
+
+logger = logging.getLogger(__name__)
+
+# Modules imported by every process worker before it accepts jobs
+WARM_MODULES = (
+    "autocrate.front_panel_logic",
+    "autocrate.back_panel_logic",
+    "autocrate.left_panel_logic",
+    "autocrate.top_panel_logic",
+    "autocrate.skid_logic",
+    "autocrate.floorboard_logic",
+    "autocrate.nx_expressions_generator",
+    "autocrate.stage_timing",
+    "autocrate.cut_list_optimizer",
+    "nx_expression_service",
+)
+
+
+class ExecutorBusyError(Exception):
+    """Raised when a pool already holds its maximum number of in-flight jobs"""
+
+
+class ExecutorTimeoutError(Exception):
+    """Raised when a job does not finish within the request timeout"""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class ExecutorConfig:
+    """Executor sizing and limits"""
+    thread_workers: int = field(default_factory=lambda: min(8, (os.cpu_count() or 1) + 4))
+    process_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    request_timeout: float = 30.0
+    max_queue_depth: int = 64
+
+    @classmethod
+    def from_env(cls) -> "ExecutorConfig":
+        defaults = cls()
+        return cls(
+            thread_workers=max(1, _env_int("AUTOCRATE_THREAD_WORKERS", defaults.thread_workers)),
+            process_workers=max(0, _env_int("AUTOCRATE_PROCESS_WORKERS", defaults.process_workers)),
+            request_timeout=_env_float("AUTOCRATE_REQUEST_TIMEOUT", defaults.request_timeout),
+            max_queue_depth=max(1, _env_int("AUTOCRATE_MAX_QUEUE_DEPTH", defaults.max_queue_depth)),
+        )
+
+
+def _warm_worker() -> None:
+    """Process pool initializer: make the API modules importable and load them once"""
+    for path in (PROJECT_ROOT, API_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    for module_name in WARM_MODULES:
+        try:
+            __import__(module_name)
+        except ImportError as e:
+            logger.warning("Worker could not pre-import %s: %s", module_name, e)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class ComputeExecutor:
+    """Thread pool for light calls, warm process pool for heavy exports"""
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        self.config = config or ExecutorConfig.from_env()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._depth = {"light": 0, "heavy": 0}
+        self._lock = threading.Lock()
+        # Flask calls start() lazily from request threads
+        self._start_lock = threading.Lock()
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Create the pools and spawn process workers ahead of the first request"""
+        with self._start_lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.config.thread_workers,
+                    thread_name_prefix="autocrate-calc"
+                )
+            if self._processes is None and self.config.process_workers > 0:
+                try:
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.config.process_workers,
+                        initializer=_warm_worker
+                    )
+                    for _ in range(self.config.process_workers):
+                        self._processes.submit(_noop)
+                except (OSError, NotImplementedError) as e:
+                    # Serverless platforms may not allow subprocesses; heavy jobs use threads
+                    logger.warning("Process pool unavailable, using threads for exports: %s", e)
+                    self._processes = None
+
+    def shutdown(self) -> None:
+        if self._threads is not None:
+            self._threads.shutdown(wait=False)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False)
+            self._processes = None
+
+    # ---------- submission ----------
+
+    async def run_light(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a short CPU-bound call on the thread pool"""
+        if self._threads is None:
+            self.start()
+        return await self._submit("light", self._threads, fn, args, kwargs)
+
+    async def run_heavy(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run an expensive export on the process pool (threads if no process pool)"""
+        if self._threads is None:
+            self.start()
+        pool = self._processes or self._threads
+        return await self._submit("heavy", pool, fn, args, kwargs)
+
+    def call_heavy(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Blocking variant of run_heavy for synchronous front ends (the Flask
+        server), so both servers share the same warm pool and limits.
+        """
+        if self._threads is None:
+            self.start()
+        pool = self._processes or self._threads
+        future = self._dispatch("heavy", pool, fn, args, kwargs)
+        try:
+            result, stages = future.result(timeout=self.config.request_timeout)
+        except FutureTimeoutError:
+            raise ExecutorTimeoutError(
+                f"Calculation exceeded {self.config.request_timeout:.0f}s timeout"
+            )
+        record_stages(stages)
+        return result
+
+    def _dispatch(self, kind: str, pool, fn: Callable[..., Any],
+                  args: tuple, kwargs: Dict[str, Any]):
+        """Reserve a queue slot and submit; the slot frees when the job finishes"""
+        with self._lock:
+            if self._depth[kind] >= self.config.max_queue_depth:
+                raise ExecutorBusyError(
+                    f"{kind} queue is full ({self.config.max_queue_depth} jobs in flight)"
+                )
+            self._depth[kind] += 1
+
+        # Workers capture engine stage timings and hand them back with the result
+        try:
+            future = pool.submit(run_timed, fn, *args, **kwargs)
+        except Exception:
+            self._release(kind)
+            raise
+        future.add_done_callback(lambda _: self._release(kind))
+        return future
+
+    async def _submit(self, kind: str, pool, fn: Callable[..., Any],
+                      args: tuple, kwargs: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future = self._dispatch(kind, pool, fn, args, kwargs)
+        try:
+            result, stages = await asyncio.wait_for(
+                asyncio.wrap_future(future, loop=loop),
+                timeout=self.config.request_timeout
+            )
+            record_stages(stages)
+            return result
+        except asyncio.TimeoutError:
+            # The worker keeps running; its slot frees up when it finishes
+            raise ExecutorTimeoutError(
+                f"Calculation exceeded {self.config.request_timeout:.0f}s timeout"
+            )
+
+    def _release(self, kind: str) -> None:
+        with self._lock:
+            self._depth[kind] -= 1
+
+    # ---------- introspection ----------
+
+    def queue_depth(self, kind: Optional[str] = None) -> Any:
+        with self._lock:
+            if kind is not None:
+                return self._depth[kind]
+            return dict(self._depth)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "thread_workers": self.config.thread_workers,
+            "process_workers": self.config.process_workers if self._processes else 0,
+            "request_timeout_s": self.config.request_timeout,
+            "max_queue_depth": self.config.max_queue_depth,
+            "queue_depth": self.queue_depth(),
+        }
+
+
+_executor: Optional[ComputeExecutor] = None
+
+
+def get_executor() -> ComputeExecutor:
+    """Return the process-wide executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ComputeExecutor()
+    return _executor
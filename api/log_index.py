@@ -0,0 +1,226 @@
+"""
+AutoCrate Web Log Query Index
+SQLite index of web log entries for `/api/logs/query`.
+
+The log writer hands every appended batch to the index, which inserts one row
+per entry with the filter columns (server time, level, category, session) and
+the original JSON line. Lookups by session, level/category or time range use
+B-tree indexes; message substring search uses an FTS5 trigram table when the
+SQLite build supports it, falling back to LIKE otherwise. Results are read
+with a cursor and streamed, so a query never loads a whole day into memory.
+
+The index is backfilled from the daily files (plain and gzip) the first time
+it is created.
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_FILENAME = "log_index.sqlite3"
+
+# Trigram FTS needs at least three characters; shorter substrings use LIKE
+MIN_FTS_QUERY = 3
+
+MAX_QUERY_LIMIT = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    server_ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    level INTEGER,
+    category TEXT,
+    session_id TEXT,
+    message TEXT,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_session ON entries (session_id, server_ts);
+CREATE INDEX IF NOT EXISTS entries_time ON entries (server_ts);
+CREATE INDEX IF NOT EXISTS entries_category ON entries (category, server_ts);
+CREATE INDEX IF NOT EXISTS entries_level ON entries (level, server_ts);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    message, content='entries', content_rowid='id', tokenize='trigram'
+);
+"""
+
+
+def _row(day: str, record: Dict[str, Any], line: str) -> Tuple:
+    return (
+        record.get("serverTimestamp") or record.get("timestamp") or "",
+        day,
+        record.get("level"),
+        record.get("category"),
+        record.get("sessionId"),
+        record.get("message"),
+        line,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class LogQueryIndex:
+    """Append-only SQLite index fed by the log writer"""
+
+    def __init__(self, log_dir: Path):
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.fts_enabled = False
+
+    # ---------- setup ----------
+
+    def open(self) -> bool:
+        """
+        Create or open the index. Returns True when it was just created and
+        backfilled from the existing log files.
+        """
+        with self._lock:
+            if self._conn is not None:
+                return False
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.exists()
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.fts_enabled = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 or the trigram tokenizer
+                self.fts_enabled = False
+            conn.commit()
+            self._conn = conn
+            if is_new:
+                self._backfill_locked()
+            return is_new
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _backfill_locked(self) -> None:
+        for path in sorted(self.log_dir.glob("web_logs_*.json*")):
+            day = path.name[len("web_logs_"):].split(".")[0]
+            if not day.isdigit():
+                continue
+            opener = gzip.open if path.suffix == ".gz" else open
+            rows = []
+            try:
+                with opener(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.rstrip("\n")
+                        try:
+                            rows.append(_row(day, json.loads(line), line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+            self._insert_locked(rows)
+
+    # ---------- ingestion ----------
+
+    def on_batch(self, day: str, records: List[Dict[str, Any]], lines: List[str], offset: int) -> None:
+        """LogWriter batch listener: index one appended chunk"""
+        if self._conn is None and self.open():
+            return  # the backfill already read this chunk from the file
+        rows = [_row(day, record, line) for record, line in zip(records, lines)]
+        with self._lock:
+            self._insert_locked(rows)
+
+    def _insert_locked(self, rows: List[Tuple]) -> None:
+        if not rows:
+            return
+        conn = self._conn
+        with conn:
+            cursor = conn.cursor()
+            for row in rows:
+                cursor.execute(
+                    "INSERT INTO entries (server_ts, day, level, category, session_id, message, line) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+                )
+                if self.fts_enabled:
+                    cursor.execute(
+                        "INSERT INTO entries_fts (rowid, message) VALUES (?, ?)",
+                        (cursor.lastrowid, row[5] or "")
+                    )
+
+    # ---------- queries ----------
+
+    def build_query(self, start: Optional[str] = None, end: Optional[str] = None,
+                    level: Optional[int] = None, min_level: Optional[int] = None,
+                    category: Optional[str] = None, session_id: Optional[str] = None,
+                    contains: Optional[str] = None, limit: int = 1000,
+                    descending: bool = False) -> Tuple[str, List[Any]]:
+        """SQL and parameters for a filtered query (times compare as ISO strings)"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start:
+            clauses.append("e.server_ts >= ?")
+            params.append(start)
+        if end:
+            clauses.append("e.server_ts <= ?")
+            params.append(end)
+        if level is not None:
+            clauses.append("e.level = ?")
+            params.append(level)
+        if min_level is not None:
+            clauses.append("e.level >= ?")
+            params.append(min_level)
+        if category:
+            clauses.append("e.category = ?")
+            params.append(category)
+        if session_id:
+            clauses.append("e.session_id = ?")
+            params.append(session_id)
+        if contains:
+            if self.fts_enabled and len(contains) >= MIN_FTS_QUERY:
+                clauses.append("e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+                params.append('"' + contains.replace('"', '""') + '"')
+            else:
+                clauses.append("e.message LIKE ? ESCAPE '\\'")
+                params.append(f"%{_escape_like(contains)}%")
+
+        sql = "SELECT e.line FROM entries e"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY e.id {'DESC' if descending else 'ASC'} LIMIT ?"
+        params.append(max(1, min(limit, MAX_QUERY_LIMIT)))
+        return sql, params
+
+    def iter_lines(self, **filters: Any) -> Iterator[str]:
+        """Matching JSON lines in ingestion order, read lazily from a dedicated connection"""
+        if self._conn is None:
+            self.open()
+        sql, params = self.build_query(**filters)
+        conn = sqlite3.connect(self.path.resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+        try:
+            for (line,) in conn.execute(sql, params):
+                yield line
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        if self._conn is None:
+            return {"open": False}
+        with self._lock:
+            # Rows are append-only, so the last id is the entry count
+            entries = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+        return {
+            "open": True,
+            "entries": entries,
+            "fts": self.fts_enabled,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
@@ -0,0 +1,280 @@
+"""
+AutoCrate Web Log Statistics Index
+Incrementally maintained counters for the daily web log files.
+
+The log writer reports every batch it appends; the index adds the batch to
+running totals (entries, bytes, per-level and per-category counts) and to a
+per-day rollup, and persists itself as `stats_index.json` next to the log
+files. `/api/logs/stats` reads the totals directly, and time-range queries sum
+only the day rollups inside the range. Counted bytes are uncompressed line
+bytes. The on-disk size of every daily file is kept in the index too: the
+plain file's size comes from each batch's offset, and the previous days are
+re-stated once when the writer rolls over to a new day and gzips them.
+
+An index is rebuilt from the log files once when it is missing (first start
+after upgrading, or after the file was deleted). A persisted index is
+reconciled against the file sizes on load; days whose files differ from the
+recorded sizes (for example batches written just before a crash, after the
+last save) are recounted from their files.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+INDEX_FILENAME = "stats_index.json"
+INDEX_VERSION = 2
+
+LOG_FILE_PREFIX = "web_logs_"
+
+# Persist at most this often; a final save happens on shutdown
+SAVE_INTERVAL = 2.0
+
+LEVEL_NAMES = {0: "DEBUG", 1: "INFO", 2: "WARN", 3: "ERROR", 4: "CRITICAL"}
+
+
+def _empty_rollup() -> Dict[str, Any]:
+    return {"entries": 0, "bytes": 0, "levels": {}, "categories": {}}
+
+
+def _merge(target: Dict[str, Any], source: Dict[str, Any], sign: int = 1) -> None:
+    target["entries"] += sign * source["entries"]
+    target["bytes"] += sign * source["bytes"]
+    for group in ("levels", "categories"):
+        for name, count in source[group].items():
+            value = target[group].get(name, 0) + sign * count
+            if value:
+                target[group][name] = value
+            else:
+                target[group].pop(name, None)
+
+
+def _file_day(name: str) -> Optional[str]:
+    """YYYYMMDD of a daily log file name, None for other files"""
+    if not name.startswith(LOG_FILE_PREFIX):
+        return None
+    day = name[len(LOG_FILE_PREFIX):].split(".")[0]
+    return day if day.isdigit() else None
+
+
+def _add_record(rollup: Dict[str, Any], record: Dict[str, Any], size: int) -> None:
+    rollup["entries"] += 1
+    rollup["bytes"] += size
+    level = LEVEL_NAMES.get(record.get("level"), str(record.get("level")))
+    category = str(record.get("category") or "unknown")
+    rollup["levels"][level] = rollup["levels"].get(level, 0) + 1
+    rollup["categories"][category] = rollup["categories"].get(category, 0) + 1
+
+
+class LogStatsIndex:
+    """Running totals plus per-day rollups of the web log files"""
+
+    def __init__(self, log_dir: Path):
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._totals = _empty_rollup()
+        self._days: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, int] = {}  # daily file name -> on-disk size
+        self._latest_day = ""
+        self._dirty = False
+        self._last_save = 0.0
+        self._loaded = False
+
+    # ---------- loading ----------
+
+    def load(self) -> bool:
+        """
+        Load the persisted index, rebuilding it from the log files if absent or
+        stale and recounting days whose files changed since it was saved.
+        Returns True when anything was recounted from the files.
+        """
+        with self._lock:
+            if self._loaded:
+                return False
+            data = None
+            if self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    data = None
+            if data and data.get("version") == INDEX_VERSION:
+                self._totals = data["totals"]
+                self._days = data["days"]
+                self._files = data["files"]
+                self._latest_day = max(self._days, default="")
+                recounted = self._reconcile_locked()
+            else:
+                self._rebuild_locked()
+                recounted = True
+            self._loaded = True
+            return recounted
+
+    def rebuild(self) -> None:
+        """Recount every daily file (plain and compressed) from scratch"""
+        with self._lock:
+            self._rebuild_locked()
+            self._loaded = True
+
+    def _scan_files(self) -> Dict[str, int]:
+        """{daily file name: size} of the log files on disk"""
+        sizes = {}
+        for path in self.log_dir.glob(f"{LOG_FILE_PREFIX}*.json*"):
+            if _file_day(path.name) is None:
+                continue
+            try:
+                sizes[path.name] = path.stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+    def _count_files(self, names: List[str]) -> Dict[str, Any]:
+        """Rollup counted from the given daily files (plain or gzipped)"""
+        rollup = _empty_rollup()
+        for name in sorted(names):
+            opener = gzip.open if name.endswith(".gz") else open
+            try:
+                with opener(self.log_dir / name, "rb") as f:
+                    for raw in f:
+                        try:
+                            record = json.loads(raw)
+                        except ValueError:
+                            continue
+                        _add_record(rollup, record, len(raw))
+            except OSError:
+                continue
+        return rollup
+
+    def _rebuild_locked(self) -> None:
+        self._totals = _empty_rollup()
+        self._days = {}
+        self._files = self._scan_files()
+        by_day: Dict[str, List[str]] = {}
+        for name in self._files:
+            by_day.setdefault(_file_day(name), []).append(name)
+        for day, names in by_day.items():
+            self._days[day] = self._count_files(names)
+            _merge(self._totals, self._days[day])
+        self._latest_day = max(self._days, default="")
+        self._dirty = True
+        self._save_locked()
+
+    def _reconcile_locked(self) -> bool:
+        """Recount the days whose files on disk differ from the recorded sizes"""
+        on_disk = self._scan_files()
+        drifted = {
+            _file_day(name) for name in set(on_disk) | set(self._files)
+            if on_disk.get(name) != self._files.get(name)
+        }
+        for day in sorted(drifted):
+            names = [name for name in on_disk if _file_day(name) == day]
+            old = self._days.pop(day, None)
+            if old:
+                _merge(self._totals, old, sign=-1)
+            for name in [name for name in self._files if _file_day(name) == day]:
+                del self._files[name]
+            if names:
+                self._days[day] = self._count_files(names)
+                _merge(self._totals, self._days[day])
+                self._files.update({name: on_disk[name] for name in names})
+        if drifted:
+            self._latest_day = max(self._days, default="")
+            self._dirty = True
+            self._save_locked()
+        return bool(drifted)
+
+    def _restat_day_locked(self, day: str) -> None:
+        for name in (f"{LOG_FILE_PREFIX}{day}.json", f"{LOG_FILE_PREFIX}{day}.json.gz"):
+            try:
+                self._files[name] = (self.log_dir / name).stat().st_size
+            except OSError:
+                self._files.pop(name, None)
+
+    # ---------- updates ----------
+
+    def on_batch(self, day: str, records: List[Dict[str, Any]], lines: List[str], offset: int) -> None:
+        """LogWriter batch listener: fold one appended chunk into the counters"""
+        if not self._loaded and self.load():
+            return  # the recount already included this chunk from the file
+        batch = _empty_rollup()
+        for record, line in zip(records, lines):
+            _add_record(batch, record, len(line.encode("utf-8")) + 1)
+        with self._lock:
+            _merge(self._totals, batch)
+            _merge(self._days.setdefault(day, _empty_rollup()), batch)
+            if day > self._latest_day:
+                # The writer gzips the earlier plain files when a new day starts
+                for previous in {_file_day(name) for name in self._files if name.endswith(".json")}:
+                    if previous < day:
+                        self._restat_day_locked(previous)
+                self._latest_day = day
+            self._files[f"{LOG_FILE_PREFIX}{day}.json"] = offset + batch["bytes"]
+            self._dirty = True
+            if time.time() - self._last_save >= SAVE_INTERVAL:
+                self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        if not self._dirty:
+            return
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps({
+            "version": INDEX_VERSION,
+            "totals": self._totals,
+            "days": self._days,
+            "files": self._files,
+        }), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._last_save = time.time()
+
+    # ---------- queries ----------
+
+    def summary(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Totals for all days, or for the inclusive YYYYMMDD range given.
+        Without a range this is a copy of the running totals. `file_bytes` is
+        the on-disk size of the daily files in the range, as recorded.
+        """
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            if start_day is None and end_day is None:
+                totals = json.loads(json.dumps(self._totals))
+                totals["days"] = len(self._days)
+            else:
+                totals = _empty_rollup()
+                days = [day for day in self._days
+                        if (start_day is None or day >= start_day) and (end_day is None or day <= end_day)]
+                for day in days:
+                    _merge(totals, self._days[day])
+                totals["days"] = len(days)
+        totals["file_bytes"] = self.file_bytes(start_day, end_day)
+        return totals
+
+    def file_bytes(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> int:
+        """Recorded on-disk size of the daily files (plain and compressed) in the inclusive range"""
+        with self._lock:
+            return sum(
+                size for name, size in self._files.items()
+                if (start_day is None or _file_day(name) >= start_day)
+                and (end_day is None or _file_day(name) <= end_day)
+            )
+
+    def rollups(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-day rollups within the inclusive YYYYMMDD range"""
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            return {
+                day: json.loads(json.dumps(rollup)) for day, rollup in sorted(self._days.items())
+                if (start_day is None or day >= start_day) and (end_day is None or day <= end_day)
+            }
@@ -0,0 +1,247 @@
+"""
+AutoCrate Web Log Writer
+Background, batched writer for browser log entries.
+
+Request handlers only enqueue records on a bounded asyncio queue; one writer
+task drains it, groups records into batches and appends each batch to the
+daily `web_logs_YYYYMMDD.json` file in a worker thread. A batch is flushed
+when it reaches the batch size or when the flush interval elapses. Daily files
+from previous days are gzip-compressed when the day rolls over.
+
+Under pressure (queue more than half full) DEBUG entries are sampled, keeping
+one in every AUTOCRATE_LOG_DEBUG_SAMPLE. When the queue is full, new entries
+are dropped and counted rather than blocking the request.
+
+Configuration (environment variables):
+    AUTOCRATE_LOG_DIR              Directory for daily log files (default: logs)
+    AUTOCRATE_LOG_QUEUE_SIZE       Max queued records (default: 10000)
+    AUTOCRATE_LOG_BATCH_SIZE       Records per write (default: 500)
+    AUTOCRATE_LOG_FLUSH_INTERVAL   Seconds before a partial batch is written (default: 0.5)
+    AUTOCRATE_LOG_DEBUG_SAMPLE     Keep 1 in N DEBUG entries under pressure (default: 10)
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEBUG_LEVEL = 0
+
+# Fraction of the queue that must be filled before DEBUG entries are sampled
+PRESSURE_THRESHOLD = 0.5
+
+LOG_FILE_PREFIX = "web_logs_"
+
+# Called in the writer thread after each daily chunk is appended:
+# (day, records, encoded lines without newlines, file offset of the first line)
+BatchListener = Callable[[str, List[Dict[str, Any]], List[str], int], None]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def log_file_day(record: Dict[str, Any]) -> str:
+    """YYYYMMDD of the daily file a record belongs to (server receive time)"""
+    server_timestamp = record.get("serverTimestamp")
+    if server_timestamp:
+        return server_timestamp[:10].replace("-", "")
+    return datetime.now().strftime("%Y%m%d")
+
+
+class LogWriter:
+    """Bounded queue plus a single background task appending batches to daily files"""
+
+    def __init__(self, log_dir: Optional[str] = None, max_queue: Optional[int] = None,
+                 batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 debug_sample_every: Optional[int] = None):
+        self.log_dir = Path(log_dir or os.environ.get("AUTOCRATE_LOG_DIR", "logs"))
+        self.max_queue = max(1, max_queue or _env_int("AUTOCRATE_LOG_QUEUE_SIZE", 10000))
+        self.batch_size = max(1, batch_size or _env_int("AUTOCRATE_LOG_BATCH_SIZE", 500))
+        self.flush_interval = flush_interval or _env_float("AUTOCRATE_LOG_FLUSH_INTERVAL", 0.5)
+        self.debug_sample_every = max(1, debug_sample_every or _env_int("AUTOCRATE_LOG_DEBUG_SAMPLE", 10))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._current_day: Optional[str] = None
+        self._debug_seen = 0
+        self._batch_listeners: List[BatchListener] = []
+
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.compressed_files = 0
+        self.last_flush: Optional[float] = None
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Create the queue and writer task on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything still queued, then stop the writer task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    # ---------- ingestion ----------
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Enqueue one record without blocking. Returns False when the record was
+        sampled out or dropped because the queue is full.
+        """
+        if self._task is None or self._task.done():
+            self.start()
+
+        if record.get("level", DEBUG_LEVEL) <= DEBUG_LEVEL and self.under_pressure():
+            self._debug_seen += 1
+            if self._debug_seen % self.debug_sample_every:
+                self.sampled_out += 1
+                return False
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def under_pressure(self) -> bool:
+        return self._queue is not None and self._queue.qsize() >= self.max_queue * PRESSURE_THRESHOLD
+
+    # ---------- writer task ----------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Compress files left over from earlier days before taking new writes
+        await loop.run_in_executor(None, self._compress_previous_days, datetime.now().strftime("%Y%m%d"))
+
+        stopping = False
+        while not stopping:
+            record = await self._queue.get()
+            if record is None:
+                break
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            try:
+                await loop.run_in_executor(None, self._write_batch, batch)
+            except Exception as e:
+                self.write_errors += 1
+                logger.warning("Failed to write %d web log entries: %s", len(batch), e)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Append a batch to the daily files (runs in a worker thread)"""
+        by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in batch:
+            by_day[log_file_day(record)].append(record)
+
+        for day in sorted(by_day):
+            if self._current_day is not None and day > self._current_day:
+                self._compress_previous_days(day)
+            if self._current_day is None or day > self._current_day:
+                self._current_day = day
+            records = by_day[day]
+            lines = [json.dumps(record) for record in records]
+            with open(self.path_for(day), "ab") as f:
+                offset = f.tell()
+                f.write(("\n".join(lines) + "\n").encode("utf-8"))
+            for listener in self._batch_listeners:
+                try:
+                    listener(day, records, lines, offset)
+                except Exception as e:
+                    logger.warning("Web log batch listener failed: %s", e)
+
+        self.written += len(batch)
+        self.batches += 1
+        self.last_flush = time.time()
+
+    def _compress_previous_days(self, today: str) -> None:
+        """gzip every daily file older than today and remove the plain copy"""
+        for path in sorted(self.log_dir.glob(f"{LOG_FILE_PREFIX}*.json")):
+            day = path.stem[len(LOG_FILE_PREFIX):]
+            if not day.isdigit() or day >= today:
+                continue
+            target = path.with_name(path.name + ".gz")
+            with open(path, "rb") as src, gzip.open(target, "ab") as dst:
+                shutil.copyfileobj(src, dst)
+            path.unlink()
+            self.compressed_files += 1
+
+    def add_batch_listener(self, listener: BatchListener) -> None:
+        """Register an index that is updated from every written batch"""
+        if listener not in self._batch_listeners:
+            self._batch_listeners.append(listener)
+
+    # ---------- introspection ----------
+
+    def path_for(self, day: str) -> Path:
+        return self.log_dir / f"{LOG_FILE_PREFIX}{day}.json"
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_depth": self.queue_depth(),
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_s": self.flush_interval,
+            "accepted": self.accepted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "compressed_files": self.compressed_files,
+            "last_flush": datetime.fromtimestamp(self.last_flush).isoformat() if self.last_flush else None,
+        }
+
+
+log_writer = LogWriter()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Any, Dict, Optional
 from datetime import datetime
@@ -6,6 +7,12 @@ import json
 import os
 import logging
 from pathlib import Path
+from log_writer import log_writer
+from log_stats import LogStatsIndex
+from log_index import LogQueryIndex, MAX_QUERY_LIMIT
+
+# Ensure logs directory exists
+os.makedirs('logs', exist_ok=True)
 
 # Configure logging
 logging.basicConfig(
@@ -19,11 +26,19 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
-
 router = APIRouter()
 
+# Running counters updated by the writer after every batch
+log_stats = LogStatsIndex(log_writer.log_dir)
+log_writer.add_batch_listener(log_stats.on_batch)
+
+# Searchable index behind /logs/query, also fed by the writer
+log_index = LogQueryIndex(log_writer.log_dir)
+log_writer.add_batch_listener(log_index.on_batch)
+
+# Browser entries at or above this level are also echoed to the server log
+ECHO_LEVEL = 3  # ERROR
+
 class LogEntry(BaseModel):
     id: str
     timestamp: datetime
@@ -40,6 +55,42 @@ class LogEntry(BaseModel):
 class LogBatch(BaseModel):
     logs: list[LogEntry]
 
+@router.on_event("startup")
+def start_log_writer():
+    """Start the background writer that appends queued entries to the daily files"""
+    log_stats.load()
+    log_index.open()
+    log_writer.start()
+
+@router.on_event("shutdown")
+async def stop_log_writer():
+    await log_writer.stop()
+    log_stats.save()
+    log_index.close()
+
+def build_log_record(log_entry: LogEntry, client_ip: str) -> Dict[str, Any]:
+    """Record written to the daily JSONL file, with server-side metadata"""
+    return {
+        "timestamp": log_entry.timestamp.isoformat(),
+        "level": log_entry.level,
+        "message": log_entry.message,
+        "category": log_entry.category,
+        "data": log_entry.data,
+        "sessionId": log_entry.sessionId,
+        "userAgent": log_entry.userAgent,
+        "url": log_entry.url,
+        "stack": log_entry.stack,
+        "clientIP": client_ip,
+        "serverTimestamp": datetime.now().isoformat()
+    }
+
+def echo_log_entry(log_entry: LogEntry):
+    """Surface browser errors in the server log; lower levels only go to the files"""
+    if log_entry.level >= 4:  # CRITICAL
+        logger.critical(f"[{log_entry.category}] {log_entry.message}")
+    elif log_entry.level >= ECHO_LEVEL:  # ERROR
+        logger.error(f"[{log_entry.category}] {log_entry.message}")
+
 @router.post("/logs")
 async def receive_log(log_entry: LogEntry, request: Request):
     """
@@ -49,41 +100,11 @@ async def receive_log(log_entry: LogEntry, request: Request):
         # Add server-side metadata
         client_ip = request.client.host if request.client else "unknown"
         
-        # Create log record
-        log_record = {
-            "timestamp": log_entry.timestamp.isoformat(),
-            "level": log_entry.level,
-            "message": log_entry.message,
-            "category": log_entry.category,
-            "data": log_entry.data,
-            "sessionId": log_entry.sessionId,
-            "userAgent": log_entry.userAgent,
-            "url": log_entry.url,
-            "stack": log_entry.stack,
-            "clientIP": client_ip,
-            "serverTimestamp": datetime.now().isoformat()
-        }
-        
-        # Log to file
-        log_file_path = f"logs/web_logs_{datetime.now().strftime('%Y%m%d')}.json"
-        
-        # Append to daily log file
-        with open(log_file_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_record) + '\n')
+        # Queue for the background writer
+        accepted = log_writer.submit(build_log_record(log_entry, client_ip))
+        echo_log_entry(log_entry)
         
-        # Log to Python logger based on level
-        if log_entry.level >= 4:  # CRITICAL
-            logger.critical(f"[{log_entry.category}] {log_entry.message}", extra={"data": log_entry.data})
-        elif log_entry.level >= 3:  # ERROR
-            logger.error(f"[{log_entry.category}] {log_entry.message}", extra={"data": log_entry.data})
-        elif log_entry.level >= 2:  # WARN
-            logger.warning(f"[{log_entry.category}] {log_entry.message}", extra={"data": log_entry.data})
-        elif log_entry.level >= 1:  # INFO
-            logger.info(f"[{log_entry.category}] {log_entry.message}", extra={"data": log_entry.data})
-        else:  # DEBUG
-            logger.debug(f"[{log_entry.category}] {log_entry.message}", extra={"data": log_entry.data})
-        
-        return {"status": "success", "message": "Log received"}
+        return {"status": "success", "message": "Log received", "accepted": accepted}
         
     except Exception as e:
         logger.error(f"Failed to process log entry: {str(e)}")
@@ -97,30 +118,20 @@ async def receive_log_batch(log_batch: LogBatch, request: Request):
     try:
         client_ip = request.client.host if request.client else "unknown"
         processed_count = 0
+        accepted_count = 0
         
-        log_file_path = f"logs/web_logs_{datetime.now().strftime('%Y%m%d')}.json"
-        
-        with open(log_file_path, 'a', encoding='utf-8') as f:
-            for log_entry in log_batch.logs:
-                log_record = {
-                    "timestamp": log_entry.timestamp.isoformat(),
-                    "level": log_entry.level,
-                    "message": log_entry.message,
-                    "category": log_entry.category,
-                    "data": log_entry.data,
-                    "sessionId": log_entry.sessionId,
-                    "userAgent": log_entry.userAgent,
-                    "url": log_entry.url,
-                    "stack": log_entry.stack,
-                    "clientIP": client_ip,
-                    "serverTimestamp": datetime.now().isoformat()
-                }
-                
-                f.write(json.dumps(log_record) + '\n')
-                processed_count += 1
+        for log_entry in log_batch.logs:
+            if log_writer.submit(build_log_record(log_entry, client_ip)):
+                accepted_count += 1
+            echo_log_entry(log_entry)
+            processed_count += 1
         
-        logger.info(f"Processed batch of {processed_count} log entries")
-        return {"status": "success", "message": f"Processed {processed_count} log entries"}
+        return {
+            "status": "success",
+            "message": f"Processed {processed_count} log entries",
+            "accepted": accepted_count,
+            "shed": processed_count - accepted_count
+        }
         
     except Exception as e:
         logger.error(f"Failed to process log batch: {str(e)}")
@@ -133,7 +144,7 @@ async def logging_health():
     """
     try:
         # Check if logs directory exists and is writable
-        logs_dir = Path("logs")
+        logs_dir = log_writer.log_dir
         if not logs_dir.exists():
             logs_dir.mkdir(exist_ok=True)
         
@@ -145,6 +156,8 @@ async def logging_health():
         return {
             "status": "healthy",
             "logs_directory": str(logs_dir.absolute()),
+            "writer": log_writer.stats(),
+            "query_index": log_index.stats(),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -152,34 +165,91 @@ async def logging_health():
         logger.error(f"Logging health check failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Logging system unhealthy")
 
+def parse_log_day(value: Optional[str]) -> Optional[str]:
+    """Accept YYYY-MM-DD, YYYYMMDD or an ISO timestamp; return YYYYMMDD"""
+    if not value:
+        return None
+    compact = value.strip()[:10].replace("-", "")
+    if len(compact) != 8 or not compact.isdigit():
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    return compact
+
 @router.get("/logs/stats")
-async def get_log_stats():
+async def get_log_stats(start: Optional[str] = None, end: Optional[str] = None, by_day: bool = False):
     """
-    Get statistics about logged data
+    Get statistics about logged data, optionally for an inclusive date range.
+    Served from the incrementally maintained index; `by_day=true` adds the
+    per-day rollups.
     """
     try:
-        logs_dir = Path("logs")
-        if not logs_dir.exists():
-            return {"total_files": 0, "total_size": 0}
-        
-        log_files = list(logs_dir.glob("web_logs_*.json"))
-        total_size = sum(f.stat().st_size for f in log_files)
-        total_lines = 0
-        
-        for log_file in log_files:
-            try:
-                with open(log_file, 'r') as f:
-                    total_lines += sum(1 for _ in f)
-            except:
-                continue
-        
-        return {
-            "total_files": len(log_files),
-            "total_size_bytes": total_size,
-            "total_log_entries": total_lines,
-            "files": [f.name for f in log_files]
+        start_day, end_day = parse_log_day(start), parse_log_day(end)
+        summary = log_stats.summary(start_day, end_day)
+        
+        stats = {
+            "total_files": summary["days"],  # one daily file per day
+            "total_size_bytes": summary["file_bytes"],
+            "uncompressed_bytes": summary["bytes"],
+            "total_log_entries": summary["entries"],
+            "levels": summary["levels"],
+            "categories": summary["categories"],
+            "range": {"start": start_day, "end": end_day}
         }
+        if by_day:
+            stats["days"] = log_stats.rollups(start_day, end_day)
+        return stats
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get log stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get log statistics")
+
+def parse_log_time(value: Optional[str], end_of_day: bool = False) -> Optional[str]:
+    """ISO bound compared against serverTimestamp; a bare date covers the whole day"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {value}")
+    if len(value) == 10 and end_of_day:
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    if parsed.tzinfo is not None:
+        # serverTimestamp is naive server-local time
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+@router.get("/logs/query")
+async def query_logs(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    level: Optional[int] = Query(None, ge=0, le=4),
+    min_level: Optional[int] = Query(None, ge=0, le=4),
+    category: Optional[str] = None,
+    sessionId: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Message substring"),
+    limit: int = Query(1000, ge=1, le=MAX_QUERY_LIMIT),
+    order: str = Query("asc", pattern="^(asc|desc)$")
+):
+    """
+    Search web log entries by server time range, level, category, session and
+    message substring. Matches stream back as NDJSON in ingestion order.
+    """
+    filters = {
+        "start": parse_log_time(start),
+        "end": parse_log_time(end, end_of_day=True),
+        "level": level,
+        "min_level": min_level,
+        "category": category,
+        "session_id": sessionId,
+        "contains": q,
+        "limit": limit,
+        "descending": order == "desc"
+    }
+    
+    def stream():
+        for line in log_index.iter_lines(**filters):
+            yield line + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -3,24 +3,52 @@ AutoCrate Web API
 FastAPI backend for AutoCrate web version
 """
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, StreamingResponse, HTMLResponse, RedirectResponse, PlainTextResponse
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import sys
 import os
 from pathlib import Path
 import json
 import io
 import base64
+import asyncio
+import zipfile
+import time
 from datetime import datetime
 import uuid
 from logs import router as logs_router
+from executor import get_executor, ExecutorBusyError, ExecutorTimeoutError
+from caching import (
+    canonical_request_key, etag_for, etag_matches, RenderedBody,
+    calculation_cache, nx_expression_cache, rendered_body_cache, takeoff_cache
+)
+from single_flight import calculation_flights, nx_expression_flights, takeoff_flights, design_flights
+from design_store import design_store, DesignRecord
+from serialization import (
+    dumps, shape_payload, parse_fields, variant_key,
+    negotiate_encoding, compress, MIN_COMPRESS_SIZE
+)
+import metrics
+import server_timing
 
 # Add parent directory to path for importing autocrate modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from autocrate.stage_timing import stage, add_listener, StageRecorder
+from autocrate.quantity_takeoff import takeoff_from_components, summarize_takeoff, cut_pieces, quantity_vector
+from autocrate.crate_geometry import crate_glb
+from autocrate.cut_list_optimizer import (
+    optimize_material, summarize_cut_list, DEFAULT_KERF, DEFAULT_STOCK_LENGTHS
+)
+from pricing import price_book, quantity_ledger, quote_vector, PriceCatalog
+from bom_export import (
+    crate_takeoff, render_crate_glb, normalize_format, stream_csv, build_xlsx, iter_file,
+    CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE
+)
+
 # Import core AutoCrate modules
 try:
     from autocrate.front_panel_logic import calculate_front_panel_components
@@ -60,11 +88,158 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Request-ID", "X-Generated-At", "Content-Disposition", "Server-Timing"],
 )
 
 # Include logging router
 app.include_router(logs_router, prefix="/api", tags=["logging"])
 
+# Compute executor - keeps CPU-bound calculations off the event loop
+executor = get_executor()
+
+@app.on_event("startup")
+def start_executor():
+    """Spawn the calculation pools before the first request arrives"""
+    executor.start()
+    quantity_ledger.load()
+
+@app.on_event("shutdown")
+def stop_executor():
+    executor.shutdown()
+    quantity_ledger.save()
+
+# ============= METRICS =============
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Per-route latency histogram, request counter and in-flight gauge"""
+    route = metrics.route_label(app.router.routes, request.scope)
+    method = request.method
+    metrics.http_in_flight.inc(route=route)
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        metrics.http_in_flight.dec(route=route)
+        metrics.http_request_duration.observe(time.perf_counter() - start, route=route, method=method)
+        metrics.http_requests.inc(route=route, method=method, status=status)
+
+def collect_runtime_metrics():
+    """Scrape-time gauges for caches, executor queues, coalescing and designs"""
+    caches = {
+        "calculation": calculation_cache,
+        "nx_expression": nx_expression_cache,
+        "rendered_bodies": rendered_body_cache,
+        "takeoff": takeoff_cache,
+    }
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    yield ("autocrate_cache_entries", "gauge", "Entries held per response cache",
+           [({"cache": name}, stats["entries"]) for name, stats in cache_stats.items()])
+    yield ("autocrate_cache_hits_total", "counter", "Cache hits per response cache",
+           [({"cache": name}, stats["hits"]) for name, stats in cache_stats.items()])
+    yield ("autocrate_cache_misses_total", "counter", "Cache misses per response cache",
+           [({"cache": name}, stats["misses"]) for name, stats in cache_stats.items()])
+    yield ("autocrate_cache_hit_ratio", "gauge", "Hit ratio per response cache since start",
+           [({"cache": name}, stats["hit_ratio"]) for name, stats in cache_stats.items()])
+
+    depth = executor.queue_depth()
+    yield ("autocrate_executor_queue_depth", "gauge", "Jobs in flight per executor pool",
+           [({"pool": kind}, value) for kind, value in depth.items()])
+    yield ("autocrate_executor_max_queue_depth", "gauge", "Queue-depth limit per executor pool",
+           [({"pool": kind}, executor.config.max_queue_depth) for kind in depth])
+
+    flights = {"calculation": calculation_flights, "nx_expression": nx_expression_flights,
+               "takeoff": takeoff_flights, "design": design_flights}
+    flight_stats = {name: group.stats() for name, group in flights.items()}
+    yield ("autocrate_coalesced_requests_total", "counter",
+           "Requests that joined an identical in-flight computation",
+           [({"group": name}, stats["coalesced"]) for name, stats in flight_stats.items()])
+    yield ("autocrate_computations_total", "counter",
+           "Computations started after coalescing",
+           [({"group": name}, stats["computations"]) for name, stats in flight_stats.items()])
+
+    designs = design_store.stats()
+    yield ("autocrate_designs", "gauge", "Designs held in the design store",
+           [({}, designs["designs"])])
+    yield ("autocrate_design_artifact_builds_total", "counter", "Design artifacts built",
+           [({}, designs["artifact_builds"])])
+    yield ("autocrate_design_artifact_hits_total", "counter", "Design artifacts served from the store",
+           [({}, designs["artifact_hits"])])
+
+add_listener(metrics.observe_stage)
+metrics.registry.add_collector(collect_runtime_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of API and engine metrics"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+# ============= SERVER TIMING =============
+
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    """
+    Attach a Server-Timing header with per-stage durations to every response.
+    `debug_timing=true` also adds the breakdown to JSON bodies.
+    """
+    if not server_timing.ENABLED:
+        return await call_next(request)
+    
+    debug = server_timing.debug_requested(request.query_params.get(server_timing.DEBUG_PARAM))
+    if debug:
+        # Bypass 304s and compression so the body can carry the breakdown
+        request.scope["headers"] = [
+            (name, value) for name, value in request.scope["headers"]
+            if name not in server_timing.DEBUG_STRIPPED_HEADERS
+        ]
+    
+    start = time.perf_counter()
+    with StageRecorder() as recorder:
+        response = await call_next(request)
+    totals = recorder.totals()
+    elapsed = time.perf_counter() - start
+    
+    if debug and response.headers.get("content-type", "").startswith("application/json"):
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ("content-length", "etag", "cache-control")
+        }
+        headers["Cache-Control"] = "no-store"
+        if isinstance(payload, dict):
+            payload[server_timing.DEBUG_PARAM] = server_timing.breakdown(totals, elapsed)
+            body = dumps(payload)
+        response = Response(content=body, status_code=response.status_code, headers=headers)
+    
+    response.headers["Server-Timing"] = server_timing.format_header(totals, elapsed)
+    response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
+async def run_light(fn, *args, **kwargs):
+    """Await a light calculation on the thread pool, mapping pool errors to HTTP"""
+    try:
+        return await executor.run_light(fn, *args, **kwargs)
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ExecutorTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+async def run_heavy(fn, *args, **kwargs):
+    """Await a heavy export on the process pool, mapping pool errors to HTTP"""
+    try:
+        return await executor.run_heavy(fn, *args, **kwargs)
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ExecutorTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
 # Root endpoint - redirect to documentation
 @app.get("/")
 def root():
@@ -95,13 +270,24 @@ def api_root():
         "version": "12.0.0",
         "endpoints": {
             "calculate": "/api/calculate",
+            "calculate_batch": "/api/calculate/batch",
             "export": {
                 "nx_expression": "/api/export/nx_expression",
+                "nx_expression_batch": "/api/export/nx_expression/batch",
                 "bom": "/api/export/bom",
+                "bom_batch": "/api/export/bom/batch",
                 "report": "/api/export/report"
             },
+            "geometry": "/api/3d-geometry",
+            "geometry_glb": "/api/3d-geometry/glb",
+            "cut_list": "/api/cut-list",
+            "cut_list_batch": "/api/cut-list/batch",
+            "designs": "/api/designs",
+            "pricing": "/api/pricing/catalog",
+            "requote": "/api/pricing/requote",
             "validate": "/api/validate",
-            "logs": "/api/logs"
+            "logs": "/api/logs",
+            "metrics": "/metrics"
         }
     }
 
@@ -144,15 +330,35 @@ class CrateRequest(BaseModel):
     include_3d_data: bool = Field(False, description="Include 3D geometry data")
 
 class CalculationResponse(BaseModel):
-    """Crate calculation response"""
-    request_id: str
-    timestamp: str
+    """Crate calculation response (deterministic - per-call IDs and times are headers)"""
+    design_key: str
     product_specs: Dict[str, Any]
     panels: Dict[str, Any]
     materials_summary: Dict[str, Any]
     compliance: Dict[str, Any]
     export_available: List[str]
 
+MAX_BATCH_SIZE = 100
+
+class BatchCrateRequest(BaseModel):
+    """Batch of crate requests, e.g. the lines of one order"""
+    requests: List[CrateRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE,
+                                         description="Crate requests, evaluated in parallel")
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch item"""
+    index: int
+    ok: bool
+    result: Optional[CalculationResponse] = None
+    error: Optional[str] = None
+
+class BatchCalculationResponse(BaseModel):
+    """Batch calculation response; items are in request order"""
+    count: int
+    succeeded: int
+    failed: int
+    items: List[BatchItemResult]
+
 class BOMItem(BaseModel):
     """Bill of Materials item"""
     category: str
@@ -162,6 +368,18 @@ class BOMItem(BaseModel):
     unit_cost: Optional[float] = None
     total_cost: Optional[float] = None
 
+class PriceCatalogRequest(BaseModel):
+    """New price catalog version; prices by 'category|material|unit', defaults by 'category|unit'"""
+    version: str = Field(..., min_length=1, max_length=64)
+    currency: str = "USD"
+    prices: Dict[str, float] = Field(default_factory=dict)
+    defaults: Dict[str, float] = Field(default_factory=dict)
+
+class RequoteRequest(BaseModel):
+    """Re-price stored designs; all designs in the ledger when design_ids is omitted"""
+    design_ids: Optional[List[str]] = None
+    catalog_version: Optional[str] = None
+
 class GeometryData(BaseModel):
     """3D geometry data for visualization"""
     panels: List[Dict[str, Any]]
@@ -220,10 +438,11 @@ class CalculationEngine:
         
         # Front panel
         try:
-            front_result = calculate_front_panel_components(
-                front_width, front_height, panel_thickness,
-                cleat_thickness, cleat_width, True
-            )
+            with stage("panel_front"):
+                front_result = calculate_front_panel_components(
+                    front_width, front_height, panel_thickness,
+                    cleat_thickness, cleat_width, True
+                )
             results["panels"]["front"] = {
                 "width": front_width,
                 "height": front_height,
@@ -234,10 +453,11 @@ class CalculationEngine:
         
         # Back panel  
         try:
-            back_result = calculate_back_panel_components(
-                front_width, front_height, panel_thickness,
-                cleat_thickness, cleat_width, True
-            )
+            with stage("panel_back"):
+                back_result = calculate_back_panel_components(
+                    front_width, front_height, panel_thickness,
+                    cleat_thickness, cleat_width, True
+                )
             results["panels"]["back"] = {
                 "width": front_width,
                 "height": front_height,
@@ -248,10 +468,11 @@ class CalculationEngine:
         
         # Left panel
         try:
-            left_result = calculate_left_panel_components(
-                side_width, side_height, panel_thickness,
-                cleat_thickness, cleat_width, True
-            )
+            with stage("panel_left"):
+                left_result = calculate_left_panel_components(
+                    side_width, side_height, panel_thickness,
+                    cleat_thickness, cleat_width, True
+                )
             results["panels"]["left"] = {
                 "width": side_width,
                 "height": side_height,
@@ -262,10 +483,11 @@ class CalculationEngine:
         
         # Right panel
         try:
-            right_result = calculate_right_panel_components(
-                side_width, side_height, panel_thickness,
-                cleat_thickness, cleat_width, True
-            )
+            with stage("panel_right"):
+                right_result = calculate_right_panel_components(
+                    side_width, side_height, panel_thickness,
+                    cleat_thickness, cleat_width, True
+                )
             results["panels"]["right"] = {
                 "width": side_width,
                 "height": side_height,
@@ -277,10 +499,11 @@ class CalculationEngine:
         # Top panel (if requested)
         if request.include_top:
             try:
-                top_result = calculate_top_panel_components(
-                    top_length, top_width, panel_thickness,
-                    cleat_thickness, cleat_width
-                )
+                with stage("panel_top"):
+                    top_result = calculate_top_panel_components(
+                        top_length, top_width, panel_thickness,
+                        cleat_thickness, cleat_width
+                    )
                 results["panels"]["top"] = {
                     "length": top_length,
                     "width": top_width,
@@ -290,7 +513,8 @@ class CalculationEngine:
                 results["panels"]["top"] = {"error": str(e)}
         
         # Calculate materials summary
-        results["materials_summary"] = CalculationEngine._calculate_materials_summary(results["panels"])
+        with stage("materials_summary"):
+            results["materials_summary"] = CalculationEngine._calculate_materials_summary(results["panels"])
         
         # Add compliance information
         results["compliance"] = {
@@ -332,6 +556,184 @@ class CalculationEngine:
             "estimated_weight_lbs": round(sheets_required * 50, 2)  # ~50 lbs per sheet
         }
 
+# ============= CACHED CALCULATION HELPERS =============
+
+EXPORT_FORMATS = ["nx_expression", "bom_excel", "bom_csv", "report_pdf", "3d_model"]
+
+def calculation_payload(request: CrateRequest, results: Dict[str, Any]) -> Dict[str, Any]:
+    """Plain-dict calculation response, serialized without a Pydantic round trip"""
+    return {
+        "design_key": canonical_request_key(request),
+        "product_specs": request.product.model_dump(),
+        "panels": results["panels"],
+        "materials_summary": results["materials_summary"],
+        "compliance": results["compliance"],
+        "export_available": EXPORT_FORMATS
+    }
+
+def build_calculation_response(request: CrateRequest, results: Dict[str, Any]) -> CalculationResponse:
+    """Wrap engine results in the public response model"""
+    return CalculationResponse(**calculation_payload(request, results))
+
+async def calculate_cached(request: CrateRequest) -> Dict[str, Any]:
+    """Engine results for a request, shared across identical requests"""
+    key = canonical_request_key(request)
+    results = calculation_cache.get(key)
+    if results is not None:
+        return results
+    
+    async def compute():
+        results = await run_light(CalculationEngine.calculate_crate, request)
+        calculation_cache.put(key, results)
+        return results
+    
+    # Identical concurrent requests share one engine run
+    return await calculation_flights.do(key, compute)
+
+async def cached_response(http_request: Request, namespace: str, request: CrateRequest,
+                          render, weak: bool = False, variant: str = "") -> Response:
+    """
+    Serve a rendered body for a request with ETag/If-None-Match support.
+    The ETag depends only on the canonical request (and payload variant), so a
+    revalidation hit returns 304 without running the engine; rendered bodies
+    and their br/gzip encodings are kept in an LRU.
+    """
+    key = canonical_request_key(request)
+    encoding = negotiate_encoding(http_request.headers.get("accept-encoding"))
+    etag = etag_for(f"{namespace}:{variant}", key, weak=weak)
+    if encoding:
+        etag = f'{etag[:-1]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Request-ID": str(uuid.uuid4())
+    }
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    rendered = rendered_body_cache.get((namespace, key, variant))
+    if rendered is None:
+        body, media_type, extra_headers = await render()
+        rendered = RenderedBody(
+            body=body,
+            media_type=media_type,
+            etag=etag,
+            generated_at=datetime.utcnow().isoformat(),
+            headers=extra_headers
+        )
+        rendered_body_cache.put((namespace, key, variant), rendered)
+    headers.update(rendered.headers)
+    headers["X-Generated-At"] = rendered.generated_at
+    
+    body = rendered.body
+    if encoding and len(body) >= MIN_COMPRESS_SIZE:
+        encoded = rendered.encoded.get(encoding)
+        if encoded is None:
+            with stage("compress"):
+                encoded = compress(body, encoding)
+            rendered.encoded[encoding] = encoded
+        body = encoded
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=rendered.media_type, headers=headers)
+
+def nx_expression_params(request: CrateRequest) -> Dict[str, Any]:
+    """Keyword arguments for generate_full_nx_expression_content"""
+    return {
+        "product_weight": request.product.weight,
+        "product_length": request.product.length,
+        "product_width": request.product.width,
+        "product_height": request.product.height,
+        "clearance": request.clearance,
+        "panel_thickness": request.materials.panel_thickness,
+        "include_top": request.include_top,
+        "lumber_sizes": request.materials.lumber_sizes
+    }
+
+async def generate_nx_cached(request: CrateRequest) -> str:
+    """NX expression file content for a request, shared across identical requests"""
+    key = canonical_request_key(request)
+    content = nx_expression_cache.get(key)
+    if content is not None:
+        return content
+    
+    async def compute():
+        try:
+            # Import the NX expression service
+            from nx_expression_service import generate_full_nx_expression_content
+            
+            # Generate the full NX expression content using core logic
+            content = await run_heavy(generate_full_nx_expression_content, **nx_expression_params(request))
+        except ImportError as e:
+            # Fallback to simple generation if import fails
+            print(f"Import error, using fallback: {e}")
+            content = await run_light(generate_nx_expression_content_fallback, request)
+        nx_expression_cache.put(key, content)
+        return content
+    
+    # Identical concurrent exports share one generation
+    return await nx_expression_flights.do(key, compute)
+
+def nx_expression_filename(request: CrateRequest, timestamp: Optional[str] = None) -> str:
+    """Enhanced .exp filename with the key design parameters"""
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    material_type = "PLY" if request.materials.panel_thickness >= 0.5 else "OSB"
+    return (f"{timestamp}_Crate_"
+            f"{request.product.length:.0f}x{request.product.width:.0f}x{request.product.height:.0f}_"
+            f"W{request.product.weight:.0f}_"
+            f"5P_"  # 5 panels
+            f"{material_type}{request.materials.panel_thickness:.2f}_"
+            f"C{request.clearance:.1f}_"
+            f"ASTM.exp")
+
+def record_takeoff(key: str, lines: List[Dict[str, Any]]) -> None:
+    """Cache take-off lines and keep the design's quantity vector for pricing"""
+    takeoff_cache.put(key, lines)
+    quantity_ledger.add(key, quantity_vector(lines))
+
+async def takeoff_cached(request: CrateRequest) -> List[Dict[str, Any]]:
+    """BOM take-off lines for a request, computed from the full component results"""
+    key = canonical_request_key(request)
+    lines = takeoff_cache.get(key)
+    if lines is not None:
+        return lines
+    
+    async def compute():
+        lines = await run_heavy(crate_takeoff, **nx_expression_params(request))
+        record_takeoff(key, lines)
+        return lines
+    
+    return await takeoff_flights.do(key, compute)
+
+def batch_concurrency() -> int:
+    """Parallel workers one batch may occupy, leaving queue room for other clients"""
+    workers = max(executor.config.process_workers, executor.config.thread_workers)
+    return max(1, min(workers, executor.config.max_queue_depth // 2))
+
+class ZipStreamBuffer(io.RawIOBase):
+    """Write-only sink for ZipFile that hands back bytes as they are produced"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
 # ============= API ENDPOINTS =============
 
 @app.get("/api/health")
@@ -340,36 +742,77 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "executor": executor.stats(),
+        "caches": {
+            "calculation": calculation_cache.stats(),
+            "nx_expression": nx_expression_cache.stats(),
+            "rendered_bodies": rendered_body_cache.stats(),
+            "takeoff": takeoff_cache.stats()
+        },
+        "quantity_ledger": quantity_ledger.stats(),
+        "coalescing": {
+            "calculation": calculation_flights.stats(),
+            "nx_expression": nx_expression_flights.stats(),
+            "takeoff": takeoff_flights.stats(),
+            "design": design_flights.stats()
+        },
+        "designs": design_store.stats()
     }
 
 @app.post("/api/calculate", response_model=CalculationResponse)
-async def calculate_crate(request: CrateRequest):
-    """Calculate crate design based on product specifications"""
+async def calculate_crate(request: CrateRequest, http_request: Request,
+                          fields: Optional[str] = None, lean: bool = False):
+    """
+    Calculate crate design based on product specifications.
+    `lean=true` drops klimp zone/spacing analysis; `fields=` projects dotted paths.
+    """
     try:
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-        
-        # Perform calculations
-        engine = CalculationEngine()
-        results = engine.calculate_crate(request)
-        
-        # Prepare response
-        response = CalculationResponse(
-            request_id=request_id,
-            timestamp=datetime.utcnow().isoformat(),
-            product_specs=request.product.dict(),
-            panels=results["panels"],
-            materials_summary=results["materials_summary"],
-            compliance=results["compliance"],
-            export_available=["nx_expression", "bom_excel", "bom_csv", "report_pdf", "3d_model"]
-        )
+        field_paths = parse_fields(fields)
         
-        return response
+        async def render():
+            # Perform calculations
+            results = await calculate_cached(request)
+            
+            # Prepare response
+            with stage("serialize"):
+                payload = shape_payload(calculation_payload(request, results), field_paths, lean)
+                return dumps(payload), "application/json", {}
+        
+        return await cached_response(http_request, "calculate", request, render,
+                                     variant=variant_key(field_paths, lean))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/calculate/batch", response_model=BatchCalculationResponse)
+async def calculate_crate_batch(batch: BatchCrateRequest):
+    """Calculate many crate designs in one call; results keep request order"""
+    semaphore = asyncio.Semaphore(batch_concurrency())
+    
+    async def calculate_item(index: int, request: CrateRequest) -> BatchItemResult:
+        try:
+            async with semaphore:
+                results = await calculate_cached(request)
+            return BatchItemResult(index=index, ok=True, result=build_calculation_response(request, results))
+        except HTTPException as e:
+            return BatchItemResult(index=index, ok=False, error=str(e.detail))
+        except Exception as e:
+            return BatchItemResult(index=index, ok=False, error=str(e))
+    
+    items = await asyncio.gather(*[
+        calculate_item(index, request) for index, request in enumerate(batch.requests)
+    ])
+    failed = sum(1 for item in items if not item.ok)
+    return BatchCalculationResponse(
+        count=len(items),
+        succeeded=len(items) - failed,
+        failed=failed,
+        items=items
+    )
+
 @app.post("/api/validate")
 async def validate_inputs(request: CrateRequest):
     """Validate crate specifications"""
@@ -400,76 +843,73 @@ async def validate_inputs(request: CrateRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/export/nx_expression")
-async def export_nx_expression(request: CrateRequest):
+async def export_nx_expression(request: CrateRequest, http_request: Request):
     """Generate and download NX expression file"""
     try:
-        # Import the NX expression service
-        from nx_expression_service import generate_full_nx_expression_content
-        
-        # Generate the full NX expression content using core logic
-        content = generate_full_nx_expression_content(
-            product_weight=request.product.weight,
-            product_length=request.product.length,
-            product_width=request.product.width,
-            product_height=request.product.height,
-            clearance=request.clearance,
-            panel_thickness=request.materials.panel_thickness,
-            include_top=request.include_top,
-            lumber_sizes=request.materials.lumber_sizes
-        )
-        
-        # Create timestamp for filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Enhanced filename with more parameters
-        material_type = "PLY" if request.materials.panel_thickness >= 0.5 else "OSB"
-        filename = (f"{timestamp}_Crate_"
-                   f"{request.product.length:.0f}x{request.product.width:.0f}x{request.product.height:.0f}_"
-                   f"W{request.product.weight:.0f}_"
-                   f"5P_"  # 5 panels
-                   f"{material_type}{request.materials.panel_thickness:.2f}_"
-                   f"C{request.clearance:.1f}_"
-                   f"ASTM.exp")
-        
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/plain",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Access-Control-Expose-Headers": "Content-Disposition"
+        async def render():
+            content = await generate_nx_cached(request)
+            filename = nx_expression_filename(request)
+            return content.encode("utf-8"), "text/plain", {
+                "Content-Disposition": f"attachment; filename={filename}"
             }
-        )
-        
-    except ImportError as e:
-        # Fallback to simple generation if import fails
-        print(f"Import error, using fallback: {e}")
-        content = generate_nx_expression_content_fallback(request)
         
-        # Create timestamp for filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        material_type = "PLY" if request.materials.panel_thickness >= 0.5 else "OSB"
-        filename = (f"{timestamp}_Crate_"
-                   f"{request.product.length:.0f}x{request.product.width:.0f}x{request.product.height:.0f}_"
-                   f"W{request.product.weight:.0f}_"
-                   f"5P_"
-                   f"{material_type}{request.materials.panel_thickness:.2f}_"
-                   f"C{request.clearance:.1f}_"
-                   f"ASTM.exp")
+        # Weak validator: the file header carries its generation time
+        return await cached_response(http_request, "nx_expression", request, render, weak=True)
         
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/plain",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Access-Control-Expose-Headers": "Content-Disposition"
-            }
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in NX generation: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/export/nx_expression/batch")
+async def export_nx_expression_batch(batch: BatchCrateRequest):
+    """Generate NX expression files for many crates and stream them as one zip"""
+    items = batch.requests
+    semaphore = asyncio.Semaphore(batch_concurrency())
+    
+    async def generate(request: CrateRequest) -> str:
+        async with semaphore:
+            return await generate_nx_cached(request)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    async def zip_stream():
+        # Items start once streaming starts, so a client that goes away before
+        # the body is read leaves no work behind; the zip is written in
+        # request order as results land
+        tasks = [asyncio.ensure_future(generate(request)) for request in items]
+        buffer = ZipStreamBuffer()
+        manifest = []
+        try:
+            with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for index, (request, task) in enumerate(zip(items, tasks)):
+                    filename = f"{index + 1:03d}_{nx_expression_filename(request, timestamp)}"
+                    try:
+                        content = await task
+                        archive.writestr(filename, content)
+                        manifest.append({"index": index, "filename": filename, "ok": True})
+                    except Exception as e:
+                        detail = e.detail if isinstance(e, HTTPException) else str(e)
+                        manifest.append({"index": index, "filename": None, "ok": False, "error": detail})
+                    yield buffer.drain()
+                archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+            yield buffer.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        zip_stream(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={timestamp}_Crates_x{len(items)}_NX.zip",
+            "Access-Control-Expose-Headers": "Content-Disposition"
+        }
+    )
+
 def generate_nx_expression_content_fallback(request: CrateRequest) -> str:
     """Generate basic NX expression file content as fallback"""
     # First calculate to get results
@@ -544,95 +984,421 @@ def generate_nx_expression_content_fallback(request: CrateRequest) -> str:
     
     return "\n".join(lines)
 
+def bom_filename_stem(request: CrateRequest) -> str:
+    product = request.product
+    return f"BOM_{product.length:.0f}x{product.width:.0f}x{product.height:.0f}"
+
+async def takeoff_window(requests: List[CrateRequest], offset: int) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """(crate number, take-off lines) for the window of crates starting at offset"""
+    chunk = requests[offset:offset + batch_concurrency()]
+    results = await asyncio.gather(*[takeoff_cached(request) for request in chunk])
+    return [(offset + index + 1, lines) for index, lines in enumerate(results)]
+
+async def iter_crates(requests: List[CrateRequest], computed: List[Tuple[int, List[Dict[str, Any]]]] = ()):
+    """(crate number, take-off lines) in order: the already computed crates, then a window at a time"""
+    for crate in computed:
+        yield crate
+    offset = len(computed)
+    while offset < len(requests):
+        window = await takeoff_window(requests, offset)
+        for crate in window:
+            yield crate
+        offset += len(window)
+
+async def bom_response(requests: List[CrateRequest], bom_format: str, filename_stem: str):
+    """Stream take-off lines for one or more crates as CSV or XLSX"""
+    if bom_format == "csv":
+        # The first window is taken off before the 200 goes out, so a bad request or a
+        # busy executor is still reported as a 4xx/5xx instead of a truncated file
+        first = await takeoff_window(requests, 0)
+        return StreamingResponse(
+            stream_csv(iter_crates(requests, first)),
+            media_type=CSV_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename_stem}.csv"}
+        )
+    spool = await build_xlsx(iter_crates(requests))
+    return StreamingResponse(
+        iter_file(spool),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename_stem}.xlsx"}
+    )
+
 @app.post("/api/export/bom")
-async def export_bom(request: CrateRequest, format: str = "excel"):
-    """Generate Bill of Materials"""
+async def export_bom(request: CrateRequest, format: str = "json"):
+    """Generate Bill of Materials as JSON, CSV or XLSX"""
     try:
-        # Calculate BOM
-        engine = CalculationEngine()
-        results = engine.calculate_crate(request)
-        
-        # Create BOM items
-        bom_items = [
-            BOMItem(
-                category="Panels",
-                description=f"3/4 inch Plywood Sheets (4x8)",
-                quantity=results["materials_summary"]["plywood_sheets"],
-                unit="sheets",
-                unit_cost=45.00,
-                total_cost=results["materials_summary"]["plywood_sheets"] * 45.00
-            ),
-            BOMItem(
-                category="Lumber",
-                description="2x4 Lumber",
-                quantity=results["materials_summary"]["lumber_length_ft"],
-                unit="linear ft",
-                unit_cost=1.50,
-                total_cost=results["materials_summary"]["lumber_length_ft"] * 1.50
-            ),
-            BOMItem(
-                category="Hardware",
-                description="Wood Screws #8 x 2.5",
-                quantity=250,
-                unit="pieces",
-                unit_cost=0.12,
-                total_cost=30.00
-            )
-        ]
+        bom_format = normalize_format(format)
+        if bom_format == "json":
+            lines = await takeoff_cached(request)
+            bom = build_bom(request, lines)
+            bom["quote"] = quote_vector(quantity_vector(lines), price_book.get())
+            return bom
+        return await bom_response([request], bom_format, bom_filename_stem(request))
         
-        # Return JSON for now, implement Excel export later
-        return {
-            "project": f"Crate for {request.product.length}x{request.product.width}x{request.product.height}",
-            "date": datetime.utcnow().isoformat(),
-            "items": [item.dict() for item in bom_items],
-            "total_cost": sum(item.total_cost for item in bom_items if item.total_cost)
-        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/export/bom/batch")
+async def export_bom_batch(batch: BatchCrateRequest, format: str = "csv"):
+    """Bill of Materials for many crates in one CSV or XLSX, rows tagged with the crate number"""
+    try:
+        bom_format = normalize_format(format)
+        if bom_format == "json":
+            raise ValueError("Batch BOM export supports csv or xlsx")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return await bom_response(batch.requests, bom_format, f"BOM_{len(batch.requests)}_crates_{timestamp}")
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def build_bom(request: CrateRequest, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bill of Materials from take-off lines"""
+    return {
+        "project": f"Crate for {request.product.length}x{request.product.width}x{request.product.height}",
+        "date": datetime.utcnow().isoformat(),
+        "items": lines,
+        "summary": summarize_takeoff(lines)
+    }
+
+def parse_stock_lengths(stock: Optional[str]) -> List[float]:
+    """Comma-separated stock lengths in inches, or the standard 8'-20' lengths"""
+    if not stock:
+        return list(DEFAULT_STOCK_LENGTHS)
+    try:
+        lengths = [float(value) for value in stock.split(",") if value.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid stock lengths '{stock}'")
+    if not lengths or min(lengths) <= 0:
+        raise ValueError("Stock lengths must be positive")
+    return lengths
+
+async def build_cut_list(requests: List[CrateRequest], stock: Optional[str], kerf: float) -> Dict[str, Any]:
+    """Cut plan for every lumber piece of the given crates, one size per worker"""
+    if kerf < 0 or kerf > 1:
+        raise ValueError("Kerf must be between 0 and 1 inch")
+    stock_lengths = parse_stock_lengths(stock)
+    pieces: Dict[str, List[float]] = {}
+    async for _, lines in iter_crates(requests):
+        for material, lengths in cut_pieces(lines).items():
+            pieces.setdefault(material, []).extend(lengths)
+    
+    materials = sorted(pieces)
+    with stage("cut_list"):
+        results = await asyncio.gather(*[
+            run_heavy(optimize_material, material, pieces[material], stock_lengths, kerf)
+            for material in materials
+        ])
+    cut_list = summarize_cut_list(list(results), kerf)
+    cut_list["crates"] = len(requests)
+    return cut_list
+
+@app.post("/api/cut-list")
+async def get_cut_list(request: CrateRequest, stock: Optional[str] = None, kerf: float = DEFAULT_KERF):
+    """Lumber cut plan for one crate: stock to buy per size, cuts per bar and waste"""
+    try:
+        return await build_cut_list([request], stock, kerf)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/cut-list/batch")
+async def get_cut_list_batch(batch: BatchCrateRequest, stock: Optional[str] = None, kerf: float = DEFAULT_KERF):
+    """Lumber cut plan for a whole order; pieces from all crates share stock"""
+    try:
+        return await build_cut_list(batch.requests, stock, kerf)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def build_geometry(request: CrateRequest, results: Dict[str, Any]) -> Dict[str, Any]:
+    """3D geometry data for visualization from engine results"""
+    # Generate 3D geometry
+    geometry = {
+        "panels": [],
+        "cleats": [],
+        "dimensions": results["crate_dimensions"]
+    }
+    
+    # Front panel
+    if "front" in results["panels"] and "error" not in results["panels"]["front"]:
+        panel = results["panels"]["front"]
+        geometry["panels"].append({
+            "name": "front",
+            "position": [0, 0, panel["height"]/2],
+            "size": [panel["width"], request.materials.panel_thickness, panel["height"]],
+            "color": "#8B4513"
+        })
+    
+    # Back panel
+    if "back" in results["panels"] and "error" not in results["panels"]["back"]:
+        panel = results["panels"]["back"]
+        geometry["panels"].append({
+            "name": "back",
+            "position": [0, results["crate_dimensions"]["internal_width"], panel["height"]/2],
+            "size": [panel["width"], request.materials.panel_thickness, panel["height"]],
+            "color": "#8B4513"
+        })
+    
+    # Add more panels and cleats...
+    
+    return geometry
+
 @app.post("/api/3d-geometry")
-async def get_3d_geometry(request: CrateRequest):
+async def get_3d_geometry(request: CrateRequest, http_request: Request):
     """Generate 3D geometry data for visualization"""
     try:
-        # Calculate crate
-        engine = CalculationEngine()
-        results = engine.calculate_crate(request)
-        
-        # Generate 3D geometry
-        geometry = {
-            "panels": [],
-            "cleats": [],
-            "dimensions": results["crate_dimensions"]
-        }
+        async def render():
+            # Calculate crate
+            results = await calculate_cached(request)
+            geometry = build_geometry(request, results)
+            return dumps(geometry), "application/json", {}
         
-        # Front panel
-        if "front" in results["panels"] and "error" not in results["panels"]["front"]:
-            panel = results["panels"]["front"]
-            geometry["panels"].append({
-                "name": "front",
-                "position": [0, 0, panel["height"]/2],
-                "size": [panel["width"], request.materials.panel_thickness, panel["height"]],
-                "color": "#8B4513"
-            })
-        
-        # Back panel
-        if "back" in results["panels"] and "error" not in results["panels"]["back"]:
-            panel = results["panels"]["back"]
-            geometry["panels"].append({
-                "name": "back",
-                "position": [0, results["crate_dimensions"]["internal_width"], panel["height"]/2],
-                "size": [panel["width"], request.materials.panel_thickness, panel["height"]],
-                "color": "#8B4513"
-            })
-        
-        # Add more panels and cleats...
-        
-        return geometry
+        return await cached_response(http_request, "3d_geometry", request, render)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+GLB_MEDIA_TYPE = "model/gltf-binary"
+
+@app.post("/api/3d-geometry/glb")
+async def get_3d_geometry_glb(request: CrateRequest, http_request: Request):
+    """
+    Complete crate geometry as binary glTF: one instanced unit-box mesh per
+    component type with Float32 translation/scale buffers (inches, Z up)
+    """
+    try:
+        async def render():
+            body = await run_heavy(render_crate_glb, **nx_expression_params(request))
+            product = request.product
+            filename = f"Crate_{product.length:.0f}x{product.width:.0f}x{product.height:.0f}.glb"
+            return body, GLB_MEDIA_TYPE, {"Content-Disposition": f"inline; filename={filename}"}
+        
+        return await cached_response(http_request, "3d_geometry_glb", request, render)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============= DESIGN RESOURCES =============
+
+DESIGN_ARTIFACTS = ["expressions", "bom", "geometry", "glb", "report"]
+
+def get_design_or_404(design_id: str) -> DesignRecord:
+    record = design_store.get(design_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Design {design_id} not found or expired")
+    return record
+
+def design_summary(record: DesignRecord) -> Dict[str, Any]:
+    return {
+        "design_id": record.design_id,
+        "created_at": datetime.utcfromtimestamp(record.created_at).isoformat(),
+        "ttl_seconds": design_store.ttl_seconds,
+        "artifacts": {name: f"/api/designs/{record.design_id}/{name}" for name in DESIGN_ARTIFACTS},
+        "artifacts_ready": design_store.artifact_names(record)
+    }
+
+def build_design_report(record: DesignRecord) -> Dict[str, Any]:
+    """Engineering summary of a stored design"""
+    request = record.request
+    calculation = record.result["calculation"]
+    nx = record.result["nx_components"]
+    return {
+        "design_id": record.design_id,
+        "product": request.product.model_dump(),
+        "clearance": request.clearance,
+        "crate_dimensions": calculation["crate_dimensions"],
+        "panel_assemblies": nx["dimensions"],
+        "skids": nx["skids"],
+        "floorboards": {
+            "count": len(nx["floorboards"].get("floorboards_data", [])),
+            "actual_middle_gap": nx["floorboards"].get("actual_middle_gap", 0),
+            "center_custom_board_width": nx["floorboards"].get("center_custom_board_width", 0)
+        },
+        "materials_summary": calculation["materials_summary"],
+        "compliance": calculation["compliance"]
+    }
+
+@app.post("/api/designs")
+async def create_design(request: CrateRequest):
+    """
+    Calculate a design once and store it. Expressions, BOM, geometry and report
+    are derived lazily from the stored result via /api/designs/{design_id}/...
+    """
+    try:
+        from nx_expression_service import calculate_nx_components
+        
+        design_id = canonical_request_key(request)
+        record = design_store.get(design_id)
+        if record is None:
+            async def compute():
+                calculation = await calculate_cached(request)
+                nx_components = await run_heavy(calculate_nx_components, **nx_expression_params(request))
+                record = design_store.put(design_id, request, {
+                    "calculation": calculation,
+                    "nx_components": nx_components
+                })
+                record_takeoff(design_id, takeoff_from_components(nx_components))
+                return record
+            
+            # Identical concurrent submissions share one component calculation
+            record = await design_flights.do(design_id, compute)
+        summary = design_summary(record)
+        summary["calculation"] = calculation_payload(request, record.result["calculation"])
+        return summary
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/designs/{design_id}")
+async def get_design(design_id: str):
+    """Stored design summary and calculation results"""
+    record = get_design_or_404(design_id)
+    summary = design_summary(record)
+    summary["calculation"] = calculation_payload(record.request, record.result["calculation"])
+    return summary
+
+@app.get("/api/designs/{design_id}/expressions")
+async def get_design_expressions(design_id: str):
+    """NX expression file emitted from the stored design"""
+    from nx_expression_service import render_nx_expression_content
+    
+    record = get_design_or_404(design_id)
+    
+    async def build(record: DesignRecord) -> str:
+        return await run_heavy(render_nx_expression_content, record.result["nx_components"])
+    
+    content = await design_store.artifact(record, "expressions", build)
+    filename = nx_expression_filename(record.request)
+    return Response(
+        content=content,
+        media_type="text/plain",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@app.get("/api/designs/{design_id}/bom")
+async def get_design_bom(design_id: str):
+    """Bill of Materials for the stored design"""
+    record = get_design_or_404(design_id)
+    
+    async def build(record: DesignRecord) -> Dict[str, Any]:
+        # Take off from the stored component results; no recalculation
+        lines = takeoff_cache.get(record.design_id)
+        if lines is None:
+            lines = takeoff_from_components(record.result["nx_components"])
+            record_takeoff(record.design_id, lines)
+        return build_bom(record.request, lines)
+    
+    # The BOM artifact is price-free; the quote uses whichever catalog is current
+    bom = dict(await design_store.artifact(record, "bom", build))
+    bom["quote"] = quote_vector(design_quantities(record), price_book.get())
+    return bom
+
+def design_quantities(record: DesignRecord) -> Dict[str, float]:
+    """Cached quantity vector of a stored design, taken off again if it was evicted"""
+    vector = quantity_ledger.vector(record.design_id)
+    if vector is None:
+        lines = takeoff_from_components(record.result["nx_components"])
+        record_takeoff(record.design_id, lines)
+        vector = quantity_vector(lines)
+    return vector
+
+@app.get("/api/designs/{design_id}/quote")
+async def get_design_quote(design_id: str, catalog_version: Optional[str] = None):
+    """Price the stored design's quantities with a catalog version (current by default)"""
+    record = get_design_or_404(design_id)
+    try:
+        catalog = price_book.get(catalog_version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    quote = quote_vector(design_quantities(record), catalog)
+    quote["design_id"] = design_id
+    return quote
+
+@app.get("/api/designs/{design_id}/geometry")
+async def get_design_geometry(design_id: str):
+    """3D geometry for the stored design"""
+    record = get_design_or_404(design_id)
+    
+    async def build(record: DesignRecord) -> Dict[str, Any]:
+        return build_geometry(record.request, record.result["calculation"])
+    
+    return await design_store.artifact(record, "geometry", build)
+
+@app.get("/api/designs/{design_id}/glb")
+async def get_design_glb(design_id: str):
+    """Instanced binary glTF geometry for the stored design"""
+    record = get_design_or_404(design_id)
+    
+    async def build(record: DesignRecord) -> bytes:
+        return await run_heavy(crate_glb, record.result["nx_components"])
+    
+    content = await design_store.artifact(record, "glb", build)
+    return Response(content=content, media_type=GLB_MEDIA_TYPE)
+
+@app.get("/api/designs/{design_id}/report")
+async def get_design_report(design_id: str):
+    """Engineering report for the stored design"""
+    record = get_design_or_404(design_id)
+    
+    async def build(record: DesignRecord) -> Dict[str, Any]:
+        return build_design_report(record)
+    
+    return await design_store.artifact(record, "report", build)
+
+# ============= PRICING =============
+
+@app.get("/api/pricing/catalog")
+async def get_price_catalog(version: Optional[str] = None):
+    """A published price catalog (the current one by default) and all versions"""
+    try:
+        catalog = price_book.get(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return {**catalog.to_dict(), "versions": price_book.versions()}
+
+@app.post("/api/pricing/catalog", status_code=201)
+async def publish_price_catalog(catalog: PriceCatalogRequest):
+    """Publish a new catalog version and make it current; stored quantities are not recomputed"""
+    if catalog.version in price_book:
+        raise HTTPException(status_code=409, detail=f"Catalog version '{catalog.version}' already exists")
+    try:
+        published = price_book.publish(PriceCatalog(
+            catalog.version, prices=catalog.prices, defaults=catalog.defaults, currency=catalog.currency
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return published.to_dict()
+
+@app.post("/api/pricing/requote")
+async def requote_designs(requote: RequoteRequest):
+    """Totals for many stored designs in one pass over the cached quantity vectors"""
+    try:
+        catalog = price_book.get(requote.catalog_version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    with stage("requote"):
+        return await run_light(quantity_ledger.quote_totals, catalog, requote.design_ids)
+
 @app.get("/api/materials")
 async def get_materials():
     """Get available materials and specifications"""
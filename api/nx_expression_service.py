@@ -21,6 +21,7 @@ from autocrate.end_panel_logic import calculate_end_panel_components
 from autocrate.top_panel_logic import calculate_top_panel_components
 from autocrate.floorboard_logic import calculate_floorboard_layout
 from autocrate.skid_logic import calculate_skid_layout, calculate_skid_lumber_properties
+from autocrate.stage_timing import stage
 
 def generate_full_nx_expression_content(
     product_weight: float,
@@ -40,122 +41,251 @@ def generate_full_nx_expression_content(
     Generate complete NX expression file content with all required variables
     matching desktop version exactly for CAD compatibility
     """
+    design = calculate_nx_components(
+        product_weight=product_weight,
+        product_length=product_length,
+        product_width=product_width,
+        product_height=product_height,
+        clearance=clearance,
+        panel_thickness=panel_thickness,
+        cleat_thickness=cleat_thickness,
+        cleat_width=cleat_width,
+        include_top=include_top,
+        lumber_sizes=lumber_sizes,
+        ground_clearance=ground_clearance,
+        floorboard_thickness=floorboard_thickness
+    )
+    return render_nx_expression_content(design)
+
+
+def calculate_nx_components(
+    product_weight: float,
+    product_length: float,
+    product_width: float,
+    product_height: float,
+    clearance: float = 2.0,
+    panel_thickness: float = 0.75,
+    cleat_thickness: float = 1.5,
+    cleat_width: float = 3.5,
+    include_top: bool = True,
+    lumber_sizes: List[str] = None,
+    ground_clearance: float = 4.0,
+    floorboard_thickness: float = 1.5
+) -> Dict[str, Any]:
+    """
+    Run the full crate calculation (panels, skids, floorboards) without emitting
+    expressions. The returned dict is everything render_nx_expression_content
+    needs, so a stored design can be re-emitted without recalculating.
+    """
     
     if lumber_sizes is None:
         lumber_sizes = ["1.5x3.5", "1.5x5.5"]
     
-    # Calculate crate dimensions - MUST match local version logic
-    crate_internal_length = product_length + 2 * clearance
-    crate_internal_width = product_width + 2 * clearance
-    crate_internal_height = product_height + clearance
+    with stage("od_cascade"):
+        # Calculate crate dimensions - MUST match local version logic
+        crate_internal_length = product_length + 2 * clearance
+        crate_internal_width = product_width + 2 * clearance
+        crate_internal_height = product_height + clearance
     
-    # Panel assembly dimensions - MATCH LOCAL VERSION EXACTLY
-    # Calculate panel total thickness (cleat + plywood)
-    panel_total_thickness = cleat_thickness + panel_thickness
+        # Panel assembly dimensions - MATCH LOCAL VERSION EXACTLY
+        # Calculate panel total thickness (cleat + plywood)
+        panel_total_thickness = cleat_thickness + panel_thickness
     
-    # Front/Back panels calculation from local version
-    front_panel_width = product_width + (2 * clearance) + (2 * panel_total_thickness)
-    front_panel_height = crate_internal_height + cleat_width  # This stays the same
-    back_panel_width = front_panel_width  # Back panel same as front
-    back_panel_height = front_panel_height
+        # Front/Back panels calculation from local version
+        front_panel_width = product_width + (2 * clearance) + (2 * panel_total_thickness)
+        front_panel_height = crate_internal_height + cleat_width  # This stays the same
+        back_panel_width = front_panel_width  # Back panel same as front
+        back_panel_height = front_panel_height
     
-    # Left/Right panels (End panels) fit between front and back
-    left_panel_width = crate_internal_width + 2 * panel_thickness
-    left_panel_height = front_panel_height
-    right_panel_width = left_panel_width
-    right_panel_height = left_panel_height
+        # Left/Right panels (End panels) fit between front and back
+        left_panel_width = crate_internal_width + 2 * panel_thickness
+        left_panel_height = front_panel_height
+        right_panel_width = left_panel_width
+        right_panel_height = left_panel_height
     
-    # Top panel covers everything
-    top_panel_length = crate_internal_length + 2 * (cleat_thickness + panel_thickness)
-    top_panel_width = front_panel_width  # Should match front panel width
+        # Top panel covers everything
+        top_panel_length = crate_internal_length + 2 * (cleat_thickness + panel_thickness)
+        top_panel_width = front_panel_width  # Should match front panel width
     
     # Calculate all panel components - match local version parameter names
-    front_components = calculate_front_panel_components(
-        front_panel_assembly_width=front_panel_width,
-        front_panel_assembly_height=front_panel_height,
-        panel_sheathing_thickness=panel_thickness,
-        cleat_material_thickness=cleat_thickness,
-        cleat_material_member_width=cleat_width,
-        include_klimps=True
-    )
-    
-    back_components = calculate_back_panel_components(
-        back_panel_assembly_width=back_panel_width,
-        back_panel_assembly_height=back_panel_height,
-        panel_sheathing_thickness=panel_thickness,
-        cleat_material_thickness=cleat_thickness,
-        cleat_material_member_width=cleat_width
-    )
+    with stage("panel_front"):
+        front_components = calculate_front_panel_components(
+            front_panel_assembly_width=front_panel_width,
+            front_panel_assembly_height=front_panel_height,
+            panel_sheathing_thickness=panel_thickness,
+            cleat_material_thickness=cleat_thickness,
+            cleat_material_member_width=cleat_width,
+            include_klimps=True
+        )
     
-    left_components = calculate_left_panel_components(
-        left_panel_assembly_length=left_panel_width,
-        left_panel_assembly_height=left_panel_height,
-        panel_sheathing_thickness=panel_thickness,
-        cleat_material_thickness=cleat_thickness,
-        cleat_material_member_width=cleat_width
-    )
+    with stage("panel_back"):
+        back_components = calculate_back_panel_components(
+            back_panel_assembly_width=back_panel_width,
+            back_panel_assembly_height=back_panel_height,
+            panel_sheathing_thickness=panel_thickness,
+            cleat_material_thickness=cleat_thickness,
+            cleat_material_member_width=cleat_width
+        )
     
-    # Right panel uses left panel logic
-    right_components = calculate_left_panel_components(
-        left_panel_assembly_length=right_panel_width,
-        left_panel_assembly_height=right_panel_height,
-        panel_sheathing_thickness=panel_thickness,
-        cleat_material_thickness=cleat_thickness,
-        cleat_material_member_width=cleat_width
-    )
+    with stage("panel_left"):
+        left_components = calculate_left_panel_components(
+            left_panel_assembly_length=left_panel_width,
+            left_panel_assembly_height=left_panel_height,
+            panel_sheathing_thickness=panel_thickness,
+            cleat_material_thickness=cleat_thickness,
+            cleat_material_member_width=cleat_width
+        )
     
-    if include_top:
-        top_components = calculate_top_panel_components(
-            top_panel_assembly_width=top_panel_width,
-            top_panel_assembly_length=top_panel_length,
+    with stage("panel_right"):
+        # Right panel uses left panel logic
+        right_components = calculate_left_panel_components(
+            left_panel_assembly_length=right_panel_width,
+            left_panel_assembly_height=right_panel_height,
             panel_sheathing_thickness=panel_thickness,
             cleat_material_thickness=cleat_thickness,
             cleat_material_member_width=cleat_width
         )
-    else:
-        top_components = None
     
-    # Calculate skids using proper logic
-    skid_props = calculate_skid_lumber_properties(
-        product_weight_lbs=product_weight,
-        allow_3x4_skids_bool=True
-    )
-    skid_actual_height_in = skid_props["skid_actual_height_in"]
-    skid_actual_width_in = skid_props["skid_actual_width_in"]
-    lumber_callout = skid_props["lumber_callout"]
-    
-    # Calculate skid layout
-    skid_layout = calculate_skid_layout(
-        crate_overall_width_od_in=crate_internal_width + 2 * panel_thickness,
-        skid_actual_width_in=skid_actual_width_in,
-        max_skid_spacing_rule_in=skid_props["max_skid_spacing_rule_in"]
-    )
+    with stage("panel_top"):
+        if include_top:
+            top_components = calculate_top_panel_components(
+                top_panel_assembly_width=top_panel_width,
+                top_panel_assembly_length=top_panel_length,
+                panel_sheathing_thickness=panel_thickness,
+                cleat_material_thickness=cleat_thickness,
+                cleat_material_member_width=cleat_width
+            )
+        else:
+            top_components = None
     
-    skid_data = {
-        'lumber_size': lumber_callout,
-        'skid_height': skid_actual_height_in,
-        'skid_width': skid_actual_width_in,
-        'skid_count': skid_layout['calc_skid_count'],
-        'skid_pitch': skid_layout['calc_skid_pitch_in'],
-        'first_skid_pos': skid_layout['calc_first_skid_pos_x_in']
-    }
+    with stage("skids"):
+        # Calculate skids using proper logic
+        skid_props = calculate_skid_lumber_properties(
+            product_weight_lbs=product_weight,
+            allow_3x4_skids_bool=True
+        )
+        skid_actual_height_in = skid_props["skid_actual_height_in"]
+        skid_actual_width_in = skid_props["skid_actual_width_in"]
+        lumber_callout = skid_props["lumber_callout"]
+    
+        # Calculate skid layout
+        skid_layout = calculate_skid_layout(
+            crate_overall_width_od_in=crate_internal_width + 2 * panel_thickness,
+            skid_actual_width_in=skid_actual_width_in,
+            max_skid_spacing_rule_in=skid_props["max_skid_spacing_rule_in"]
+        )
     
-    # Calculate floorboard layout with proper parameters
-    # Usable coverage is the internal width of the crate
-    fb_usable_coverage_y_in = crate_internal_width
-    # Start offset calculation
-    fb_initial_start_y_offset_abs = skid_actual_width_in / 2
-    
-    # Use default lumber widths if not provided
-    selected_std_lumber_widths = [5.5, 3.5, 1.5]  # Standard lumber widths
-    
-    floorboard_data = calculate_floorboard_layout(
-        fb_usable_coverage_y_in=fb_usable_coverage_y_in,
-        fb_initial_start_y_offset_abs=fb_initial_start_y_offset_abs,
-        selected_std_lumber_widths=selected_std_lumber_widths,
-        min_custom_lumber_width_in=1.5,
-        force_small_custom_board_bool=False
-    )
+        skid_data = {
+            'lumber_size': lumber_callout,
+            'skid_height': skid_actual_height_in,
+            'skid_width': skid_actual_width_in,
+            'skid_count': skid_layout['calc_skid_count'],
+            'skid_pitch': skid_layout['calc_skid_pitch_in'],
+            'first_skid_pos': skid_layout['calc_first_skid_pos_x_in']
+        }
+    
+    with stage("floorboards"):
+        # Calculate floorboard layout with proper parameters
+        # Usable coverage is the internal width of the crate
+        fb_usable_coverage_y_in = crate_internal_width
+        # Start offset calculation
+        fb_initial_start_y_offset_abs = skid_actual_width_in / 2
+    
+        # Use default lumber widths if not provided
+        selected_std_lumber_widths = [5.5, 3.5, 1.5]  # Standard lumber widths
+    
+        floorboard_data = calculate_floorboard_layout(
+            fb_usable_coverage_y_in=fb_usable_coverage_y_in,
+            fb_initial_start_y_offset_abs=fb_initial_start_y_offset_abs,
+            selected_std_lumber_widths=selected_std_lumber_widths,
+            min_custom_lumber_width_in=1.5,
+            force_small_custom_board_bool=False
+        )
+    
+    return {
+        "inputs": {
+            "product_weight": product_weight,
+            "product_length": product_length,
+            "product_width": product_width,
+            "product_height": product_height,
+            "clearance": clearance,
+            "panel_thickness": panel_thickness,
+            "cleat_thickness": cleat_thickness,
+            "cleat_width": cleat_width,
+            "include_top": include_top,
+            "lumber_sizes": lumber_sizes,
+            "ground_clearance": ground_clearance,
+            "floorboard_thickness": floorboard_thickness
+        },
+        "dimensions": {
+            "crate_internal_length": crate_internal_length,
+            "crate_internal_width": crate_internal_width,
+            "crate_internal_height": crate_internal_height,
+            "panel_total_thickness": panel_total_thickness,
+            "front_panel_width": front_panel_width,
+            "front_panel_height": front_panel_height,
+            "back_panel_width": back_panel_width,
+            "back_panel_height": back_panel_height,
+            "left_panel_width": left_panel_width,
+            "left_panel_height": left_panel_height,
+            "right_panel_width": right_panel_width,
+            "right_panel_height": right_panel_height,
+            "top_panel_length": top_panel_length,
+            "top_panel_width": top_panel_width
+        },
+        "panels": {
+            "front": front_components,
+            "back": back_components,
+            "left": left_components,
+            "right": right_components,
+            "top": top_components
+        },
+        "skids": skid_data,
+        "floorboards": floorboard_data
+    }
+
+
+def render_nx_expression_content(design: Dict[str, Any]) -> str:
+    """Emit the NX expression file for a design from calculate_nx_components"""
+    with stage("emission"):
+        return _emit_nx_expression_content(design)
+
+
+def _emit_nx_expression_content(design: Dict[str, Any]) -> str:
+    inputs = design["inputs"]
+    dims = design["dimensions"]
+    panels = design["panels"]
+    
+    product_weight = inputs["product_weight"]
+    product_length = inputs["product_length"]
+    product_width = inputs["product_width"]
+    product_height = inputs["product_height"]
+    clearance = inputs["clearance"]
+    panel_thickness = inputs["panel_thickness"]
+    cleat_thickness = inputs["cleat_thickness"]
+    cleat_width = inputs["cleat_width"]
+    ground_clearance = inputs["ground_clearance"]
+    floorboard_thickness = inputs["floorboard_thickness"]
+    
+    panel_total_thickness = dims["panel_total_thickness"]
+    front_panel_width = dims["front_panel_width"]
+    front_panel_height = dims["front_panel_height"]
+    back_panel_width = dims["back_panel_width"]
+    back_panel_height = dims["back_panel_height"]
+    left_panel_width = dims["left_panel_width"]
+    left_panel_height = dims["left_panel_height"]
+    right_panel_width = dims["right_panel_width"]
+    right_panel_height = dims["right_panel_height"]
+    top_panel_length = dims["top_panel_length"]
+    top_panel_width = dims["top_panel_width"]
+    
+    front_components = panels["front"]
+    back_components = panels["back"]
+    left_components = panels["left"]
+    right_components = panels["right"]
+    top_components = panels["top"]
+    skid_data = design["skids"]
+    floorboard_data = design["floorboards"]
     
     # Build expression file content
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,347 @@
+"""
+AutoCrate Pricing
+Versioned price catalogs applied to cached, price-independent quantity vectors.
+
+The engine's take-off produces a quantity vector per design (purchase
+quantities keyed by 'category|material|unit', see
+autocrate.quantity_takeoff.quantity_vector). The ledger keeps one vector per
+design as a row of a dense matrix whose columns are the quantity keys, so a
+price change never touches geometry: re-quoting every stored design is one
+matrix-vector product of the ledger against the catalog's price column.
+
+Catalogs are immutable once published and identified by a version string;
+quotes name the version they were priced with, and any published version can
+still be used to re-quote. A price is looked up by exact key first, then by
+'category|unit' default.
+
+Configuration (environment variables):
+    AUTOCRATE_PRICE_CATALOG         JSON file with the initial catalog (default: built-in rates)
+    AUTOCRATE_QUANTITY_LEDGER       JSON file the ledger is loaded from and saved to (default: none)
+    AUTOCRATE_QUANTITY_LEDGER_MAX   Max designs held in the ledger (default: 100000)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rates that used to be hard-coded in the BOM export
+DEFAULT_RATES = {
+    "Plywood|sheets": 45.00,
+    "Lumber|linear ft": 1.50,
+}
+
+INITIAL_ROWS = 1024
+
+
+def split_key(key: str) -> Tuple[str, str, str]:
+    category, material, unit = key.split("|", 2)
+    return category, material, unit
+
+
+class PriceCatalog:
+    """One immutable price list"""
+
+    def __init__(self, version: str, prices: Optional[Dict[str, float]] = None,
+                 defaults: Optional[Dict[str, float]] = None, currency: str = "USD",
+                 created_at: Optional[float] = None):
+        self.version = version
+        self.prices = {key: float(value) for key, value in (prices or {}).items()}
+        self.defaults = {key: float(value) for key, value in (defaults or {}).items()}
+        self.currency = currency
+        self.created_at = created_at if created_at is not None else time.time()
+        for value in list(self.prices.values()) + list(self.defaults.values()):
+            if value < 0:
+                raise ValueError("Prices must not be negative")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceCatalog":
+        return cls(
+            version=str(data["version"]),
+            prices=data.get("prices"),
+            defaults=data.get("defaults"),
+            currency=data.get("currency", "USD"),
+            created_at=data.get("created_at"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "currency": self.currency,
+            "created_at": self.created_at,
+            "prices": dict(self.prices),
+            "defaults": dict(self.defaults),
+        }
+
+    def unit_price(self, key: str) -> Optional[float]:
+        """Exact price for the key, else the category/unit default, else None"""
+        if key in self.prices:
+            return self.prices[key]
+        category, _, unit = split_key(key)
+        return self.defaults.get(f"{category}|{unit}")
+
+    def price_column(self, keys: List[str]) -> List[Optional[float]]:
+        return [self.unit_price(key) for key in keys]
+
+
+class PriceBook:
+    """Published catalogs by version, plus the version new quotes use"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._catalogs: "OrderedDict[str, PriceCatalog]" = OrderedDict()
+        self.current_version: Optional[str] = None
+        path = path if path is not None else os.environ.get("AUTOCRATE_PRICE_CATALOG")
+        if path:
+            self.publish(PriceCatalog.from_dict(json.loads(Path(path).read_text(encoding="utf-8"))))
+        else:
+            self.publish(PriceCatalog("default", defaults=DEFAULT_RATES))
+
+    def publish(self, catalog: PriceCatalog) -> PriceCatalog:
+        """Add a catalog and make it current; published versions cannot be replaced"""
+        with self._lock:
+            if catalog.version in self._catalogs:
+                raise ValueError(f"Catalog version '{catalog.version}' already exists")
+            self._catalogs[catalog.version] = catalog
+            self.current_version = catalog.version
+        return catalog
+
+    def get(self, version: Optional[str] = None) -> PriceCatalog:
+        """A published catalog (the current one by default); KeyError if unknown"""
+        version = version or self.current_version
+        try:
+            return self._catalogs[version]
+        except KeyError:
+            raise KeyError(f"Unknown catalog version '{version}'")
+
+    def __contains__(self, version: str) -> bool:
+        return version in self._catalogs
+
+    def versions(self) -> List[Dict[str, Any]]:
+        return [
+            {"version": catalog.version, "created_at": catalog.created_at,
+             "current": catalog.version == self.current_version}
+            for catalog in self._catalogs.values()
+        ]
+
+
+def quote_vector(vector: Dict[str, float], catalog: PriceCatalog) -> Dict[str, Any]:
+    """Priced purchase lines for one design"""
+    lines = []
+    unpriced = []
+    total = 0.0
+    for key, quantity in sorted(vector.items()):
+        category, material, unit = split_key(key)
+        unit_price = catalog.unit_price(key)
+        line_total = round(quantity * unit_price, 2) if unit_price is not None else None
+        if unit_price is None:
+            unpriced.append(key)
+        else:
+            total += quantity * unit_price
+        lines.append({
+            "category": category,
+            "material": material,
+            "quantity": quantity,
+            "unit": unit,
+            "unit_cost": unit_price,
+            "total_cost": line_total,
+        })
+    return {
+        "catalog_version": catalog.version,
+        "currency": catalog.currency,
+        "items": lines,
+        "total_cost": round(total, 2),
+        "unpriced": unpriced,
+    }
+
+
+class QuantityLedger:
+    """
+    Quantity vectors of stored designs as rows of one matrix (design id ->
+    row, quantity key -> column), evicting the oldest designs past max_entries.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, path: Optional[str] = None):
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.environ.get("AUTOCRATE_QUANTITY_LEDGER_MAX", 100000))
+        path = path if path is not None else os.environ.get("AUTOCRATE_QUANTITY_LEDGER")
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self.keys: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = []
+        self._width = 0
+        self._matrix = self._allocate(INITIAL_ROWS, 0)
+        self.evictions = 0
+
+    # ---------- storage ----------
+
+    @staticmethod
+    def _allocate(rows: int, columns: int):
+        if np is not None:
+            return np.zeros((rows, columns), dtype=np.float64)
+        return [[0.0] * columns for _ in range(rows)]
+
+    def _capacity(self) -> int:
+        return len(self._matrix)
+
+    def _grow_locked(self, rows: int, columns: int) -> None:
+        """Resize to at least rows x columns, copying the current block"""
+        old_rows = self._capacity()
+        if rows <= old_rows and columns <= self._width:
+            return
+        rows = max(rows, old_rows)
+        columns = max(columns, self._width)
+        matrix = self._allocate(rows, columns)
+        if np is not None:
+            matrix[:old_rows, :self._width] = self._matrix
+        else:
+            for index, row in enumerate(self._matrix):
+                matrix[index][:self._width] = row
+        self._matrix = matrix
+        self._width = columns
+
+    def add(self, design_id: str, vector: Dict[str, float]) -> None:
+        """Store (or replace) one design's quantity vector"""
+        with self._lock:
+            new_keys = [key for key in vector if key not in self._columns]
+            for key in new_keys:
+                self._columns[key] = len(self.keys)
+                self.keys.append(key)
+            row = self._rows.get(design_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = len(self._rows)
+                    if row >= self._capacity():
+                        self._grow_locked(2 * self._capacity(), len(self.keys))
+            if new_keys:
+                self._grow_locked(self._capacity(), len(self.keys))
+
+            values = [0.0] * len(self.keys)
+            for key, quantity in vector.items():
+                values[self._columns[key]] = float(quantity)
+            self._matrix[row][:] = values
+            self._rows[design_id] = row
+            self._rows.move_to_end(design_id)
+
+            while len(self._rows) > self.max_entries:
+                _, evicted = self._rows.popitem(last=False)
+                self._matrix[evicted][:] = [0.0] * len(self.keys)
+                self._free.append(evicted)
+                self.evictions += 1
+
+    def vector(self, design_id: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            row = self._rows.get(design_id)
+            if row is None:
+                return None
+            values = self._matrix[row]
+            return {key: float(values[column]) for key, column in self._columns.items() if values[column]}
+
+    def __contains__(self, design_id: str) -> bool:
+        return design_id in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ---------- pricing ----------
+
+    def quote_totals(self, catalog: PriceCatalog,
+                     design_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Total cost of many designs in one pass. Returns per-design totals in
+        the requested order (all designs by default), ids not in the ledger,
+        and the quantity keys the catalog has no price for.
+        """
+        with self._lock:
+            if design_ids is None:
+                ids = list(self._rows)
+                missing: List[str] = []
+            else:
+                requested = list(design_ids)
+                ids = [design_id for design_id in requested if design_id in self._rows]
+                missing = [design_id for design_id in requested if design_id not in self._rows]
+            rows = [self._rows[design_id] for design_id in ids]
+            prices = catalog.price_column(self.keys)
+            unpriced_columns = [column for column, price in enumerate(prices) if price is None]
+
+            if np is not None:
+                price_vector = np.array([price or 0.0 for price in prices], dtype=np.float64)
+                block = self._matrix[rows, :len(self.keys)]
+                totals = np.round(block @ price_vector, 2).tolist()
+                needs_price = (block[:, unpriced_columns] > 0).any(axis=0) if unpriced_columns else []
+                unpriced = [self.keys[column] for column, flag in zip(unpriced_columns, needs_price) if flag]
+            else:
+                totals = []
+                needed = set()
+                for row in rows:
+                    values = self._matrix[row]
+                    totals.append(round(sum(
+                        values[column] * price for column, price in enumerate(prices) if price
+                    ), 2))
+                    needed.update(column for column in unpriced_columns if values[column] > 0)
+                unpriced = [self.keys[column] for column in sorted(needed)]
+
+        return {
+            "catalog_version": catalog.version,
+            "currency": catalog.currency,
+            "count": len(ids),
+            "totals": dict(zip(ids, totals)),
+            "missing": missing,
+            "unpriced": unpriced,
+        }
+
+    # ---------- persistence ----------
+
+    def load(self) -> int:
+        """Load vectors saved by save(); returns the number of designs loaded"""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        keys = data.get("keys", [])
+        for design_id, values in data.get("designs", {}).items():
+            self.add(design_id, {key: value for key, value in zip(keys, values) if value})
+        return len(data.get("designs", {}))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            columns = len(self.keys)
+            designs = {
+                design_id: [float(value) for value in self._matrix[row][:columns]]
+                for design_id, row in self._rows.items()
+            }
+            keys = list(self.keys)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"keys": keys, "designs": designs}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "designs": len(self._rows),
+            "max_entries": self.max_entries,
+            "quantity_keys": len(self.keys),
+            "evictions": self.evictions,
+            "vectorized": np is not None,
+            "persisted": self.path is not None,
+        }
+
+
+price_book = PriceBook()
+quantity_ledger = QuantityLedger()
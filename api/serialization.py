@@ -0,0 +1,140 @@
+"""
+AutoCrate API Serialization
+Fast JSON encoding, lean/projected payloads and response compression.
+
+Panel component dicts carry bulky klimp analysis data (placement zones,
+exclusion zones, spacing analysis) that the web viewer never renders. Clients
+can ask for a lean payload, or project exactly the fields they need with a
+comma-separated `fields=` list of dotted paths (`*` matches any key), e.g.
+`fields=design_key,materials_summary,panels.*.width,panels.*.height`.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Klimp analysis data dropped from lean responses
+LEAN_DROP_KEYS = frozenset({"placement_zones", "exclusion_zones", "spacing_analysis"})
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def strip_lean(obj: Any) -> Any:
+    """Copy of obj without the heavy klimp analysis keys, at any depth"""
+    if isinstance(obj, dict):
+        return {k: strip_lean(v) for k, v in obj.items() if k not in LEAN_DROP_KEYS}
+    if isinstance(obj, list):
+        return [strip_lean(v) for v in obj]
+    return obj
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a `fields=` query value into dotted paths; None means everything"""
+    if not fields:
+        return None
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    return sorted(set(paths)) or None
+
+
+def project(obj: Dict[str, Any], paths: List[str]) -> Dict[str, Any]:
+    """Keep only the given dotted paths of a nested dict"""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break  # an ancestor is already selected whole
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = True
+    return _apply_projection(obj, tree)
+
+
+def _apply_projection(obj: Any, tree: Dict[str, Any]) -> Any:
+    if not isinstance(obj, dict):
+        return obj
+    result = {}
+    for key, subtree in tree.items():
+        keys = obj.keys() if key == "*" else ([key] if key in obj else [])
+        for k in keys:
+            value = obj[k] if subtree is True else _apply_projection(obj[k], subtree)
+            if k in result and isinstance(result[k], dict) and isinstance(value, dict):
+                result[k].update(value)
+            else:
+                result[k] = value
+    return result
+
+
+def shape_payload(payload: Dict[str, Any], fields: Optional[List[str]] = None,
+                  lean: bool = False) -> Dict[str, Any]:
+    """Apply lean stripping and field projection to a response payload"""
+    if lean:
+        payload = strip_lean(payload)
+    if fields:
+        payload = project(payload, fields)
+    return payload
+
+
+def variant_key(fields: Optional[List[str]] = None, lean: bool = False) -> str:
+    """Cache/ETag discriminator for a payload shape"""
+    return f"lean={int(lean)};fields={','.join(fields or [])}"
+
+
+def supported_encodings() -> List[str]:
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,47 @@
+"""
+AutoCrate Server-Timing
+Per-request stage breakdowns for the `Server-Timing` response header.
+
+Each request runs under a StageRecorder, so every engine stage it triggers
+(OD cascade, each panel, klimps, emission, serialization) is collected,
+including stages timed inside executor workers. The totals are reported as
+`name;dur=<ms>` entries plus an overall `total`; with `debug_timing=true` the
+same breakdown is also added to JSON response bodies.
+
+Configuration (environment variables):
+    AUTOCRATE_SERVER_TIMING    Set to 0 to disable the header (default: 1)
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+ENABLED = os.environ.get("AUTOCRATE_SERVER_TIMING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+DEBUG_PARAM = "debug_timing"
+
+# Request headers dropped in debug mode so the handler returns a full, uncompressed body
+DEBUG_STRIPPED_HEADERS = (b"accept-encoding", b"if-none-match")
+
+
+def debug_requested(value: Optional[str]) -> bool:
+    return bool(value) and value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _token(name: str) -> str:
+    """Server-Timing metric names are HTTP tokens"""
+    return "".join(c if c.isalnum() or c in "_-." else "_" for c in name) or "stage"
+
+
+def format_header(totals: Dict[str, float], total_seconds: float) -> str:
+    """`name;dur=ms` entries for each stage, followed by the whole request"""
+    entries = [f"{_token(name)};dur={seconds * 1000:.3f}" for name, seconds in totals.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def breakdown(totals: Dict[str, float], total_seconds: float) -> Dict[str, Any]:
+    """Body form of the same timings, in milliseconds"""
+    return {
+        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in totals.items()},
+        "total_ms": round(total_seconds * 1000, 3),
+    }
@@ -0,0 +1,64 @@
+"""
+AutoCrate Single-Flight Coalescing
+Concurrent identical requests share one in-progress computation.
+
+A double-click or several tabs on the same design would otherwise run the
+same calculation side by side. The first caller for a key starts the work as
+its own task; later callers with that key await the same task until it
+finishes. The task is shielded, so one client disconnecting does not cancel
+the computation for the others.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Deduplicate concurrent async computations by key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() for key, joining an identical computation already in flight"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        self._inflight.pop(key, None)
+        self._waiters.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "computations": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+            "max_waiters": self.max_waiters,
+        }
+
+
+# One group per computation kind so keys never collide across endpoints
+calculation_flights = SingleFlight("calculation")
+nx_expression_flights = SingleFlight("nx_expression")
+takeoff_flights = SingleFlight("takeoff")
+design_flights = SingleFlight("design")
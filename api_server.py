@@ -3,21 +3,27 @@ AutoCrate NX Expression API Server
 Provides REST API for NX expression generation using the exact desktop calculation engine
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 import sys
 import os
 import json
 from datetime import datetime
-import tempfile
 import traceback
 import math
 
 # Add parent directory to path to import AutoCrate modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api'))
 
 # Import the exact desktop calculation engine logic function
-from autocrate.nx_expressions_generator import generate_crate_expressions_logic
+from autocrate.nx_expressions_generator import generate_crate_expressions_content
+
+# Same warm worker pool and limits as the FastAPI server
+from executor import get_executor, ExecutorBusyError, ExecutorTimeoutError
+from artifact_store import artifact_store
+
+executor = get_executor()
 
 app = Flask(__name__)
 
@@ -33,7 +39,9 @@ def health():
     return jsonify({
         'status': 'healthy',
         'version': '1.1.0',
-        'engine': 'desktop_python'
+        'engine': 'desktop_python',
+        'executor': executor.stats(),
+        'artifacts': artifact_store.stats()
     })
 
 @app.route('/api/calculate', methods=['POST'])
@@ -195,7 +203,7 @@ def generate_nx():
             "TP": True   # Top Panel
         }
         
-        # Create temporary file for output
+        # Download filename for the generated expressions
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         material_type = "PLY" if panel_thickness >= 0.5 else "OSB"
         filename = (f"{timestamp}_Crate_"
@@ -204,10 +212,9 @@ def generate_nx():
                    f"5P_{material_type}{panel_thickness:.2f}_"
                    f"C{clearance:.1f}_ASTM.exp")
         
-        temp_path = os.path.join(tempfile.gettempdir(), filename)
-        
-        # Call the actual desktop logic function
-        success, message = generate_crate_expressions_logic(
+        # Call the actual desktop logic, in memory, on the shared worker pool
+        success, result = executor.call_heavy(
+            generate_crate_expressions_content,
             product_weight_lbs=effective_weight,
             product_length_in=product_length,
             product_width_in=product_width,
@@ -224,29 +231,40 @@ def generate_nx():
             max_allowable_middle_gap_in=max_gap,
             min_custom_lumber_width_in=min_custom,
             force_small_custom_board_bool=force_custom,
-            output_filename=temp_path,
             plywood_panel_selections=plywood_selections
         )
         
         if not success:
             return jsonify({
                 'success': False,
-                'error': message
+                'error': result
             }), 400
         
-        # Read the generated expression file
-        with open(temp_path, 'r') as f:
-            expression_content = f.read()
+        expression_content = result
         
-        # Always return JSON with the expressions
-        # The client will handle creating the download
-        response = jsonify({
-            'success': True,
-            'expressions': expression_content,
-            'filename': filename,
-            'engine': 'desktop_python_logic',
-            'timestamp': datetime.now().isoformat()
-        })
+        # Optionally keep a copy in the managed artifact store
+        artifact = None
+        if data.get('persist') and artifact_store.enabled:
+            artifact = artifact_store.put(filename, expression_content.encode('utf-8'))
+        
+        if request.args.get('download', '').lower() in ('1', 'true', 'yes'):
+            # Return the file itself instead of JSON
+            response = Response(expression_content, mimetype='text/plain')
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        else:
+            # Return JSON with the expressions
+            # The client will handle creating the download
+            payload = {
+                'success': True,
+                'expressions': expression_content,
+                'filename': filename,
+                'engine': 'desktop_python_logic',
+                'timestamp': datetime.now().isoformat()
+            }
+            if artifact:
+                payload['artifact'] = artifact
+                payload['artifact_url'] = f'/api/artifacts/{artifact}'
+            response = jsonify(payload)
         
         # Add CORS headers explicitly for this response
         response.headers['Access-Control-Allow-Origin'] = '*'
@@ -255,6 +273,12 @@ def generate_nx():
         
         return response
         
+    except ExecutorBusyError as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except ExecutorTimeoutError as e:
+        return jsonify({'success': False, 'error': str(e)}), 504
     except Exception as e:
         return jsonify({
             'success': False,
@@ -262,6 +286,15 @@ def generate_nx():
             'traceback': traceback.format_exc()
         }), 500
 
+@app.route('/api/artifacts/<name>', methods=['GET'])
+def get_artifact(name):
+    """Download an export kept in the artifact store"""
+    path = artifact_store.path_for(name)
+    if path is None:
+        return jsonify({'error': 'Artifact not found'}), 404
+    return send_file(path, mimetype='text/plain', as_attachment=True,
+                     download_name=name.split('_', 1)[1])
+
 @app.route('/api/validate', methods=['POST'])
 def validate():
     """
@@ -0,0 +1,399 @@
+"""
+Crate Geometry
+
+Builds the assembled crate as axis-aligned boxes from the component results
+of `calculate_nx_components` (panels with their plywood and cleats, skids,
+floorboards, klimps) and packs them as binary glTF for the 3D viewers.
+
+Every part of a crate is a box, so each component type is one instanced mesh:
+a shared unit cube [0, 1]^3 plus per-instance translation (the box's minimum
+corner) and scale (its size). The .glb holds one mesh and one node per type
+using EXT_mesh_gpu_instancing, with Float32 TRANSLATION/SCALE accessors; the
+viewer uploads the buffers as-is instead of rebuilding boards from JSON.
+
+Coordinates are inches, Z up: X across the crate (front panel width, centred
+on 0), Y from the front face (0) to the back, Z from the bottom of the skids.
+The glTF root node converts to glTF's metres and Y up.
+"""
+
+import json
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .left_panel_logic import calculate_left_panel_components
+except ImportError:
+    from autocrate.left_panel_logic import calculate_left_panel_components
+
+Box = Tuple[Tuple[float, float, float], Tuple[float, float, float]]  # (min corner, size)
+
+# Mesh order and display colour per component type
+BOX_TYPES = ("skid", "floorboard", "plywood", "cleat", "klimp")
+TYPE_COLORS = {
+    "skid": "#5C4E42",
+    "floorboard": "#7A6A5A",
+    "plywood": "#8B7355",
+    "cleat": "#6B5D54",
+    "klimp": "#4A4A4A",
+}
+
+# Klimp stand-in: square footprint (diameter) and depth proud of the plywood
+KLIMP_DEPTH = 0.25
+
+INCH_TO_METRE = 0.0254
+
+# Unit cube as 6 faces x 4 vertices (flat normals), counter-clockwise outside
+_CUBE_FACES = (
+    ((1, 0, 0), ((1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1))),
+    ((-1, 0, 0), ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0))),
+    ((0, 1, 0), ((0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0))),
+    ((0, -1, 0), ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1))),
+    ((0, 0, 1), ((0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1))),
+    ((0, 0, -1), ((0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0))),
+)
+
+
+def unit_cube() -> Tuple[List[float], List[float], List[int]]:
+    """(positions, normals, triangle indices) of the shared unit cube"""
+    positions: List[float] = []
+    normals: List[float] = []
+    indices: List[int] = []
+    for normal, corners in _CUBE_FACES:
+        base = len(positions) // 3
+        for corner in corners:
+            positions.extend(corner)
+            normals.extend(normal)
+        indices.extend((base, base + 1, base + 2, base, base + 2, base + 3))
+    return positions, normals, indices
+
+
+class BoxSet:
+    """Instances of one component type: minimum corners, sizes and names"""
+
+    def __init__(self):
+        self.offsets: List[float] = []
+        self.sizes: List[float] = []
+        self.names: List[str] = []
+
+    def add(self, name: str, origin: Tuple[float, float, float], size: Tuple[float, float, float]) -> None:
+        if min(size) <= 0:
+            return
+        self.offsets.extend(origin)
+        self.sizes.extend(size)
+        self.names.append(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def bounds(self) -> Optional[Tuple[List[float], List[float]]]:
+        if not self.names:
+            return None
+        low = [min(self.offsets[axis::3]) for axis in range(3)]
+        high = [max(o + s for o, s in zip(self.offsets[axis::3], self.sizes[axis::3])) for axis in range(3)]
+        return low, high
+
+
+class PanelFrame:
+    """
+    Maps panel-local boxes to world boxes. Local u runs along the panel
+    width, v along its height, and depth n inward from the outside face
+    (plywood first, then cleats).
+    """
+
+    def __init__(self, origin: Tuple[float, float, float], u: Tuple[int, int, int],
+                 v: Tuple[int, int, int], n: Tuple[int, int, int]):
+        self.origin = origin
+        self.axes = (u, v, n)
+
+    def box(self, u0: float, v0: float, n0: float, du: float, dv: float, dn: float) -> Box:
+        low = list(self.origin)
+        high = list(self.origin)
+        for axis, start, length in zip(self.axes, (u0, v0, n0), (du, dv, dn)):
+            for index, sign in enumerate(axis):
+                if sign:
+                    a = self.origin[index] + sign * start
+                    b = a + sign * length
+                    low[index], high[index] = min(a, b), max(a, b)
+        return (low[0], low[1], low[2]), (high[0] - low[0], high[1] - low[1], high[2] - low[2])
+
+
+def _panel_face(panel_name: str, plywood: Dict[str, Any]) -> Tuple[float, float]:
+    if panel_name == "top":
+        return plywood.get("width", 0), plywood.get("length", 0)
+    return plywood.get("width", plywood.get("length", 0)), plywood.get("height", 0)
+
+
+def _add_panel(boxes: Dict[str, BoxSet], panel_name: str, components: Dict[str, Any],
+               frame: PanelFrame) -> None:
+    """Plywood, cleats and klimps of one panel, in the panel's local frame"""
+    plywood = components.get("plywood") or {}
+    width, height = _panel_face(panel_name, plywood)
+    thickness = plywood.get("thickness", 0.75)
+    label = panel_name.capitalize()
+    if width > 0 and height > 0:
+        boxes["plywood"].add(f"{label} Plywood", *frame.box(0, 0, 0, width, height, thickness))
+
+    def cleat(name: str, group: Dict[str, Any], u0: float, v0: float, du: float, dv: float) -> None:
+        depth = group.get("material_thickness", 1.5)
+        boxes["cleat"].add(f"{label} {name}", *frame.box(u0, v0, thickness, du, dv, depth))
+
+    # Edge cleats: along the width at the bottom/top, along the height at the sides
+    along_width = components.get("horizontal_cleats") or components.get("secondary_cleats")
+    along_height = components.get("vertical_cleats") or components.get("primary_cleats")
+    if along_width and along_width.get("count") and along_width.get("length"):
+        member = along_width.get("material_member_width", 3.5)
+        u0 = (width - along_width["length"]) / 2
+        cleat("Bottom Cleat", along_width, u0, 0, along_width["length"], member)
+        if along_width["count"] > 1:
+            cleat("Top Cleat", along_width, u0, height - member, along_width["length"], member)
+    if along_height and along_height.get("count") and along_height.get("length"):
+        member = along_height.get("material_member_width", 3.5)
+        v0 = (height - along_height["length"]) / 2
+        cleat("Left Cleat", along_height, 0, v0, member, along_height["length"])
+        if along_height["count"] > 1:
+            cleat("Right Cleat", along_height, width - member, v0, member, along_height["length"])
+
+    group = components.get("intermediate_vertical_cleats") or components.get("intermediate_cleats")
+    if group and group.get("length"):
+        member = group.get("material_member_width", 3.5)
+        v0 = (height - group["length"]) / 2
+        for index, center in enumerate(group.get("positions_x_centerline", [])[:group.get("count", 0)]):
+            cleat(f"Intermediate Cleat {index + 1}", group, center - member / 2, v0, member, group["length"])
+
+    group = components.get("intermediate_horizontal_cleats")
+    if group:
+        member = group.get("material_member_width", 3.5)
+        if group.get("sections"):
+            pieces = [(s.get("x_pos", 0), s.get("y_pos_bottom_edge", 0), s.get("width", 0))
+                      for s in group["sections"]]
+        else:
+            pieces = [(i.get("x_pos", 0), i.get("y_pos", 0), i.get("width", 0))
+                      for i in group.get("instances", []) if i.get("suppress_flag") == 1]
+        for index, (u0, v0, length) in enumerate(pieces):
+            cleat(f"Horizontal Cleat {index + 1}", group, u0, v0, length, member)
+
+    klimps = components.get("klimps")
+    if klimps:
+        size = klimps.get("diameter", 1.0)
+        for position in klimps.get("positions", []):
+            boxes["klimp"].add(
+                f"{label} Klimp {position.get('id', len(boxes['klimp']) + 1)}",
+                *frame.box(position["x_pos"] - size / 2, position["y_pos"] - size / 2, -KLIMP_DEPTH,
+                           size, size, KLIMP_DEPTH)
+            )
+
+
+def _side_panel_components(components: Dict[str, Any], face_length: float,
+                           inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Side panel components for the face between the front and back panels.
+    The engine sizes left/right panels from the crate width, so when that
+    differs from the face the frame leaves they are laid out again by the
+    same panel logic for the actual face length.
+    """
+    plywood = components.get("plywood") or {}
+    if abs(_panel_face("left", plywood)[0] - face_length) < 1e-6:
+        return components
+    return calculate_left_panel_components(
+        left_panel_assembly_length=face_length,
+        left_panel_assembly_height=plywood.get("height", 0),
+        panel_sheathing_thickness=plywood.get("thickness", inputs.get("panel_thickness", 0.75)),
+        cleat_material_thickness=inputs.get("cleat_thickness", 1.5),
+        cleat_material_member_width=inputs.get("cleat_width", 3.5)
+    )
+
+
+def build_crate_boxes(design: Dict[str, Any]) -> Dict[str, BoxSet]:
+    """
+    World-space boxes per component type for one crate.
+
+    Front and back panels close the ends of the crate; the side walls and
+    the floor fill the span between their inside faces. Skids are
+    Skid_Actual_Length long, as in the .exp and the BOM, centred in the
+    crate length.
+
+    Args:
+        design: Output of calculate_nx_components
+
+    Returns:
+        {component type: BoxSet} for every type in BOX_TYPES (possibly empty)
+    """
+    boxes = {box_type: BoxSet() for box_type in BOX_TYPES}
+    dimensions = design.get("dimensions", {})
+    panels = design.get("panels", {})
+    inputs = design.get("inputs", {})
+    width = dimensions.get("front_panel_width", 0)
+    length = dimensions.get("top_panel_length", 0) or dimensions.get("crate_internal_length", 0)
+    wall_height = dimensions.get("front_panel_height", 0)
+    depth = dimensions.get("panel_total_thickness", 2.25)
+    half = width / 2
+    inside_length = length - 2 * depth  # between the front and back panels
+
+    skids = design.get("skids") or {}
+    skid_height = skids.get("skid_height", 0)
+    skid_width = skids.get("skid_width", 0)
+    skid_length = width
+    skid_start = (length - skid_length) / 2
+    for index in range(skids.get("skid_count", 0)):
+        center = skids.get("first_skid_pos", 0) + index * skids.get("skid_pitch", 0)
+        boxes["skid"].add(f"Skid {index + 1}", (center - skid_width / 2, skid_start, 0),
+                          (skid_width, skid_length, skid_height))
+
+    # Board positions run across the crate; the layout is centred on X = 0
+    boards = [board for board in (design.get("floorboards") or {}).get("floorboards_data", [])
+              if board.get("width", 0) > 0]
+    if boards:
+        layout_low = min(board.get("y_pos", 0) for board in boards)
+        layout_high = max(board.get("y_pos", 0) + board["width"] for board in boards)
+        shift = -(layout_low + layout_high) / 2
+        board_thickness = inputs.get("floorboard_thickness", 1.5)
+        for index, board in enumerate(boards):
+            boxes["floorboard"].add(
+                f"Floorboard {index + 1}", (board.get("y_pos", 0) + shift, depth, skid_height),
+                (board["width"], inside_length, board_thickness)
+            )
+
+    z0 = skid_height
+    frames = {
+        "front": PanelFrame((-half, 0, z0), (1, 0, 0), (0, 0, 1), (0, 1, 0)),
+        "back": PanelFrame((half, length, z0), (-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+        "left": PanelFrame((-half, depth, z0), (0, 1, 0), (0, 0, 1), (1, 0, 0)),
+        "right": PanelFrame((half, length - depth, z0), (0, -1, 0), (0, 0, 1), (-1, 0, 0)),
+        "top": PanelFrame((-half, 0, z0 + wall_height + depth), (1, 0, 0), (0, 1, 0), (0, 0, -1)),
+    }
+
+    for name in ("front", "back", "left", "right", "top"):
+        components = panels.get(name)
+        if not components:
+            continue
+        if name in ("left", "right"):
+            components = _side_panel_components(components, inside_length, inputs)
+        _add_panel(boxes, name, components, frames[name])
+    return boxes
+
+
+def crate_bounds(boxes: Dict[str, BoxSet]) -> Optional[Tuple[List[float], List[float]]]:
+    """Overall (min, max) corners of all boxes"""
+    extents = [box_set.bounds() for box_set in boxes.values() if len(box_set)]
+    if not extents:
+        return None
+    low = [min(extent[0][axis] for extent in extents) for axis in range(3)]
+    high = [max(extent[1][axis] for extent in extents) for axis in range(3)]
+    return low, high
+
+
+def _hex_to_rgba(color: str) -> List[float]:
+    color = color.lstrip("#")
+    return [int(color[i:i + 2], 16) / 255.0 for i in (0, 2, 4)] + [1.0]
+
+
+def _pad4(data: bytes, fill: bytes = b"\x00") -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def pack_glb(boxes: Dict[str, BoxSet], extras: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Binary glTF 2.0: one unit-cube mesh per component type, instanced with
+    EXT_mesh_gpu_instancing. The binary chunk holds the shared cube
+    (positions, normals, uint16 indices) followed by each type's Float32
+    translation and scale arrays; instance names are in each node's extras.
+    """
+    positions, normals, indices = unit_cube()
+    blob = bytearray()
+    views: List[Dict[str, Any]] = []
+    accessors: List[Dict[str, Any]] = []
+
+    def add_view(data: bytes, target: Optional[int] = None) -> int:
+        blob.extend(b"\x00" * (-len(blob) % 4))
+        view = {"buffer": 0, "byteOffset": len(blob), "byteLength": len(data)}
+        if target:
+            view["target"] = target
+        blob.extend(data)
+        views.append(view)
+        return len(views) - 1
+
+    def add_accessor(view: int, component_type: int, count: int, kind: str,
+                     values: Optional[List[float]] = None) -> int:
+        accessor = {"bufferView": view, "componentType": component_type, "count": count, "type": kind}
+        if values is not None and kind == "VEC3" and count:
+            accessor["min"] = [min(values[axis::3]) for axis in range(3)]
+            accessor["max"] = [max(values[axis::3]) for axis in range(3)]
+        accessors.append(accessor)
+        return len(accessors) - 1
+
+    float32 = 5126
+    position_accessor = add_accessor(add_view(array("f", positions).tobytes(), 34962), float32, 24, "VEC3", positions)
+    normal_accessor = add_accessor(add_view(array("f", normals).tobytes(), 34962), float32, 24, "VEC3")
+    index_accessor = add_accessor(add_view(array("H", indices).tobytes(), 34963), 5123, len(indices), "SCALAR")
+
+    meshes, materials, nodes = [], [], []
+    for box_type in BOX_TYPES:
+        box_set = boxes.get(box_type)
+        if not box_set or not len(box_set):
+            continue
+        materials.append({
+            "name": box_type,
+            "pbrMetallicRoughness": {"baseColorFactor": _hex_to_rgba(TYPE_COLORS[box_type]),
+                                     "metallicFactor": 0.0, "roughnessFactor": 0.9},
+        })
+        meshes.append({"name": box_type, "primitives": [{
+            "attributes": {"POSITION": position_accessor, "NORMAL": normal_accessor},
+            "indices": index_accessor,
+            "material": len(materials) - 1,
+        }]})
+        translation = add_accessor(add_view(array("f", box_set.offsets).tobytes()), float32,
+                                   len(box_set), "VEC3", box_set.offsets)
+        scale = add_accessor(add_view(array("f", box_set.sizes).tobytes()), float32, len(box_set), "VEC3")
+        nodes.append({
+            "name": box_type,
+            "mesh": len(meshes) - 1,
+            "extensions": {"EXT_mesh_gpu_instancing": {
+                "attributes": {"TRANSLATION": translation, "SCALE": scale}
+            }},
+            "extras": {"instances": box_set.names},
+        })
+
+    # Root: inches Z-up -> metres Y-up (rotate -90 degrees about X)
+    nodes.append({
+        "name": "crate",
+        "children": list(range(len(nodes))),
+        "rotation": [-0.7071067811865476, 0.0, 0.0, 0.7071067811865476],
+        "scale": [INCH_TO_METRE] * 3,
+    })
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "AutoCrate"},
+        "extensionsUsed": ["EXT_mesh_gpu_instancing"],
+        "scene": 0,
+        "scenes": [{"nodes": [len(nodes) - 1]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(_pad4(bytes(blob)))}],
+    }
+    if extras:
+        gltf["extras"] = extras
+
+    json_chunk = _pad4(json.dumps(gltf, separators=(",", ":")).encode("utf-8"), b" ")
+    bin_chunk = _pad4(bytes(blob))
+    total = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
+    return b"".join((
+        struct.pack("<III", 0x46546C67, 2, total),
+        struct.pack("<II", len(json_chunk), 0x4E4F534A), json_chunk,
+        struct.pack("<II", len(bin_chunk), 0x004E4942), bin_chunk,
+    ))
+
+
+def crate_glb(design: Dict[str, Any]) -> bytes:
+    """Boxes for a design packed as .glb, with counts and bounds in the asset extras"""
+    boxes = build_crate_boxes(design)
+    bounds = crate_bounds(boxes)
+    return pack_glb(boxes, extras={
+        "units": "inch",
+        "up_axis": "Z",
+        "counts": {box_type: len(box_set) for box_type, box_set in boxes.items()},
+        "bounds": {"min": bounds[0], "max": bounds[1]} if bounds else None,
+    })
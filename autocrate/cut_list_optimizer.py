@@ -0,0 +1,338 @@
+"""
+Lumber Cut-List Optimizer
+
+Packs the lumber pieces of one crate (or a whole order of crates) into
+standard stock lengths, accounting for the saw kerf lost at every cut, and
+reports the cut plan and the waste.
+
+Each lumber size is an independent one-dimensional cutting-stock problem, so
+sizes are solved separately and can be mapped over a worker pool. Per size:
+
+1. First-fit decreasing on the longest stock length, with every bar then
+   shortened to the shortest stock length that still holds its cuts.
+2. When there are few distinct lengths (the usual crate case), a sequential
+   pattern heuristic as an alternative plan: a bounded subset-sum DP finds
+   the cutting pattern with the best yield over all stock lengths, which is
+   applied as many times as the remaining demand allows, then repeated on
+   what is left. The plan using less stock is kept.
+3. Improvement: the pieces of the bars with the largest offcuts are pooled
+   and re-cut with the pattern DP and with FFD on each stock length; the
+   repack replaces those bars while it saves stock.
+
+Everything works on distinct piece lengths with counts rather than on
+individual pieces, and lengths are integer units of 1/RESOLUTION inch (the
+DP is a bitset over Python ints), so thousands of pieces optimize in
+milliseconds.
+"""
+
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Common dimensional lumber lengths, inches (8' to 20')
+DEFAULT_STOCK_LENGTHS = (96.0, 120.0, 144.0, 168.0, 192.0, 240.0)
+
+# Typical circular saw blade kerf, inches
+DEFAULT_KERF = 0.125
+
+# Lengths are rounded up to this fraction of an inch
+RESOLUTION = 16
+
+# Full pattern DP only below this many distinct lengths per size
+MAX_PATTERN_LENGTHS = 64
+
+# Bars re-cut per improvement round, and the round limit
+REPACK_BARS = 32
+REPACK_ROUNDS = 8
+
+Pattern = Tuple[int, Tuple[int, ...]]  # (stock units, cut units longest first)
+
+
+def _units(length: float) -> int:
+    # Round up so a rounded piece is never shorter than the real one
+    return int(math.ceil(round(length * RESOLUTION, 6)))
+
+
+def _inches(units: int) -> float:
+    return units / RESOLUTION
+
+
+def _demand(lengths: Iterable[float]) -> Dict[int, int]:
+    counts: Dict[int, int] = {}
+    for length in lengths:
+        units = _units(length)
+        counts[units] = counts.get(units, 0) + 1
+    return counts
+
+
+def _smallest_stock(used: int, stock: List[int], kerf: int) -> int:
+    """Shortest stock length whose capacity (stock + kerf) covers `used`"""
+    for length in stock:
+        if used <= length + kerf:
+            return length
+    return stock[-1]
+
+
+def first_fit_decreasing(demand: Dict[int, int], stock: List[int], kerf: int) -> Dict[Pattern, int]:
+    """
+    FFD on the longest stock length. Identical pieces are placed a bar at a
+    time (as many as fit), which is the same result as placing them one by one.
+    """
+    capacity = stock[-1] + kerf
+    smallest = min(demand) + kerf
+    bars: List[List[Any]] = []  # [used units, cuts]
+    open_bars: List[List[Any]] = []  # bars that can still take the smallest piece
+    for length in sorted(demand, reverse=True):
+        remaining = demand[length]
+        size = length + kerf
+        for bar in open_bars:
+            if not remaining:
+                break
+            fit = min(remaining, (capacity - bar[0]) // size)
+            if fit:
+                bar[0] += fit * size
+                bar[1].extend([length] * fit)
+                remaining -= fit
+        per_bar = capacity // size
+        while remaining:
+            fit = min(remaining, per_bar)
+            bar = [fit * size, [length] * fit]
+            bars.append(bar)
+            open_bars.append(bar)
+            remaining -= fit
+        open_bars = [bar for bar in open_bars if capacity - bar[0] >= smallest]
+
+    patterns: Dict[Pattern, int] = {}
+    for used, cuts in bars:
+        key = (_smallest_stock(used, stock, kerf), tuple(cuts))
+        patterns[key] = patterns.get(key, 0) + 1
+    return patterns
+
+
+def _best_pattern(demand: Dict[int, int], stock: List[int], kerf: int) -> Optional[Pattern]:
+    """
+    Highest-yield single bar over all stock lengths: a bounded subset-sum over
+    the remaining pieces (binary-split counts, bitset reachability), then the
+    stock length with the best used/capacity ratio.
+    """
+    capacity = stock[-1] + kerf
+    mask = (1 << (capacity + 1)) - 1
+    items: List[Tuple[int, int]] = []  # (piece units, pieces in the item)
+    for length, count in sorted(demand.items(), reverse=True):
+        size = length + kerf
+        count = min(count, capacity // size)
+        part = 1
+        while count > 0:
+            take = min(part, count)
+            items.append((length, take))
+            count -= take
+            part *= 2
+
+    states = [1]
+    for length, take in items:
+        states.append((states[-1] | (states[-1] << (take * (length + kerf)))) & mask)
+    reachable = states[-1]
+
+    best = None
+    for length in stock:
+        limit = length + kerf
+        window = reachable & ((1 << (limit + 1)) - 1)
+        used = window.bit_length() - 1
+        if used <= 0:
+            continue
+        score = used / limit
+        if best is None or score > best[0] + 1e-12:
+            best = (score, length, used)
+    if best is None:
+        return None
+
+    _, stock_length, used = best
+    cuts: List[int] = []
+    for index in range(len(items), 0, -1):
+        if not (states[index - 1] >> used) & 1:
+            length, take = items[index - 1]
+            cuts.extend([length] * take)
+            used -= take * (length + kerf)
+    return stock_length, tuple(sorted(cuts, reverse=True))
+
+
+def sequential_patterns(demand: Dict[int, int], stock: List[int], kerf: int) -> Dict[Pattern, int]:
+    """Repeatedly cut the best remaining pattern as many times as demand allows"""
+    demand = dict(demand)
+    patterns: Dict[Pattern, int] = {}
+    while demand:
+        pattern = _best_pattern(demand, stock, kerf)
+        if pattern is None:
+            break
+        uses: Dict[int, int] = {}
+        for length in pattern[1]:
+            uses[length] = uses.get(length, 0) + 1
+        repeat = min(demand[length] // count for length, count in uses.items())
+        patterns[pattern] = patterns.get(pattern, 0) + repeat
+        for length, count in uses.items():
+            demand[length] -= count * repeat
+            if not demand[length]:
+                del demand[length]
+    return patterns
+
+
+def _stock_used(patterns: Dict[Pattern, int]) -> Tuple[int, int]:
+    return sum(stock * count for (stock, _), count in patterns.items()), sum(patterns.values())
+
+
+def _offcut(pattern: Pattern, kerf: int) -> int:
+    stock, cuts = pattern
+    return stock - sum(cuts) - len(cuts) * kerf
+
+
+def _candidate_plans(demand: Dict[int, int], stock: List[int], kerf: int) -> List[Dict[Pattern, int]]:
+    plans = [first_fit_decreasing(demand, stock, kerf)]
+    if len(demand) <= MAX_PATTERN_LENGTHS:
+        plans.append(sequential_patterns(demand, stock, kerf))
+    return plans
+
+
+def repack_worst(patterns: Dict[Pattern, int], stock: List[int], kerf: int) -> Dict[Pattern, int]:
+    """
+    Re-cut the pieces of the REPACK_BARS bars with the largest offcuts (pattern
+    DP, and FFD with each stock length as the longest bar), keeping the best
+    repack while it saves stock.
+    """
+    patterns = dict(patterns)
+    for _ in range(REPACK_ROUNDS):
+        worst: Dict[Pattern, int] = {}
+        taken = 0
+        for pattern in sorted(patterns, key=lambda p: _offcut(p, kerf), reverse=True):
+            if taken >= REPACK_BARS:
+                break
+            count = min(patterns[pattern], REPACK_BARS - taken)
+            worst[pattern] = count
+            taken += count
+
+        demand: Dict[int, int] = {}
+        for (_, cuts), count in worst.items():
+            for length in cuts:
+                demand[length] = demand.get(length, 0) + count
+        longest = max(demand)
+        candidates = _candidate_plans(demand, stock, kerf)
+        candidates.extend(
+            first_fit_decreasing(demand, stock[:index + 1], kerf)
+            for index, length in enumerate(stock[:-1]) if length + kerf >= longest + kerf
+        )
+        best = min(candidates, key=_stock_used)
+        if _stock_used(best) >= _stock_used(worst):
+            break
+        for pattern, count in worst.items():
+            patterns[pattern] -= count
+            if not patterns[pattern]:
+                del patterns[pattern]
+        for pattern, count in best.items():
+            patterns[pattern] = patterns.get(pattern, 0) + count
+    return patterns
+
+
+def optimize_material(material: str, lengths: List[float],
+                      stock_lengths: Iterable[float] = DEFAULT_STOCK_LENGTHS,
+                      kerf: float = DEFAULT_KERF) -> Dict[str, Any]:
+    """
+    Cut plan for one lumber size.
+
+    Args:
+        material: Lumber label, e.g. '2x4'
+        lengths: One entry per piece to cut, inches
+        stock_lengths: Available stock lengths, inches
+        kerf: Material lost per cut, inches
+
+    Returns:
+        Dict with the cut patterns (stock length, cuts, offcut, count), stock
+        purchased by length, and piece/kerf/offcut totals. Pieces longer than
+        the longest stock are listed under 'oversize' and left out of the plan.
+    """
+    stock = sorted({_units(length) for length in stock_lengths})
+    kerf_units = _units(kerf) if kerf > 0 else 0
+    demand = _demand(length for length in lengths if length > 0)
+    oversize = {length: count for length, count in demand.items() if length > stock[-1]}
+    for length in oversize:
+        del demand[length]
+
+    patterns: Dict[Pattern, int] = {}
+    method = None
+    repack_saved = 0
+    if demand:
+        plans = dict(zip(("first_fit_decreasing", "pattern_dp"), _candidate_plans(demand, stock, kerf_units)))
+        # Least stock length purchased, then fewest bars
+        method = min(plans, key=lambda name: _stock_used(plans[name]))
+        patterns = repack_worst(plans[method], stock, kerf_units)
+        repack_saved = _stock_used(plans[method])[0] - _stock_used(patterns)[0]
+
+    plan = []
+    stock_count: Dict[float, int] = {}
+    piece_total = kerf_total = offcut_total = 0
+    for (stock_length, cuts), count in sorted(patterns.items(), key=lambda item: (-item[0][0], -item[1])):
+        cut_length = sum(cuts)
+        kerf_loss = min(len(cuts) * kerf_units, stock_length - cut_length)
+        offcut = stock_length - cut_length - kerf_loss
+        plan.append({
+            "stock_length": _inches(stock_length),
+            "cuts": [_inches(cut) for cut in cuts],
+            "offcut": _inches(offcut),
+            "count": count,
+        })
+        stock_count[_inches(stock_length)] = stock_count.get(_inches(stock_length), 0) + count
+        piece_total += cut_length * count
+        kerf_total += kerf_loss * count
+        offcut_total += offcut * count
+
+    stock_total = piece_total + kerf_total + offcut_total
+    return {
+        "material": material,
+        "method": method,
+        "repack_saved_in": _inches(repack_saved),
+        "pieces": sum(demand.values()),
+        "bars": sum(stock_count.values()),
+        "stock": [{"length": length, "count": count} for length, count in sorted(stock_count.items())],
+        "patterns": plan,
+        "stock_length_in": _inches(stock_total),
+        "piece_length_in": _inches(piece_total),
+        "kerf_loss_in": _inches(kerf_total),
+        "offcut_in": _inches(offcut_total),
+        "waste_pct": round(100.0 * (stock_total - piece_total) / stock_total, 2) if stock_total else 0.0,
+        "oversize": [{"length": _inches(length), "count": count} for length, count in sorted(oversize.items())],
+    }
+
+
+def optimize_cut_list(pieces: Dict[str, List[float]],
+                      stock_lengths: Iterable[float] = DEFAULT_STOCK_LENGTHS,
+                      kerf: float = DEFAULT_KERF,
+                      map_fn: Callable = map) -> Dict[str, Any]:
+    """
+    Cut plans for every lumber size plus order totals.
+
+    Args:
+        pieces: {material: [piece lengths]}, e.g. from quantity_takeoff.cut_pieces
+        map_fn: map-like callable used to run the sizes, e.g. a pool's map
+    """
+    materials = sorted(pieces)
+    stock_lengths = tuple(stock_lengths)
+    results = list(map_fn(
+        optimize_material, materials, [pieces[m] for m in materials],
+        [stock_lengths] * len(materials), [kerf] * len(materials)
+    ))
+    return summarize_cut_list(results, kerf)
+
+
+def summarize_cut_list(results: List[Dict[str, Any]], kerf: float = DEFAULT_KERF) -> Dict[str, Any]:
+    """Combine per-material plans into one report"""
+    stock_total = sum(result["stock_length_in"] for result in results)
+    piece_total = sum(result["piece_length_in"] for result in results)
+    return {
+        "kerf": kerf,
+        "materials": results,
+        "summary": {
+            "pieces": sum(result["pieces"] for result in results),
+            "bars": sum(result["bars"] for result in results),
+            "stock_length_ft": round(stock_total / 12.0, 2),
+            "piece_length_ft": round(piece_total / 12.0, 2),
+            "waste_ft": round((stock_total - piece_total) / 12.0, 2),
+            "waste_pct": round(100.0 * (stock_total - piece_total) / stock_total, 2) if stock_total else 0.0,
+        },
+    }
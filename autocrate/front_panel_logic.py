@@ -13,12 +13,15 @@ from typing import Dict, List
 try:
     from .klimp_placement_logic import calculate_klimp_positions
     from .debug_logger import get_logger, debug_function
+    from .stage_timing import stage
 except ImportError:
     try:
         from klimp_placement_logic import calculate_klimp_positions
         from debug_logger import get_logger, debug_function
+        from stage_timing import stage
     except ImportError:
         # Fallback for cases where logging is not available
+        from contextlib import nullcontext as stage
         get_logger = lambda name: None
         debug_function = lambda logger: lambda func: func
 
@@ -195,14 +198,15 @@ def calculate_front_panel_components(
     }
     
     if include_klimps:
-        klimp_results = calculate_klimp_positions(
-            panel_width=front_panel_assembly_width,
-            panel_height=front_panel_assembly_height,
-            cleat_member_width=cleat_material_member_width,
-            vertical_cleats_data=intermediate_vertical_cleats_data,
-            horizontal_cleats_data=intermediate_horizontal_cleats_data,
-            klimp_diameter=klimp_diameter
-        )
+        with stage("klimps"):
+            klimp_results = calculate_klimp_positions(
+                panel_width=front_panel_assembly_width,
+                panel_height=front_panel_assembly_height,
+                cleat_member_width=cleat_material_member_width,
+                vertical_cleats_data=intermediate_vertical_cleats_data,
+                horizontal_cleats_data=intermediate_horizontal_cleats_data,
+                klimp_diameter=klimp_diameter
+            )
         
         klimps_data = klimp_results['klimps']
         klimps_data['orientation'] = "Front_Panel_Surface" if klimps_data['count'] > 0 else "None"
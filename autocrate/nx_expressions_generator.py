@@ -129,7 +129,7 @@ except ImportError as e:
                 print(f"Python path: {sys.path[:5]}")
             
             raise ImportError(error_msg)
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 
 # --- Default Constants ---
 DEFAULT_AVAILABLE_STD_LUMBER_WIDTHS = { 
@@ -294,7 +294,7 @@ def generate_plywood_nx_expressions(sheets: List[Dict], panel_prefix: str = "")
     
     return expressions
 
-def generate_crate_expressions_logic(
+def _generate_crate_expressions(
     # Skid Inputs
     product_weight_lbs: float, product_length_in: float, product_width_in: float,
     clearance_each_side_in: float, allow_3x4_skids_bool: bool,
@@ -307,11 +307,12 @@ def generate_crate_expressions_logic(
     floorboard_actual_thickness_in: float, selected_std_lumber_widths: list[float], 
     max_allowable_middle_gap_in: float, min_custom_lumber_width_in: float,
     force_small_custom_board_bool: bool, 
-    # Output
-    output_filename: str,
+    # Output (None keeps the expressions in memory only)
+    output_filename: Optional[str],
     # Plywood Panel Selections
     plywood_panel_selections: dict = None
-) -> tuple[bool, str]:
+) -> tuple[bool, str, Optional[str]]:
+    """Build the expression file; returns (success, message, content or None)"""
     import time
     start_time = time.time()
     
@@ -331,37 +332,37 @@ def generate_crate_expressions_logic(
     try:
         # --- Input Validations ---
         if product_weight_lbs < 0: 
-            return False, "Product weight cannot be negative."
+            return False, "Product weight cannot be negative.", None
         if product_length_in <=0: 
-            return False, "Product length must be positive."
+            return False, "Product length must be positive.", None
         if product_width_in <=0: 
-            return False, "Product width must be positive."
+            return False, "Product width must be positive.", None
         if clearance_each_side_in < 0: 
-            return False, "Side clearance cannot be negative."
+            return False, "Side clearance cannot be negative.", None
         if panel_thickness_in <=0: 
-            return False, "Panel thickness must be positive."
+            return False, "Panel thickness must be positive.", None
         # ASTM D6251-17 compliance: 1/4" (0.25") plywood is standard for many crate applications
         # Thinner panels require appropriate cleat spacing for structural integrity
         if cleat_thickness_in <0: # Allow 0 for no cleats, though logic might need adjustment
-            return False, "Cleat thickness cannot be negative."
+            return False, "Cleat thickness cannot be negative.", None
         if cleat_member_actual_width_in <=0: 
-            return False, "Cleat member actual width must be positive."
+            return False, "Cleat member actual width must be positive.", None
         if product_actual_height_in <=0: 
-            return False, "Product actual height must be positive."
+            return False, "Product actual height must be positive.", None
         if clearance_above_product_in <0: 
-            return False, "Clearance above product cannot be negative."
+            return False, "Clearance above product cannot be negative.", None
         if ground_clearance_in <0: 
-            return False, "Ground clearance cannot be negative."
+            return False, "Ground clearance cannot be negative.", None
         if floorboard_actual_thickness_in <=0: 
-            return False, "Floorboard actual thickness must be positive."
+            return False, "Floorboard actual thickness must be positive.", None
         if not selected_std_lumber_widths: 
-            return False, "At least one standard lumber width must be selected/available."
+            return False, "At least one standard lumber width must be selected/available.", None
         if max_allowable_middle_gap_in < 0: 
-            return False, "Max allowable middle gap cannot be negative."
+            return False, "Max allowable middle gap cannot be negative.", None
         if min_custom_lumber_width_in <= 0: 
-            return False, "Minimum custom lumber width must be positive."
+            return False, "Minimum custom lumber width must be positive.", None
         if min_custom_lumber_width_in < MIN_FORCEABLE_CUSTOM_BOARD_WIDTH and force_small_custom_board_bool:
-            return False, f"If forcing small custom board, the 'Minimum Custom Lumber Width' ({min_custom_lumber_width_in}\") must be >= 'Min Forceable Width' ({MIN_FORCEABLE_CUSTOM_BOARD_WIDTH}\")."
+            return False, f"If forcing small custom board, the 'Minimum Custom Lumber Width' ({min_custom_lumber_width_in}\") must be >= 'Min Forceable Width' ({MIN_FORCEABLE_CUSTOM_BOARD_WIDTH}\").", None
              
 
         # This must be calculated first, as it's passed into the skid logic
@@ -1409,30 +1410,36 @@ def generate_crate_expressions_logic(
 
         expressions_content.append(f"// End of Expressions")
 
-        # Validate output path for security
-        safe_filename = validate_output_path(output_filename, os.path.dirname(output_filename))
-        
-        # Ensure file has safe extension
-        if not is_safe_file_extension(safe_filename, ['.exp']):
-            raise ValueError("Invalid file extension. Only .exp files are allowed.")
-        
-        with open(safe_filename, "w") as f:
-            for line in expressions_content: f.write(line + "\n")
+        content = "".join(line + "\n" for line in expressions_content)
+        safe_filename = None
+        if output_filename is not None:
+            # Validate output path for security
+            safe_filename = validate_output_path(output_filename, os.path.dirname(output_filename))
+            
+            # Ensure file has safe extension
+            if not is_safe_file_extension(safe_filename, ['.exp']):
+                raise ValueError("Invalid file extension. Only .exp files are allowed.")
+            
+            with open(safe_filename, "w") as f:
+                f.write(content)
         
         duration = time.time() - start_time
-        success_msg = f"Successfully generated: {output_filename}"
+        if output_filename is not None:
+            success_msg = f"Successfully generated: {output_filename}"
+        else:
+            success_msg = f"Successfully generated {len(expressions_content)} expressions"
         
         if logger:
             result_info = {
                 'output_file': safe_filename,
                 'expressions_count': len(expressions_content),
-                'file_size_bytes': os.path.getsize(safe_filename) if os.path.exists(safe_filename) else 0,
+                'file_size_bytes': len(content.encode("utf-8")),
                 'duration_seconds': round(duration, 3)
             }
             logger.info("Expression generation completed successfully", result_info)
             logger.log_performance("generate_crate_expressions", duration, result_info)
         
-        return True, success_msg
+        return True, success_msg, content
     except Exception as e:
         duration = time.time() - start_time
         error_msg = f"Error: {e}"
@@ -1447,7 +1454,68 @@ def generate_crate_expressions_logic(
         else:
             print(f"Error in logic: {e}\\n{traceback.format_exc()}")
         
-        return False, error_msg
+        return False, error_msg, None
+
+def generate_crate_expressions_logic(
+    # Skid Inputs
+    product_weight_lbs: float, product_length_in: float, product_width_in: float,
+    clearance_each_side_in: float, allow_3x4_skids_bool: bool,
+    # General Crate & Panel Inputs
+    panel_thickness_in: float, cleat_thickness_in: float, cleat_member_actual_width_in: float,
+    product_actual_height_in: float, 
+    clearance_above_product_in: float,
+    ground_clearance_in: float,
+    # Floorboard Inputs
+    floorboard_actual_thickness_in: float, selected_std_lumber_widths: list[float], 
+    max_allowable_middle_gap_in: float, min_custom_lumber_width_in: float,
+    force_small_custom_board_bool: bool, 
+    # Output
+    output_filename: str,
+    # Plywood Panel Selections
+    plywood_panel_selections: dict = None
+) -> tuple[bool, str]:
+    """Generate the expressions and write them to output_filename; returns (success, message)"""
+    success, message, _ = _generate_crate_expressions(
+        product_weight_lbs, product_length_in, product_width_in,
+        clearance_each_side_in, allow_3x4_skids_bool,
+        panel_thickness_in, cleat_thickness_in, cleat_member_actual_width_in,
+        product_actual_height_in, clearance_above_product_in, ground_clearance_in,
+        floorboard_actual_thickness_in, selected_std_lumber_widths,
+        max_allowable_middle_gap_in, min_custom_lumber_width_in,
+        force_small_custom_board_bool, output_filename, plywood_panel_selections
+    )
+    return success, message
+
+def generate_crate_expressions_content(
+    # Skid Inputs
+    product_weight_lbs: float, product_length_in: float, product_width_in: float,
+    clearance_each_side_in: float, allow_3x4_skids_bool: bool,
+    # General Crate & Panel Inputs
+    panel_thickness_in: float, cleat_thickness_in: float, cleat_member_actual_width_in: float,
+    product_actual_height_in: float, 
+    clearance_above_product_in: float,
+    ground_clearance_in: float,
+    # Floorboard Inputs
+    floorboard_actual_thickness_in: float, selected_std_lumber_widths: list[float], 
+    max_allowable_middle_gap_in: float, min_custom_lumber_width_in: float,
+    force_small_custom_board_bool: bool, 
+    # Plywood Panel Selections
+    plywood_panel_selections: dict = None
+) -> tuple[bool, str]:
+    """
+    Generate the expressions in memory without touching disk.
+    Returns (True, file content) or (False, error message).
+    """
+    success, message, content = _generate_crate_expressions(
+        product_weight_lbs, product_length_in, product_width_in,
+        clearance_each_side_in, allow_3x4_skids_bool,
+        panel_thickness_in, cleat_thickness_in, cleat_member_actual_width_in,
+        product_actual_height_in, clearance_above_product_in, ground_clearance_in,
+        floorboard_actual_thickness_in, selected_std_lumber_widths,
+        max_allowable_middle_gap_in, min_custom_lumber_width_in,
+        force_small_custom_board_bool, None, plywood_panel_selections
+    )
+    return (True, content) if success else (False, message)
 
 # --- Vertical Cleat Helper Functions ---
 def extract_vertical_splice_positions(plywood_sheets: List[Dict]) -> List[float]:
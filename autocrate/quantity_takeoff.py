@@ -0,0 +1,195 @@
+"""
+Quantity Take-off
+
+Turns calculated crate components into bill-of-materials lines: plywood
+sheets per panel layout, cleat pieces per panel (with their cut lengths),
+skids, floorboards and klimps. Input is the component structure produced by
+`calculate_nx_components` (panels, dimensions, skids, floorboards); output is
+a list of plain dicts so it can be cached, serialized and streamed as CSV or
+XLSX without further conversion.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .left_panel_logic import calculate_plywood_layout_for_panel
+except ImportError:
+    from autocrate.left_panel_logic import calculate_plywood_layout_for_panel
+
+# Standard plywood sheet, inches
+PLYWOOD_SHEET_SIZE = (48, 96)
+
+# Actual dressed dimension -> nominal dimension for standard lumber
+NOMINAL_SIZES = {0.75: 1, 1.5: 2, 2.5: 3, 3.5: 4, 5.5: 6, 7.25: 8, 9.25: 10, 11.25: 12}
+
+# Column order used by CSV/XLSX output
+TAKEOFF_COLUMNS = [
+    "category", "component", "panel", "material", "length_in", "quantity", "unit", "total_length_in"
+]
+
+# Cleat groups per panel key and the dict field holding the piece length
+_PANEL_CLEAT_GROUPS = {
+    "horizontal_cleats": "horizontal cleat",
+    "vertical_cleats": "vertical cleat",
+    "intermediate_vertical_cleats": "intermediate vertical cleat",
+    "primary_cleats": "primary cleat",
+    "secondary_cleats": "secondary cleat",
+    "intermediate_cleats": "intermediate cleat",
+}
+
+
+def lumber_label(thickness: float, width: float) -> str:
+    """Nominal label for a lumber cross-section, e.g. 1.5 x 3.5 -> '2x4'"""
+    nominal_t = NOMINAL_SIZES.get(round(thickness, 2))
+    nominal_w = NOMINAL_SIZES.get(round(width, 2))
+    if nominal_t and nominal_w:
+        return f"{nominal_t}x{nominal_w}"
+    return f"{thickness:g}x{width:g} rip"
+
+
+def _line(category: str, component: str, panel: Optional[str], material: str,
+          quantity: float, unit: str, length_in: Optional[float] = None) -> Dict[str, Any]:
+    length = round(length_in, 4) if length_in is not None else None
+    return {
+        "category": category,
+        "component": component,
+        "panel": panel,
+        "material": material,
+        "length_in": length,
+        "quantity": quantity,
+        "unit": unit,
+        "total_length_in": round(length * quantity, 4) if length is not None else None,
+    }
+
+
+def _panel_face(panel_name: str, plywood: Dict[str, Any]) -> Tuple[float, float]:
+    """(width, height) of a panel's plywood face"""
+    if panel_name == "top":
+        return plywood.get("width", 0), plywood.get("length", 0)
+    return plywood.get("width", plywood.get("length", 0)), plywood.get("height", 0)
+
+
+def _intermediate_horizontal_lengths(group: Dict[str, Any]) -> List[float]:
+    """Piece lengths of intermediate horizontal cleats (front/back/sides use sections, top uses instances)"""
+    if group.get("sections"):
+        return [section["width"] for section in group["sections"] if section.get("width", 0) > 0]
+    return [
+        instance["width"] for instance in group.get("instances", [])
+        if instance.get("suppress_flag") == 1 and instance.get("width", 0) > 0
+    ]
+
+
+def panel_takeoff(panel_name: str, components: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Plywood, cleat and klimp lines for one panel's component dict"""
+    lines: List[Dict[str, Any]] = []
+
+    plywood = components.get("plywood")
+    if plywood:
+        width, height = _panel_face(panel_name, plywood)
+        if width > 0 and height > 0:
+            pieces = calculate_plywood_layout_for_panel(width, height)
+            thickness = plywood.get("thickness", 0.75)
+            lines.append(_line(
+                "Plywood", "panel sheet", panel_name,
+                f'{thickness:g}" plywood {PLYWOOD_SHEET_SIZE[0]}x{PLYWOOD_SHEET_SIZE[1]}',
+                len(pieces), "sheets"
+            ))
+
+    for key, component in _PANEL_CLEAT_GROUPS.items():
+        group = components.get(key)
+        if not group or not group.get("count") or not group.get("length"):
+            continue
+        material = lumber_label(group.get("material_thickness", 1.5), group.get("material_member_width", 3.5))
+        lines.append(_line("Lumber", component, panel_name, material, group["count"], "pcs", group["length"]))
+
+    group = components.get("intermediate_horizontal_cleats")
+    if group and group.get("count"):
+        material = lumber_label(group.get("material_thickness", 1.5), group.get("material_member_width", 3.5))
+        counts: Dict[float, int] = {}
+        for length in _intermediate_horizontal_lengths(group):
+            key = round(length, 4)
+            counts[key] = counts.get(key, 0) + 1
+        for length, count in sorted(counts.items(), reverse=True):
+            lines.append(_line("Lumber", "intermediate horizontal cleat", panel_name, material, count, "pcs", length))
+
+    klimps = components.get("klimps")
+    if klimps and klimps.get("count"):
+        lines.append(_line("Hardware", "klimp fastener", panel_name, "Klimp", klimps["count"], "pcs"))
+
+    return lines
+
+
+def takeoff_from_components(design: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Bill-of-materials lines for one crate.
+
+    Args:
+        design: Output of calculate_nx_components (panels, dimensions, skids, floorboards)
+
+    Returns:
+        List of line dicts with the TAKEOFF_COLUMNS keys
+    """
+    lines: List[Dict[str, Any]] = []
+    dimensions = design.get("dimensions", {})
+    base_length = dimensions.get("front_panel_width", 0)
+
+    skids = design.get("skids") or {}
+    if skids.get("skid_count"):
+        material = lumber_label(skids.get("skid_height", 3.5), skids.get("skid_width", 3.5))
+        lines.append(_line("Lumber", "skid", "base", material, skids["skid_count"], "pcs", base_length))
+
+    floorboards = (design.get("floorboards") or {}).get("floorboards_data", [])
+    thickness = design.get("inputs", {}).get("floorboard_thickness", 1.5)
+    board_counts: Dict[float, int] = {}
+    for board in floorboards:
+        width = round(board.get("width", 0), 4)
+        if width > 0:
+            board_counts[width] = board_counts.get(width, 0) + 1
+    for width, count in sorted(board_counts.items(), reverse=True):
+        lines.append(_line("Lumber", "floorboard", "base", lumber_label(thickness, width), count, "pcs", base_length))
+
+    for panel_name in ("front", "back", "left", "right", "top"):
+        components = design.get("panels", {}).get(panel_name)
+        if components:
+            lines.extend(panel_takeoff(panel_name, components))
+
+    return lines
+
+
+def summarize_takeoff(lines: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Purchase totals: plywood sheets and hardware by material, lumber as linear feet by size"""
+    totals: Dict[Tuple[str, str, str], float] = {}
+    for line in lines:
+        if line["category"] == "Lumber":
+            key = (line["category"], line["material"], "linear ft")
+            amount = (line["total_length_in"] or 0) / 12.0
+        else:
+            key = (line["category"], line["material"], line["unit"])
+            amount = line["quantity"]
+        totals[key] = totals.get(key, 0) + amount
+    return [
+        {"category": category, "material": material, "quantity": round(quantity, 2), "unit": unit}
+        for (category, material, unit), quantity in sorted(totals.items())
+    ]
+
+
+def cut_pieces(lines: Iterable[Dict[str, Any]]) -> Dict[str, List[float]]:
+    """Every lumber piece to cut, grouped by material (one entry per piece)"""
+    pieces: Dict[str, List[float]] = {}
+    for line in lines:
+        if line["category"] == "Lumber" and line["length_in"]:
+            pieces.setdefault(line["material"], []).extend([line["length_in"]] * int(line["quantity"]))
+    return pieces
+
+
+def quantity_key(category: str, material: str, unit: str) -> str:
+    """Stable key of one purchasable quantity, e.g. 'Lumber|2x4|linear ft'"""
+    return f"{category}|{material}|{unit}"
+
+
+def quantity_vector(lines: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Price-independent purchase quantities of one design, keyed by quantity_key"""
+    return {
+        quantity_key(row["category"], row["material"], row["unit"]): row["quantity"]
+        for row in summarize_takeoff(lines)
+    }
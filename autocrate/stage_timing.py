@@ -0,0 +1,129 @@
+"""
+Stage Timing Hooks
+
+Lightweight, opt-in timing of named calculation stages (skids, OD cascade,
+each panel, klimps, expression emission). Calculation code wraps a stage in
+`with stage("klimps"):`; when nobody is collecting, `stage()` returns a shared
+no-op context manager, so the cost in normal runs is a context-variable lookup.
+
+Timings reach two kinds of consumers:
+- a StageRecorder activated for the current context (per-request breakdowns)
+- process-wide listeners registered with add_listener (metrics histograms)
+
+Work executed in a thread or process pool is wrapped with run_timed, which
+records the worker's stages and hands them back with the result so the caller
+can replay them into its own context with record_stages.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+StageTiming = Tuple[str, float]  # (stage name, seconds)
+
+_active_recorder: ContextVar[Optional["StageRecorder"]] = ContextVar(
+    "autocrate_stage_recorder", default=None
+)
+_listeners: List[Callable[[str, float], None]] = []
+
+
+class _NullStage:
+    """Shared no-op stage used when timing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "recorder", "start")
+
+    def __init__(self, name: str, recorder: Optional["StageRecorder"]):
+        self.name = name
+        self.recorder = recorder
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.stages.append((self.name, elapsed))
+        if recorder is None or recorder.notify_listeners:
+            for listener in _listeners:
+                listener(self.name, elapsed)
+        return False
+
+
+def stage(name: str):
+    """Context manager timing one named stage (no-op unless someone is collecting)"""
+    recorder = _active_recorder.get()
+    if recorder is None and not _listeners:
+        return _NULL_STAGE
+    return _Stage(name, recorder)
+
+
+class StageRecorder:
+    """
+    Collects stage timings for the current context while active.
+    With notify_listeners=False the timings are only captured (run_timed uses
+    this so the caller's record_stages does not report them twice).
+    """
+
+    def __init__(self, notify_listeners: bool = True):
+        self.stages: List[StageTiming] = []
+        self.notify_listeners = notify_listeners
+        self._token = None
+
+    def __enter__(self) -> "StageRecorder":
+        self._token = _active_recorder.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_recorder.reset(self._token)
+        self._token = None
+        return False
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per stage name, summed over repeats, in first-seen order"""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+
+def add_listener(listener: Callable[[str, float], None]) -> None:
+    """Register a process-wide callback receiving (stage name, seconds)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[str, float], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def record_stages(stages: List[StageTiming]) -> None:
+    """Replay timings captured elsewhere (e.g. in a worker) into this context"""
+    recorder = _active_recorder.get()
+    if recorder is not None:
+        recorder.stages.extend(stages)
+    for name, seconds in stages:
+        for listener in _listeners:
+            listener(name, seconds)
+
+
+def run_timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, List[StageTiming]]:
+    """Call fn while recording its stages; returns (result, stages). Picklable for process pools."""
+    with StageRecorder(notify_listeners=False) as recorder:
+        result = fn(*args, **kwargs)
+    return result, recorder.stages
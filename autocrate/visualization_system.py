@@ -13,20 +13,36 @@ This module implements:
 """
 
 import numpy as np
+import hashlib
 import json
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection, Line3DCollection
 import matplotlib.animation as animation
+from matplotlib import rcParams
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import plotly.graph_objects as go
 import plotly.express as px
 from pathlib import Path
 import base64
+import struct
 from io import BytesIO
+from matplotlib.colors import to_rgba
+
+try:
+    from .crate_geometry import BOX_TYPES, INCH_TO_METRE, TYPE_COLORS, build_crate_boxes, unit_cube
+except ImportError:
+    from autocrate.crate_geometry import BOX_TYPES, INCH_TO_METRE, TYPE_COLORS, build_crate_boxes, unit_cube
 
 
 class ViewMode(Enum):
@@ -99,35 +115,373 @@ class Component3D:
         self.vertices = (self.vertices - center) @ rotation_matrix + center
 
 
+# Shared unit box: corners of [0, 1]^3 and the quad faces/edges over them
+UNIT_BOX_VERTICES = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+], dtype=float)
+
+BOX_FACES = np.array([
+    [0, 1, 2, 3],  # Bottom face
+    [4, 7, 6, 5],  # Top face
+    [0, 4, 5, 1],  # Front face
+    [3, 2, 6, 7],  # Back face
+    [0, 3, 7, 4],  # Left face
+    [1, 5, 6, 2]   # Right face
+])
+
+# Outward normal of each BOX_FACES face
+BOX_FACE_NORMALS = np.array([
+    [0, 0, -1], [0, 0, 1], [0, -1, 0], [0, 1, 0], [-1, 0, 0], [1, 0, 0]
+], dtype=float)
+
+BOX_TRIANGLES = np.vstack([BOX_FACES[:, [0, 1, 2]], BOX_FACES[:, [0, 2, 3]]])
+
+BOX_EDGES = np.array([
+    [0, 1], [1, 2], [2, 3], [3, 0],
+    [4, 5], [5, 6], [6, 7], [7, 4],
+    [0, 4], [1, 5], [2, 6], [3, 7]
+])
+
+
+def box_mesh(offsets: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vertices (N*8, 3) and triangle indices (N*12, 3) of N boxes, expanded from the unit box."""
+    count = len(offsets)
+    vertices = (offsets[:, None, :] + UNIT_BOX_VERTICES[None, :, :] * sizes[:, None, :]).reshape(-1, 3)
+    triangles = (BOX_TRIANGLES[None, :, :] + 8 * np.arange(count)[:, None, None]).reshape(-1, 3)
+    return vertices, triangles
+
+
+# Parameter of each derived view: explode distance factor, opacity of the
+# transparent view, and cut plane position as a fraction of the crate width
+DEFAULT_VIEW_FACTORS = {
+    ViewMode.EXPLODED: 1.5,
+    ViewMode.TRANSPARENT: 0.3,
+    ViewMode.CUTAWAY: 0.5,
+}
+
+
+# Level-of-detail tiers, coarsest first, and the on-screen scale (pixels per
+# inch of the crate's largest extent) from which each finer tier is used
+LOD_TIERS = ('far', 'mid', 'near')
+LOD_MID_PIXELS_PER_INCH = 1.5  # Cleats and floorboards are a few pixels wide
+LOD_NEAR_PIXELS_PER_INCH = 4.0  # Klimps are a few pixels wide
+
+PANEL_TYPES = (
+    ComponentType.FRONT_PANEL, ComponentType.BACK_PANEL, ComponentType.LEFT_PANEL,
+    ComponentType.RIGHT_PANEL, ComponentType.TOP_PANEL, ComponentType.BOTTOM_PANEL,
+)
+FASTENER_TYPES = (ComponentType.KLIMP,)
+
+
+@dataclass
+class BoxInstances:
+    """
+    All boxes of one component type: the unit box scaled by `sizes` and
+    moved to `offsets` (minimum corners), both (N, 3) arrays.
+    """
+    component_type: ComponentType
+    names: List[str]
+    offsets: np.ndarray
+    sizes: np.ndarray
+    color: str = "#8B7355"
+    opacity: float = 1.0
+    material: str = "plywood"
+    thickness: float = 0.75
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def vertices(self) -> np.ndarray:
+        """Corner vertices of every box, (N, 8, 3)"""
+        return self.offsets[:, None, :] + UNIT_BOX_VERTICES[None, :, :] * self.sizes[:, None, :]
+    
+    def centers(self) -> np.ndarray:
+        return self.offsets + self.sizes / 2
+    
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.offsets.min(axis=0), (self.offsets + self.sizes).max(axis=0)
+    
+    def translate(self, offset: np.ndarray):
+        """Move all boxes by one (3,) offset or by per-box (N, 3) offsets."""
+        self.offsets = self.offsets + offset
+    
+    def component(self, index: int) -> Component3D:
+        """Standalone Component3D copy of one box."""
+        return Component3D(
+            name=self.names[index],
+            component_type=self.component_type,
+            vertices=self.vertices()[index],
+            faces=BOX_FACES.tolist(),
+            color=self.color,
+            opacity=self.opacity,
+            material=self.material,
+            thickness=self.thickness
+        )
+
+
 @dataclass
 class CrateModel3D:
     """3D model representation of a complete crate."""
     length: float  # inches
     width: float   # inches
     height: float  # inches
-    components: List[Component3D] = field(default_factory=list)
+    components: List[Component3D] = field(default_factory=list)  # Free-form meshes
     assembly_sequence: List[str] = field(default_factory=list)
+    boxes: Dict[ComponentType, BoxInstances] = field(default_factory=dict)  # Instanced boards and panels
+    version: int = 0  # Bumped by every change made through the model's methods
+    _views: Dict[ViewMode, Tuple[int, float, "CrateModel3D"]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _lods: Dict[int, Dict[str, "CrateModel3D"]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
     
     def add_component(self, component: Component3D):
         """Add a component to the crate model."""
         self.components.append(component)
         self.assembly_sequence.append(component.name)
+        self.version += 1
+    
+    def add_boxes(self, component_type: ComponentType, names: List[str],
+                  offsets: np.ndarray, sizes: np.ndarray, **style):
+        """Add boxes of one component type, appending to that type's instances."""
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 3)
+        sizes = np.asarray(sizes, dtype=float).reshape(-1, 3)
+        existing = self.boxes.get(component_type)
+        if existing is None:
+            self.boxes[component_type] = BoxInstances(component_type, list(names), offsets, sizes, **style)
+        else:
+            existing.names.extend(names)
+            existing.offsets = np.vstack([existing.offsets, offsets])
+            existing.sizes = np.vstack([existing.sizes, sizes])
+        self.assembly_sequence.extend(names)
+        self.version += 1
+    
+    def all_components(self) -> List[Component3D]:
+        """Every box and free-form mesh as a Component3D, in assembly order."""
+        by_name = {component.name: component for component in self.components}
+        for instances in self.boxes.values():
+            for index, name in enumerate(instances.names):
+                by_name[name] = instances.component(index)
+        return [by_name[name] for name in self.assembly_sequence if name in by_name]
+    
+    def component_count(self) -> int:
+        return len(self.components) + sum(len(instances) for instances in self.boxes.values())
     
     def get_bounding_box(self) -> Tuple[np.ndarray, np.ndarray]:
         """Get the bounding box of the entire crate."""
-        all_vertices = np.vstack([comp.vertices for comp in self.components])
-        return np.min(all_vertices, axis=0), np.max(all_vertices, axis=0)
+        lows, highs = [], []
+        for instances in self.boxes.values():
+            if len(instances):
+                low, high = instances.bounds()
+                lows.append(low)
+                highs.append(high)
+        for comp in self.components:
+            lows.append(comp.vertices.min(axis=0))
+            highs.append(comp.vertices.max(axis=0))
+        return np.min(lows, axis=0), np.max(highs, axis=0)
+    
+    def translate(self, offset: np.ndarray):
+        """Translate the whole model."""
+        offset = np.asarray(offset, dtype=float)
+        for instances in self.boxes.values():
+            instances.translate(offset)
+        for component in self.components:
+            component.translate(offset)
+        self.version += 1
+    
+    def view(self, mode: ViewMode, factor: Optional[float] = None) -> "CrateModel3D":
+        """
+        The model as shown in a view mode. Exploded, transparent and cutaway
+        views are derived models built from this one's arrays; this model is
+        never modified. Only the latest factor of each mode is cached (until
+        the model changes), so sweeping a slider does not keep every step
+        alive. Other modes return the model itself.
+        """
+        if mode not in DEFAULT_VIEW_FACTORS:
+            return self
+        factor = float(DEFAULT_VIEW_FACTORS[mode] if factor is None else factor)
+        cached = self._views.get(mode)
+        if cached is not None and cached[:2] == (self.version, factor):
+            return cached[2]
+        derived = self._derive_view(mode, factor)
+        self._views[mode] = (self.version, factor, derived)
+        return derived
     
-    def explode(self, factor: float = 1.5):
-        """Create an exploded view of the crate."""
+    def _derive_view(self, mode: ViewMode, factor: float) -> "CrateModel3D":
+        boxes: Dict[ComponentType, BoxInstances] = {}
+        components: List[Component3D] = []
         center = np.array([self.length/2, self.width/2, self.height/2])
         
-        for component in self.components:
-            comp_center = component.get_center()
-            direction = comp_center - center
-            if np.linalg.norm(direction) > 0:
-                direction = direction / np.linalg.norm(direction)
-                component.translate(direction * factor * 10)  # 10 inches base explosion
+        if mode == ViewMode.EXPLODED:
+            # Move every box outward from the crate center, one array operation per type
+            for component_type, instances in self.boxes.items():
+                direction = instances.centers() - center
+                norms = np.linalg.norm(direction, axis=1, keepdims=True)
+                unit = np.divide(direction, norms, out=np.zeros_like(direction), where=norms > 0)
+                boxes[component_type] = replace(
+                    instances, offsets=instances.offsets + unit * factor * 10)  # 10 inches base explosion
+            for component in self.components:
+                direction = component.get_center() - center
+                norm = np.linalg.norm(direction)
+                offset = direction / norm * factor * 10 if norm > 0 else np.zeros(3)
+                components.append(replace(component, vertices=component.vertices + offset))
+        
+        elif mode == ViewMode.TRANSPARENT:
+            boxes = {component_type: replace(instances, opacity=factor)
+                     for component_type, instances in self.boxes.items()}
+            components = [replace(component, opacity=factor) for component in self.components]
+        
+        elif mode == ViewMode.CUTAWAY:
+            # Clip boxes to the far side of a plane across the width; free-form
+            # meshes are kept or dropped whole by their center
+            cut = self.width * factor
+            for component_type, instances in self.boxes.items():
+                start = np.maximum(instances.offsets[:, 1], cut)
+                depth = instances.offsets[:, 1] + instances.sizes[:, 1] - start
+                keep = depth > 0
+                offsets = instances.offsets[keep].copy()
+                sizes = instances.sizes[keep].copy()
+                offsets[:, 1] = start[keep]
+                sizes[:, 1] = depth[keep]
+                names = [name for name, kept in zip(instances.names, keep) if kept]
+                boxes[component_type] = replace(instances, names=names, offsets=offsets, sizes=sizes)
+            components = [component for component in self.components if component.get_center()[1] >= cut]
+        
+        visible = {name for instances in boxes.values() for name in instances.names}
+        visible.update(component.name for component in components)
+        return CrateModel3D(
+            length=self.length, width=self.width, height=self.height,
+            components=components,
+            assembly_sequence=[name for name in self.assembly_sequence if name in visible],
+            boxes=boxes
+        )
+    
+    def explode(self, factor: float = 1.5) -> "CrateModel3D":
+        """Exploded view of the crate; see view()."""
+        return self.view(ViewMode.EXPLODED, factor)
+    
+    def lod(self, tier: str) -> "CrateModel3D":
+        """
+        The model at one level of detail: 'far' has each panel merged into a
+        single slab plus the skids, 'mid' adds cleats, floorboards and free-form
+        meshes, 'near' is the full model with fasteners. All tiers are built
+        together on first use and cached until the model changes.
+        """
+        if tier not in LOD_TIERS:
+            raise ValueError(f"Unknown level of detail '{tier}' (use {', '.join(LOD_TIERS)})")
+        tiers = self._lods.get(self.version)
+        if tiers is None:
+            self._lods.clear()
+            tiers = self._lods[self.version] = self._build_lod_tiers()
+        return tiers[tier]
+    
+    def _build_lod_tiers(self) -> Dict[str, "CrateModel3D"]:
+        def derived(boxes: Dict[ComponentType, BoxInstances], components: List[Component3D]) -> "CrateModel3D":
+            visible = {name for instances in boxes.values() for name in instances.names}
+            visible.update(component.name for component in components)
+            return CrateModel3D(
+                length=self.length, width=self.width, height=self.height,
+                components=components,
+                assembly_sequence=[name for name in self.assembly_sequence if name in visible],
+                boxes=boxes
+            )
+        
+        far_boxes: Dict[ComponentType, BoxInstances] = {}
+        for component_type, instances in self.boxes.items():
+            if component_type in PANEL_TYPES and len(instances):
+                low, high = instances.bounds()
+                name = component_type.value.replace('_', ' ').title()
+                far_boxes[component_type] = replace(
+                    instances, names=[name], offsets=low[None, :], sizes=(high - low)[None, :])
+            elif component_type == ComponentType.SKID:
+                far_boxes[component_type] = instances
+        
+        mid_boxes = {component_type: instances for component_type, instances in self.boxes.items()
+                     if component_type not in FASTENER_TYPES}
+        
+        far = derived(far_boxes, [])
+        # Slab names are not in the assembly sequence; keep them in panel order
+        far.assembly_sequence = [instances.names[0] for instances in far_boxes.values()
+                                 if instances.component_type in PANEL_TYPES] + far.assembly_sequence
+        return {
+            'far': far,
+            'mid': derived(mid_boxes, list(self.components)),
+            'near': self,
+        }
+    
+    def occluded_boxes(self, direction: np.ndarray) -> Dict[ComponentType, np.ndarray]:
+        """
+        Boxes hidden behind opaque panels when looking along -direction
+        (direction points from the crate towards an orthographic camera).
+        A box is hidden when the ray towards the camera from each of its
+        (slightly inset) corners passes through another opaque panel box,
+        or, for boxes other than panels, starts inside one.
+        
+        Returns:
+            {component type: boolean mask over its boxes, True where hidden}
+        """
+        direction = np.asarray(direction, dtype=float)
+        direction = np.where(np.abs(direction) < 1e-12, 1e-12, direction)
+        
+        occluder_lows, occluder_highs, occluder_ids = [], [], []
+        for component_type in PANEL_TYPES:
+            instances = self.boxes.get(component_type)
+            if instances is not None and len(instances) and instances.opacity >= 1:
+                occluder_lows.append(instances.offsets)
+                occluder_highs.append(instances.offsets + instances.sizes)
+                occluder_ids.extend((component_type, index) for index in range(len(instances)))
+        
+        hidden: Dict[ComponentType, np.ndarray] = {}
+        if not occluder_ids:
+            return {component_type: np.zeros(len(instances), dtype=bool)
+                    for component_type, instances in self.boxes.items()}
+        lows = np.vstack(occluder_lows)
+        highs = np.vstack(occluder_highs)
+        
+        for component_type, instances in self.boxes.items():
+            count = len(instances)
+            if not count:
+                hidden[component_type] = np.zeros(0, dtype=bool)
+                continue
+            inset = np.minimum(1e-3, instances.sizes / 4)[:, None, :]
+            corners = (instances.offsets[:, None, :] + inset
+                       + UNIT_BOX_VERTICES[None, :, :] * (instances.sizes[:, None, :] - 2 * inset))
+            points = corners.reshape(-1, 1, 3)
+            
+            # Slab test of every corner ray against every occluder, (8N, P)
+            t1 = (lows[None, :, :] - points) / direction
+            t2 = (highs[None, :, :] - points) / direction
+            t_near = np.minimum(t1, t2).max(axis=2)
+            t_far = np.maximum(t1, t2).min(axis=2)
+            # Occluders ahead of the corner block it. A corner embedded in a
+            # panel is also covered, except for panels themselves, which
+            # overlap each other at the crate's edges
+            blocked = (t_far >= t_near) & (t_near > 0)
+            if component_type not in PANEL_TYPES:
+                blocked |= (t_near <= 0) & (t_far > 0)
+            
+            # A panel does not hide itself
+            own = [column for column, (occluder_type, _) in enumerate(occluder_ids)
+                   if occluder_type == component_type]
+            if own:
+                blocked = blocked.reshape(count, 8, -1)
+                own_index = [occluder_ids[column][1] for column in own]
+                blocked[own_index, :, own] = False
+                blocked = blocked.reshape(count * 8, -1)
+            
+            hidden[component_type] = blocked.any(axis=1).reshape(count, 8).all(axis=1)
+        return hidden
+
+
+# Engine geometry type -> visualization material, and plywood panel labels
+ENGINE_MATERIALS = {'plywood': 'plywood', 'klimp': 'steel'}
+ENGINE_PANEL_TYPES = {
+    'Front': ComponentType.FRONT_PANEL,
+    'Back': ComponentType.BACK_PANEL,
+    'Left': ComponentType.LEFT_PANEL,
+    'Right': ComponentType.RIGHT_PANEL,
+    'Top': ComponentType.TOP_PANEL,
+}
 
 
 class CrateVisualizer:
@@ -147,17 +501,23 @@ class CrateVisualizer:
         self.show_dimensions = True
         self.show_annotations = True
         self.animation_speed = 1.0
+        self.merge_meshes = True  # One Plotly trace per material instead of per component
+        self.level_of_detail = 'auto'  # 'far', 'mid', 'near', or 'auto' from the rendered size
         
     def create_crate_model(self, crate_data: Dict[str, Any]) -> CrateModel3D:
         """
         Create a 3D model from crate calculation data.
         
         Args:
-            crate_data: Dictionary containing crate dimensions and component data
+            crate_data: Dictionary containing crate dimensions and component data,
+                or a calculate_nx_components result (see create_model_from_results)
             
         Returns:
             CrateModel3D object
         """
+        if 'panels' in crate_data and 'dimensions' in crate_data:
+            return self.create_model_from_results(crate_data)
+        
         length = crate_data.get('length', 48)
         width = crate_data.get('width', 40)
         height = crate_data.get('height', 36)
@@ -179,117 +539,88 @@ class CrateVisualizer:
         self.current_model = model
         return model
     
-    def _add_panels(self, model: CrateModel3D, crate_data: Dict):
-        """Add panel components to the model."""
-        plywood_thickness = crate_data.get('plywood_thickness', 0.75)
+    def create_model_from_results(self, design: Dict[str, Any]) -> CrateModel3D:
+        """
+        Create a 3D model from a calculate_nx_components result.
         
-        # Front panel
-        front_vertices = np.array([
-            [0, 0, 0],
-            [model.length, 0, 0],
-            [model.length, 0, model.height],
-            [0, 0, model.height],
-            [0, plywood_thickness, 0],
-            [model.length, plywood_thickness, 0],
-            [model.length, plywood_thickness, model.height],
-            [0, plywood_thickness, model.height]
-        ])
+        Boxes come from the crate geometry (build_crate_boxes), so the model
+        shows the same crate as the .glb: front, back and top panels, skids
+        and klimps at the engine's sizes and positions, with the side walls
+        and floorboards filling the span between the front and back panels.
+        The engine frame (X across the width centred on 0, Y front to back)
+        is turned a quarter turn so X runs along the crate length and Y
+        across its width from 0; Z stays up from the skid bottom.
         
-        front_faces = [
-            [0, 1, 2, 3],  # Front face
-            [4, 7, 6, 5],  # Back face
-            [0, 4, 5, 1],  # Bottom face
-            [3, 2, 6, 7],  # Top face
-            [0, 3, 7, 4],  # Left face
-            [1, 5, 6, 2]   # Right face
-        ]
+        Args:
+            design: Output of calculate_nx_components
+            
+        Returns:
+            CrateModel3D object
+        """
+        dimensions = design.get('dimensions', {})
+        width = dimensions.get('front_panel_width', 0)
+        boxes = build_crate_boxes(design)
+        
+        converted = {}
+        for box_type in BOX_TYPES:
+            box_set = boxes[box_type]
+            if not len(box_set):
+                continue
+            offsets = np.array(box_set.offsets, dtype=float).reshape(-1, 3)
+            sizes = np.array(box_set.sizes, dtype=float).reshape(-1, 3)
+            converted[box_type] = (
+                box_set.names,
+                np.column_stack([offsets[:, 1], width / 2 - offsets[:, 0] - sizes[:, 0], offsets[:, 2]]),
+                sizes[:, [1, 0, 2]]
+            )
         
-        front_panel = Component3D(
-            name="Front Panel",
-            component_type=ComponentType.FRONT_PANEL,
-            vertices=front_vertices,
-            faces=front_faces,
-            color="#8B7355",
-            material="plywood",
-            thickness=plywood_thickness
-        )
-        model.add_component(front_panel)
-        
-        # Back panel
-        back_vertices = front_vertices.copy()
-        back_vertices[:, 1] = model.width - plywood_thickness + back_vertices[:, 1]
-        
-        back_panel = Component3D(
-            name="Back Panel",
-            component_type=ComponentType.BACK_PANEL,
-            vertices=back_vertices,
-            faces=front_faces,
-            color="#8B7355",
-            material="plywood",
-            thickness=plywood_thickness
+        length = dimensions.get('top_panel_length', 0) or dimensions.get('crate_internal_length', 0)
+        height = max(
+            (float((offsets[:, 2] + sizes[:, 2]).max()) for _, offsets, sizes in converted.values()),
+            default=0.0
         )
-        model.add_component(back_panel)
-        
-        # Left panel
-        left_vertices = np.array([
-            [0, 0, 0],
-            [0, model.width, 0],
-            [0, model.width, model.height],
-            [0, 0, model.height],
-            [plywood_thickness, 0, 0],
-            [plywood_thickness, model.width, 0],
-            [plywood_thickness, model.width, model.height],
-            [plywood_thickness, 0, model.height]
-        ])
+        model = CrateModel3D(length=length, width=width, height=height)
         
-        left_panel = Component3D(
-            name="Left Panel",
-            component_type=ComponentType.LEFT_PANEL,
-            vertices=left_vertices,
-            faces=front_faces,
-            color="#8B7355",
-            material="plywood",
-            thickness=plywood_thickness
-        )
-        model.add_component(left_panel)
-        
-        # Right panel
-        right_vertices = left_vertices.copy()
-        right_vertices[:, 0] = model.length - plywood_thickness + right_vertices[:, 0]
-        
-        right_panel = Component3D(
-            name="Right Panel",
-            component_type=ComponentType.RIGHT_PANEL,
-            vertices=right_vertices,
-            faces=front_faces,
-            color="#8B7355",
-            material="plywood",
-            thickness=plywood_thickness
-        )
-        model.add_component(right_panel)
-        
-        # Top panel
-        top_vertices = np.array([
-            [0, 0, model.height - plywood_thickness],
-            [model.length, 0, model.height - plywood_thickness],
-            [model.length, model.width, model.height - plywood_thickness],
-            [0, model.width, model.height - plywood_thickness],
-            [0, 0, model.height],
-            [model.length, 0, model.height],
-            [model.length, model.width, model.height],
-            [0, model.width, model.height]
-        ])
+        for box_type, (names, offsets, sizes) in converted.items():
+            style = dict(
+                color=TYPE_COLORS[box_type],
+                material=ENGINE_MATERIALS.get(box_type, 'lumber'),
+                thickness=float(sizes[0].min())
+            )
+            if box_type == 'plywood':
+                # One instance set per panel, named "<Panel> Plywood" by the engine
+                for panel, component_type in ENGINE_PANEL_TYPES.items():
+                    rows = [index for index, name in enumerate(names) if name.split(' ', 1)[0] == panel]
+                    if rows:
+                        model.add_boxes(component_type, [names[index] for index in rows],
+                                        offsets[rows], sizes[rows], **style)
+            else:
+                model.add_boxes(ComponentType(box_type), names, offsets, sizes, **style)
         
-        top_panel = Component3D(
-            name="Top Panel",
-            component_type=ComponentType.TOP_PANEL,
-            vertices=top_vertices,
-            faces=front_faces,
-            color="#8B7355",
-            material="plywood",
-            thickness=plywood_thickness
-        )
-        model.add_component(top_panel)
+        self.current_model = model
+        return model
+    
+    def _add_panels(self, model: CrateModel3D, crate_data: Dict):
+        """Add panel components to the model."""
+        plywood_thickness = crate_data.get('plywood_thickness', 0.75)
+        t = plywood_thickness
+        L, W, H = model.length, model.width, model.height
+        
+        # (type, name, min corner, size)
+        panels = [
+            (ComponentType.FRONT_PANEL, "Front Panel", (0, 0, 0), (L, t, H)),
+            (ComponentType.BACK_PANEL, "Back Panel", (0, W - t, 0), (L, t, H)),
+            (ComponentType.LEFT_PANEL, "Left Panel", (0, 0, 0), (t, W, H)),
+            (ComponentType.RIGHT_PANEL, "Right Panel", (L - t, 0, 0), (t, W, H)),
+            (ComponentType.TOP_PANEL, "Top Panel", (0, 0, H - t), (L, W, t)),
+        ]
+        for component_type, name, offset, size in panels:
+            model.add_boxes(
+                component_type, [name], offset, size,
+                color="#8B7355",
+                material="plywood",
+                thickness=plywood_thickness
+            )
     
     def _add_cleats(self, model: CrateModel3D, crate_data: Dict):
         """Add cleat components to the model."""
@@ -297,86 +628,44 @@ class CrateVisualizer:
         cleat_height = crate_data.get('cleat_height', 4.0)
         
         # Add corner cleats for each panel
-        cleat_positions = [
-            (0, 0, 0, "Front-Left Cleat"),
-            (model.length - cleat_width, 0, 0, "Front-Right Cleat"),
-            (0, model.width - cleat_height, 0, "Back-Left Cleat"),
-            (model.length - cleat_width, model.width - cleat_height, 0, "Back-Right Cleat"),
-        ]
+        names = ["Front-Left Cleat", "Front-Right Cleat", "Back-Left Cleat", "Back-Right Cleat"]
+        offsets = np.array([
+            [0, 0, 0],
+            [model.length - cleat_width, 0, 0],
+            [0, model.width - cleat_height, 0],
+            [model.length - cleat_width, model.width - cleat_height, 0],
+        ])
+        sizes = np.tile([cleat_width, cleat_height, model.height], (len(names), 1))
         
-        for x, y, z, name in cleat_positions:
-            cleat_vertices = np.array([
-                [x, y, z],
-                [x + cleat_width, y, z],
-                [x + cleat_width, y + cleat_height, z],
-                [x, y + cleat_height, z],
-                [x, y, z + model.height],
-                [x + cleat_width, y, z + model.height],
-                [x + cleat_width, y + cleat_height, z + model.height],
-                [x, y + cleat_height, z + model.height]
-            ])
-            
-            cleat_faces = [
-                [0, 1, 2, 3],
-                [4, 7, 6, 5],
-                [0, 4, 5, 1],
-                [3, 2, 6, 7],
-                [0, 3, 7, 4],
-                [1, 5, 6, 2]
-            ]
-            
-            cleat = Component3D(
-                name=name,
-                component_type=ComponentType.CLEAT,
-                vertices=cleat_vertices,
-                faces=cleat_faces,
-                color="#6B5D54",  # Darker wood for cleats
-                material="lumber",
-                thickness=cleat_width
-            )
-            model.add_component(cleat)
+        model.add_boxes(
+            ComponentType.CLEAT, names, offsets, sizes,
+            color="#6B5D54",  # Darker wood for cleats
+            material="lumber",
+            thickness=cleat_width
+        )
     
     def _add_skids(self, model: CrateModel3D, crate_data: Dict):
         """Add skid components to the model."""
         skid_width = crate_data.get('skid_width', 4.0)
         skid_height = crate_data.get('skid_height', 4.0)
         num_skids = crate_data.get('num_skids', 3)
+        if num_skids <= 0:
+            return
         
         skid_spacing = model.length / (num_skids + 1)
-        
-        for i in range(num_skids):
-            x_pos = skid_spacing * (i + 1) - skid_width / 2
-            
-            skid_vertices = np.array([
-                [x_pos, 0, -skid_height],
-                [x_pos + skid_width, 0, -skid_height],
-                [x_pos + skid_width, model.width, -skid_height],
-                [x_pos, model.width, -skid_height],
-                [x_pos, 0, 0],
-                [x_pos + skid_width, 0, 0],
-                [x_pos + skid_width, model.width, 0],
-                [x_pos, model.width, 0]
-            ])
-            
-            skid_faces = [
-                [0, 1, 2, 3],
-                [4, 7, 6, 5],
-                [0, 4, 5, 1],
-                [3, 2, 6, 7],
-                [0, 3, 7, 4],
-                [1, 5, 6, 2]
-            ]
-            
-            skid = Component3D(
-                name=f"Skid {i+1}",
-                component_type=ComponentType.SKID,
-                vertices=skid_vertices,
-                faces=skid_faces,
-                color="#5C4E42",  # Even darker for skids
-                material="lumber",
-                thickness=skid_width
-            )
-            model.add_component(skid)
+        x_pos = skid_spacing * np.arange(1, num_skids + 1) - skid_width / 2
+        
+        offsets = np.zeros((num_skids, 3))
+        offsets[:, 0] = x_pos
+        offsets[:, 2] = -skid_height
+        sizes = np.tile([skid_width, model.width, skid_height], (num_skids, 1))
+        
+        model.add_boxes(
+            ComponentType.SKID, [f"Skid {i+1}" for i in range(num_skids)], offsets, sizes,
+            color="#5C4E42",  # Even darker for skids
+            material="lumber",
+            thickness=skid_width
+        )
     
     def _add_floorboards(self, model: CrateModel3D, crate_data: Dict):
         """Add floorboard components to the model."""
@@ -384,50 +673,36 @@ class CrateVisualizer:
         board_thickness = crate_data.get('floorboard_thickness', 0.75)
         num_boards = int(model.width / board_width) + 1
         
-        for i in range(num_boards):
-            y_pos = i * board_width
-            if y_pos + board_width > model.width:
-                board_width = model.width - y_pos
-            
-            board_vertices = np.array([
-                [0, y_pos, 0],
-                [model.length, y_pos, 0],
-                [model.length, y_pos + board_width, 0],
-                [0, y_pos + board_width, 0],
-                [0, y_pos, board_thickness],
-                [model.length, y_pos, board_thickness],
-                [model.length, y_pos + board_width, board_thickness],
-                [0, y_pos + board_width, board_thickness]
-            ])
-            
-            board_faces = [
-                [0, 1, 2, 3],
-                [4, 7, 6, 5],
-                [0, 4, 5, 1],
-                [3, 2, 6, 7],
-                [0, 3, 7, 4],
-                [1, 5, 6, 2]
-            ]
-            
-            floorboard = Component3D(
-                name=f"Floorboard {i+1}",
-                component_type=ComponentType.FLOORBOARD,
-                vertices=board_vertices,
-                faces=board_faces,
-                color="#7A6A5A",
-                material="lumber",
-                thickness=board_thickness
-            )
-            model.add_component(floorboard)
+        # The last board is ripped to whatever width is left
+        y_pos = np.arange(num_boards) * board_width
+        widths = np.minimum(board_width, model.width - y_pos)
+        keep = widths > 0
+        y_pos, widths = y_pos[keep], widths[keep]
+        
+        offsets = np.zeros((len(y_pos), 3))
+        offsets[:, 1] = y_pos
+        sizes = np.column_stack([
+            np.full(len(y_pos), model.length), widths, np.full(len(y_pos), board_thickness)
+        ])
+        
+        model.add_boxes(
+            ComponentType.FLOORBOARD, [f"Floorboard {i+1}" for i in range(len(y_pos))], offsets, sizes,
+            color="#7A6A5A",
+            material="lumber",
+            thickness=board_thickness
+        )
     
     def render_matplotlib(self, model: Optional[CrateModel3D] = None, 
-                         fig_size: Tuple[int, int] = (12, 9)) -> plt.Figure:
+                         fig_size: Tuple[int, int] = (12, 9),
+                         static: bool = False) -> plt.Figure:
         """
         Render the crate model using matplotlib (for tkinter integration).
         
         Args:
             model: CrateModel3D to render (uses current_model if None)
             fig_size: Figure size in inches
+            static: The camera will not be moved (image export), so hidden
+                boxes and back faces are culled for the default camera
             
         Returns:
             Matplotlib figure object
@@ -440,12 +715,42 @@ class CrateVisualizer:
         
         fig = plt.figure(figsize=fig_size)
         ax = fig.add_subplot(111, projection='3d')
+        self._draw_model(ax, model, static=static)
+        
+        # Set labels and title
+        ax.set_xlabel('Length (inches)')
+        ax.set_ylabel('Width (inches)')
+        ax.set_zlabel('Height (inches)')
+        ax.set_title('AutoCrate 3D Model Visualization')
         
-        # Apply view mode transformations
-        if self.view_mode == ViewMode.EXPLODED:
-            model.explode(factor=1.5)
+        return fig
+    
+    def _draw_model(self, ax: Axes3D, model: CrateModel3D, static: bool = False):
+        """
+        Draw the model in the current view mode onto 3D axes. With static=True
+        the axes' current camera is final, so boxes hidden behind opaque
+        panels and faces turned away from the camera are not drawn.
+        """
+        # Apply view mode transformations and level of detail
+        model = model.view(self.view_mode)
+        width, height = ax.figure.get_size_inches() * ax.figure.dpi
+        model = model.lod(self._lod_tier(model, min(width, height)))
+        
+        # Set equal aspect ratio (the limits are needed for the camera direction)
+        self._set_equal_aspect(ax, model)
         
-        # Render each component
+        direction = None
+        hidden: Dict[ComponentType, np.ndarray] = {}
+        if static and self.view_mode != ViewMode.WIREFRAME:
+            direction = self._camera_direction(ax)
+            hidden = model.occluded_boxes(direction)
+        
+        # Render each component type as one collection, then free-form meshes
+        for component_type, instances in model.boxes.items():
+            if self.view_mode == ViewMode.WIREFRAME:
+                self._render_wireframe_boxes(ax, instances)
+            else:
+                self._render_solid_boxes(ax, instances, direction, hidden.get(component_type))
         for component in model.components:
             if self.view_mode == ViewMode.WIREFRAME:
                 self._render_wireframe_component(ax, component)
@@ -455,17 +760,62 @@ class CrateVisualizer:
         # Add dimensions if enabled
         if self.show_dimensions:
             self._add_dimension_annotations(ax, model)
-        
-        # Set labels and title
-        ax.set_xlabel('Length (inches)')
-        ax.set_ylabel('Width (inches)')
-        ax.set_zlabel('Height (inches)')
-        ax.set_title('AutoCrate 3D Model Visualization')
-        
-        # Set equal aspect ratio
-        self._set_equal_aspect(ax, model)
-        
-        return fig
+    
+    def _lod_tier(self, model: CrateModel3D, pixels: float) -> str:
+        """Detail tier for a model drawn `pixels` across its largest extent."""
+        if self.level_of_detail in LOD_TIERS:
+            return self.level_of_detail
+        if self.level_of_detail != 'auto' or not model.component_count():
+            return 'near'
+        min_bound, max_bound = model.get_bounding_box()
+        pixels_per_inch = pixels / max((max_bound - min_bound).max(), 1e-9)
+        if pixels_per_inch >= LOD_NEAR_PIXELS_PER_INCH:
+            return 'near'
+        if pixels_per_inch >= LOD_MID_PIXELS_PER_INCH:
+            return 'mid'
+        return 'far'
+    
+    @staticmethod
+    def _camera_direction(ax: Axes3D) -> np.ndarray:
+        """Data-space direction from the scene towards the camera of 3D axes."""
+        elev, azim = np.radians(ax.elev), np.radians(ax.azim)
+        eye = np.array([np.cos(elev) * np.cos(azim), np.cos(elev) * np.sin(azim), np.sin(elev)])
+        # The view box is scaled per axis by box aspect / data range
+        ranges = np.array([np.ptp(ax.get_xlim()), np.ptp(ax.get_ylim()), np.ptp(ax.get_zlim())])
+        direction = eye * ranges / ax.get_box_aspect()
+        return direction / np.linalg.norm(direction)
+    
+    def _render_solid_boxes(self, ax: Axes3D, instances: BoxInstances,
+                            direction: Optional[np.ndarray] = None,
+                            hidden: Optional[np.ndarray] = None):
+        """
+        Render all boxes of one type as a single Poly3DCollection, leaving out
+        hidden boxes and, for opaque boxes, faces turned away from `direction`.
+        """
+        vertices = instances.vertices()
+        if hidden is not None:
+            vertices = vertices[~hidden]
+        if not len(vertices):
+            return
+        faces = BOX_FACES
+        if direction is not None and instances.opacity >= 1:
+            faces = BOX_FACES[BOX_FACE_NORMALS @ direction > 0]
+        polygons = vertices[:, faces].reshape(-1, 4, 3)
+        
+        ax.add_collection3d(Poly3DCollection(
+            polygons,
+            facecolors=instances.color,
+            edgecolors='black',
+            alpha=instances.opacity,
+            linewidths=0.5
+        ))
+    
+    def _render_wireframe_boxes(self, ax: Axes3D, instances: BoxInstances):
+        """Render the edges of all boxes of one type as a single Line3DCollection."""
+        if not len(instances):
+            return
+        segments = instances.vertices()[:, BOX_EDGES].reshape(-1, 2, 3)
+        ax.add_collection3d(Line3DCollection(segments, colors='black', linewidths=1))
     
     def _render_solid_component(self, ax: Axes3D, component: Component3D):
         """Render a solid component."""
@@ -473,15 +823,11 @@ class CrateVisualizer:
             vertices = component.vertices[face]
             poly = [[vertices[j] for j in range(len(vertices))]]
             
-            alpha = component.opacity
-            if self.view_mode == ViewMode.TRANSPARENT:
-                alpha = 0.3
-            
             ax.add_collection3d(Poly3DCollection(
                 poly,
                 facecolors=component.color,
                 edgecolors='black',
-                alpha=alpha,
+                alpha=component.opacity,
                 linewidths=0.5
             ))
     
@@ -542,19 +888,22 @@ class CrateVisualizer:
         if model is None:
             raise ValueError("No model to render")
         
-        # Apply view mode transformations
-        if self.view_mode == ViewMode.EXPLODED:
-            model.explode(factor=1.5)
+        # Apply view mode transformations and level of detail (for the figure size below)
+        model = model.view(self.view_mode)
+        model = model.lod(self._lod_tier(model, 800))
         
-        traces = []
-        
-        # Create traces for each component
-        for component in model.components:
-            if self.view_mode == ViewMode.WIREFRAME:
-                trace = self._create_wireframe_trace(component)
-            else:
-                trace = self._create_mesh_trace(component)
-            traces.append(trace)
+        if self.view_mode != ViewMode.WIREFRAME and self.merge_meshes:
+            traces = self._create_merged_mesh_traces(model)
+        else:
+            traces = []
+            
+            # Create traces for each component
+            for component in model.all_components():
+                if self.view_mode == ViewMode.WIREFRAME:
+                    trace = self._create_wireframe_trace(component)
+                else:
+                    trace = self._create_mesh_trace(component)
+                traces.append(trace)
         
         # Create figure
         fig = go.Figure(data=traces)
@@ -583,31 +932,108 @@ class CrateVisualizer:
         
         return fig
     
+    @staticmethod
+    def _triangulate_faces(faces: List[List[int]]) -> np.ndarray:
+        """
+        Fan-triangulate polygon faces into an (T, 3) index array. Faces are
+        grouped by vertex count so each group is split with array slicing.
+        """
+        by_size: Dict[int, List[List[int]]] = {}
+        for face in faces:
+            if len(face) >= 3:
+                by_size.setdefault(len(face), []).append(face)
+        
+        triangles = []
+        for size, group in by_size.items():
+            polygons = np.asarray(group, dtype=np.int64)
+            fans = np.empty((len(polygons), size - 2, 3), dtype=np.int64)
+            fans[:, :, 0] = polygons[:, :1]
+            fans[:, :, 1] = polygons[:, 1:-1]
+            fans[:, :, 2] = polygons[:, 2:]
+            triangles.append(fans.reshape(-1, 3))
+        
+        if not triangles:
+            return np.empty((0, 3), dtype=np.int64)
+        return np.vstack(triangles)
+    
+    def _mesh_parts(self, model: CrateModel3D):
+        """
+        (material, opacity, vertices, triangles, colors, info, count) per box
+        type and per free-form component; box types are expanded from the
+        shared unit box in one array operation each.
+        """
+        for instances in model.boxes.values():
+            count = len(instances)
+            if not count:
+                continue
+            vertices, triangles = box_mesh(instances.offsets, instances.sizes)
+            names = np.repeat(np.array(instances.names, dtype=object), 8)
+            info = np.empty((len(vertices), 3), dtype=object)
+            info[:, 0] = names
+            info[:, 1] = instances.material
+            info[:, 2] = f"{instances.thickness:g}"
+            colors = np.full(len(vertices), instances.color, dtype=object)
+            yield instances.material, instances.opacity, vertices, triangles, colors, info, count
+        
+        for component in model.components:
+            vertices = np.asarray(component.vertices, dtype=float)
+            info = np.empty((len(vertices), 3), dtype=object)
+            info[:] = [component.name, component.material, f"{component.thickness:g}"]
+            colors = np.full(len(vertices), component.color, dtype=object)
+            yield (component.material, component.opacity, vertices,
+                   self._triangulate_faces(component.faces), colors, info, 1)
+    
+    def _create_merged_mesh_traces(self, model: CrateModel3D) -> List[go.Mesh3d]:
+        """
+        Merge components into one Mesh3d per material (and opacity), with
+        per-vertex colors and per-vertex customdata carrying each component's
+        name, material and thickness for hover.
+        """
+        groups: Dict[Tuple[str, float], List[Tuple]] = {}
+        for part in self._mesh_parts(model):
+            groups.setdefault((part[0], part[1]), []).append(part[2:])
+        
+        traces = []
+        for (material, opacity), parts in groups.items():
+            counts = np.array([len(part[0]) for part in parts])
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            vertices = np.vstack([part[0] for part in parts])
+            triangles = np.vstack([part[1] + offset for part, offset in zip(parts, offsets)])
+            colors = np.concatenate([part[2] for part in parts])
+            info = np.vstack([part[3] for part in parts])
+            members = sum(part[4] for part in parts)
+            
+            traces.append(go.Mesh3d(
+                x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+                i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+                name=f"{material.capitalize()} ({members})",
+                vertexcolor=colors,
+                opacity=opacity,
+                flatshading=True,
+                customdata=info,
+                hovertemplate="<b>%{customdata[0]}</b><br>" +
+                             "Material: %{customdata[1]}<br>" +
+                             "Thickness: %{customdata[2]}\"<br>" +
+                             "<extra></extra>"
+            ))
+        
+        return traces
+    
     def _create_mesh_trace(self, component: Component3D) -> go.Mesh3d:
         """Create a Plotly mesh trace for a component."""
         vertices = component.vertices
         x, y, z = vertices[:, 0], vertices[:, 1], vertices[:, 2]
         
         # Flatten faces for Plotly
-        i, j, k = [], [], []
-        for face in component.faces:
-            if len(face) >= 3:
-                # Triangulate faces with more than 3 vertices
-                for idx in range(1, len(face) - 1):
-                    i.append(face[0])
-                    j.append(face[idx])
-                    k.append(face[idx + 1])
-        
-        opacity = component.opacity
-        if self.view_mode == ViewMode.TRANSPARENT:
-            opacity = 0.3
+        triangles = self._triangulate_faces(component.faces)
+        i, j, k = triangles[:, 0], triangles[:, 1], triangles[:, 2]
         
         return go.Mesh3d(
             x=x, y=y, z=z,
             i=i, j=j, k=k,
             name=component.name,
             color=component.color,
-            opacity=opacity,
+            opacity=component.opacity,
             hovertemplate=f"<b>{component.name}</b><br>" +
                          f"Material: {component.material}<br>" +
                          f"Thickness: {component.thickness}\"<br>" +
@@ -658,75 +1084,96 @@ class CrateVisualizer:
         fig.update_layout(scene_annotations=annotations)
     
     def create_assembly_animation(self, model: CrateModel3D, 
-                                 duration: float = 10.0) -> animation.FuncAnimation:
+                                 duration: float = 10.0,
+                                 blit: bool = False) -> animation.FuncAnimation:
         """
         Create an assembly sequence animation.
         
         Args:
             model: CrateModel3D to animate
             duration: Total animation duration in seconds
+            blit: Redraw only the component artists over a cached background
+                (the camera cannot be rotated while blitting)
             
         Returns:
             Matplotlib animation object
         """
         fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        # Calculate frame timing
-        num_components = len(model.components)
-        frames_per_component = int(30 * duration / num_components)  # 30 fps
-        total_frames = frames_per_component * num_components
-        
-        def update_frame(frame_num):
-            ax.clear()
-            
-            # Determine which components to show
-            components_to_show = min(
-                frame_num // frames_per_component + 1,
-                num_components
-            )
-            
-            # Render visible components
-            for i in range(components_to_show):
-                component = model.components[i]
-                
-                # Animate the current component being added
-                if i == components_to_show - 1:
-                    progress = (frame_num % frames_per_component) / frames_per_component
-                    temp_component = Component3D(
-                        name=component.name,
-                        component_type=component.component_type,
-                        vertices=component.vertices.copy(),
-                        faces=component.faces,
-                        color=component.color,
-                        opacity=progress,
-                        material=component.material,
-                        thickness=component.thickness
-                    )
-                    
-                    # Animate sliding in from above
-                    offset = np.array([0, 0, 20 * (1 - progress)])
-                    temp_component.translate(offset)
-                    self._render_solid_component(ax, temp_component)
-                else:
-                    self._render_solid_component(ax, component)
-            
-            # Set labels and limits
-            ax.set_xlabel('Length (inches)')
-            ax.set_ylabel('Width (inches)')
-            ax.set_zlabel('Height (inches)')
-            ax.set_title(f'Assembly Animation - Step {components_to_show}/{num_components}')
-            self._set_equal_aspect(ax, model)
+        assembly = AssemblyAnimation(fig, model, duration=duration, blit=blit)
         
         anim = animation.FuncAnimation(
-            fig, update_frame,
-            frames=total_frames,
-            interval=1000/30,  # 30 fps
+            fig, assembly.update,
+            frames=assembly.total_frames,
+            init_func=assembly.init,
+            interval=1000/assembly.fps,
+            blit=blit,
             repeat=True
         )
         
         return anim
     
+    def export_assembly_video(self, model: CrateModel3D, output_path: Path,
+                              duration: float = 10.0, fps: int = 30,
+                              fig_size: Tuple[int, int] = (12, 9), dpi: int = 100,
+                              workers: Optional[int] = None) -> Path:
+        """
+        Render the assembly animation offline to an MP4 (ffmpeg) or GIF (Pillow).
+        
+        Frames are rendered in chunks by a process pool, each worker drawing
+        its chunk on its own Agg canvas, and written in order as the chunks
+        complete; only a few chunks are in flight at a time.
+        
+        Args:
+            model: CrateModel3D to animate
+            output_path: Target file; the suffix selects the format (.mp4 or .gif)
+            duration: Total animation duration in seconds
+            fps: Frames per second
+            fig_size: Frame size in inches
+            dpi: Frame resolution
+            workers: Worker processes (default: CPU count; 1 renders in-process)
+            
+        Returns:
+            Path to the written file
+        """
+        output_path = Path(output_path)
+        suffix = output_path.suffix.lower()
+        if suffix not in ('.mp4', '.gif'):
+            raise ValueError(f"Unsupported animation format '{suffix}' (use .mp4 or .gif)")
+        
+        workers = workers or os.cpu_count() or 1
+        total_frames = AssemblyAnimation.frame_count(model, duration, fps)
+        chunk = max(1, min(fps, -(-total_frames // workers)))
+        chunks = [(start, min(start + chunk, total_frames)) for start in range(0, total_frames, chunk)]
+        args = (model, duration, fps, fig_size, dpi)
+        width, height = int(fig_size[0] * dpi), int(fig_size[1] * dpi)
+        
+        if suffix == '.mp4':
+            sink = _FFmpegSink(output_path, width, height, fps)
+        else:
+            sink = _GifSink(output_path, width, height, fps)
+        
+        try:
+            if workers == 1:
+                for start, stop in chunks:
+                    for frame in _render_assembly_frames(*args, start, stop):
+                        sink.write(frame)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = deque()
+                    for start, stop in chunks:
+                        pending.append(pool.submit(_render_assembly_frames, *args, start, stop))
+                        if len(pending) >= 2 * workers:
+                            for frame in pending.popleft().result():
+                                sink.write(frame)
+                    while pending:
+                        for frame in pending.popleft().result():
+                            sink.write(frame)
+        except BaseException:
+            sink.abort()
+            raise
+        sink.close()
+        return output_path
+    
     def export_to_html(self, model: Optional[CrateModel3D] = None, 
                       filepath: Path = Path("crate_visualization.html")) -> Path:
         """
@@ -775,6 +1222,40 @@ class CrateVisualizer:
         fig.write_html(str(filepath))
         return filepath
     
+    def export_to_glb(self, model: Optional[CrateModel3D] = None,
+                      filepath: Path = Path("crate_model.glb")) -> Path:
+        """
+        Export the model in the current view mode as binary glTF (.glb).
+        
+        Args:
+            model: CrateModel3D to export (uses current_model if None)
+            filepath: Output file path
+            
+        Returns:
+            Path to exported file
+        """
+        model = model or self.current_model
+        if model is None:
+            raise ValueError("No model to export")
+        return write_glb(model.view(self.view_mode), filepath)
+    
+    def export_to_stl(self, model: Optional[CrateModel3D] = None,
+                      filepath: Path = Path("crate_model.stl")) -> Path:
+        """
+        Export the model in the current view mode as binary STL (inches).
+        
+        Args:
+            model: CrateModel3D to export (uses current_model if None)
+            filepath: Output file path
+            
+        Returns:
+            Path to exported file
+        """
+        model = model or self.current_model
+        if model is None:
+            raise ValueError("No model to export")
+        return write_stl(model.view(self.view_mode), filepath)
+    
     def create_comparison_view(self, models: List[CrateModel3D], 
                               labels: List[str]) -> go.Figure:
         """
@@ -803,8 +1284,7 @@ class CrateVisualizer:
             col = idx % 2 + 1
             
             # Create traces for this model
-            for component in model.components:
-                trace = self._create_mesh_trace(component)
+            for trace in self._create_merged_mesh_traces(model.view(self.view_mode)):
                 fig.add_trace(trace, row=row, col=col)
         
         fig.update_layout(
@@ -816,6 +1296,602 @@ class CrateVisualizer:
         return fig
 
 
+# Shared unit cube with outward winding and flat normals, as used by the
+# engine geometry's .glb: 24 vertices, 12 triangles
+_CUBE = unit_cube()
+_CUBE_POSITIONS = np.array(_CUBE[0], dtype='<f4').reshape(-1, 3)
+_CUBE_NORMALS = np.array(_CUBE[1], dtype='<f4').reshape(-1, 3)
+_CUBE_INDICES = np.array(_CUBE[2]).reshape(-1, 3)
+
+STL_TRIANGLE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+STL_CHUNK_BOXES = 4096  # Boxes converted to STL records per write
+
+
+def _mesh_buffers(component: Component3D) -> Tuple[np.ndarray, np.ndarray]:
+    """(float32 positions, uint32 triangle indices) of a free-form component"""
+    positions = np.ascontiguousarray(component.vertices, dtype='<f4')
+    triangles = np.ascontiguousarray(CrateVisualizer._triangulate_faces(component.faces), dtype='<u4')
+    return positions, triangles
+
+
+def write_glb(model: CrateModel3D, filepath: Path) -> Path:
+    """
+    Write a model as binary glTF 2.0.
+    
+    Every box is its own node (named after the component) pointing at a
+    unit-cube mesh of its type, with the box size as the node's scale and
+    its minimum corner as its translation; free-form components get their
+    own meshes. Nodes are grouped per component type under a root node that
+    converts inches Z-up to metres Y-up. The buffer layout is computed first
+    and the NumPy buffers are then written straight to the file.
+    """
+    filepath = Path(filepath)
+    buffers: List[np.ndarray] = []
+    views: List[Dict[str, Any]] = []
+    accessors: List[Dict[str, Any]] = []
+    byte_length = 0
+    
+    def add_buffer(data: np.ndarray, component_type: int, kind: str, target: int,
+                   bounds: bool = False) -> int:
+        nonlocal byte_length
+        byte_length += -byte_length % 4
+        views.append({"buffer": 0, "byteOffset": byte_length, "byteLength": data.nbytes, "target": target})
+        buffers.append(data)
+        byte_length += data.nbytes
+        accessor = {"bufferView": len(views) - 1, "componentType": component_type,
+                    "count": data.size // (3 if kind == "VEC3" else 1), "type": kind}
+        if bounds:
+            accessor["min"] = data.min(axis=0).tolist()
+            accessor["max"] = data.max(axis=0).tolist()
+        accessors.append(accessor)
+        return len(accessors) - 1
+    
+    float32, uint16, uint32 = 5126, 5123, 5125
+    array_buffer, element_buffer = 34962, 34963
+    
+    materials: List[Dict[str, Any]] = []
+    material_index: Dict[Tuple[str, str, float], int] = {}
+    
+    def add_material(name: str, color: str, opacity: float) -> int:
+        key = (name, color, opacity)
+        if key not in material_index:
+            rgba = list(to_rgba(color, opacity))
+            material = {"name": name, "pbrMetallicRoughness": {
+                "baseColorFactor": rgba, "metallicFactor": 0.0, "roughnessFactor": 0.9}}
+            if opacity < 1:
+                material["alphaMode"] = "BLEND"
+            materials.append(material)
+            material_index[key] = len(materials) - 1
+        return material_index[key]
+    
+    meshes: List[Dict[str, Any]] = []
+    nodes: List[Dict[str, Any]] = []
+    groups: List[int] = []
+    
+    box_sets = [instances for instances in model.boxes.values() if len(instances)]
+    if box_sets:
+        cube = {
+            "POSITION": add_buffer(_CUBE_POSITIONS, float32, "VEC3", array_buffer, bounds=True),
+            "NORMAL": add_buffer(_CUBE_NORMALS, float32, "VEC3", array_buffer),
+        }
+        cube_indices = add_buffer(_CUBE_INDICES.astype('<u2').ravel(), uint16, "SCALAR", element_buffer)
+    
+    for instances in box_sets:
+        meshes.append({"name": instances.component_type.value, "primitives": [{
+            "attributes": cube,
+            "indices": cube_indices,
+            "material": add_material(instances.material, instances.color, instances.opacity),
+        }]})
+        mesh = len(meshes) - 1
+        first = len(nodes)
+        for name, offset, size in zip(instances.names, instances.offsets.tolist(), instances.sizes.tolist()):
+            nodes.append({"name": name, "mesh": mesh, "translation": offset, "scale": size})
+        nodes.append({"name": instances.component_type.value, "children": list(range(first, len(nodes)))})
+        groups.append(len(nodes) - 1)
+    
+    first = len(nodes)
+    for component in model.components:
+        positions, triangles = _mesh_buffers(component)
+        meshes.append({"name": component.name, "primitives": [{
+            "attributes": {"POSITION": add_buffer(positions, float32, "VEC3", array_buffer, bounds=True)},
+            "indices": add_buffer(triangles.ravel(), uint32, "SCALAR", element_buffer),
+            "material": add_material(component.material, component.color, component.opacity),
+        }]})
+        nodes.append({"name": component.name, "mesh": len(meshes) - 1})
+    if model.components:
+        nodes.append({"name": "components", "children": list(range(first, len(nodes)))})
+        groups.append(len(nodes) - 1)
+    
+    # Root: inches Z-up -> metres Y-up (rotate -90 degrees about X)
+    nodes.append({
+        "name": "crate",
+        "children": groups,
+        "rotation": [-0.7071067811865476, 0.0, 0.0, 0.7071067811865476],
+        "scale": [INCH_TO_METRE] * 3,
+    })
+    
+    byte_length += -byte_length % 4
+    gltf = {
+        "asset": {"version": "2.0", "generator": "AutoCrate"},
+        "scene": 0,
+        "scenes": [{"nodes": [len(nodes) - 1]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": accessors,
+        "bufferViews": views,
+        "extras": {"units": "inch", "up_axis": "Z",
+                   "length": model.length, "width": model.width, "height": model.height},
+    }
+    if byte_length:
+        gltf["buffers"] = [{"byteLength": byte_length}]
+    
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    total = 12 + 8 + len(json_chunk) + (8 + byte_length if byte_length else 0)
+    
+    with open(filepath, "wb") as handle:
+        handle.write(struct.pack("<III", 0x46546C67, 2, total))
+        handle.write(struct.pack("<II", len(json_chunk), 0x4E4F534A))
+        handle.write(json_chunk)
+        if byte_length:
+            handle.write(struct.pack("<II", byte_length, 0x004E4942))
+            written = 0
+            for view, data in zip(views, buffers):
+                handle.write(b"\x00" * (view["byteOffset"] - written))
+                handle.write(memoryview(data))
+                written = view["byteOffset"] + data.nbytes
+            handle.write(b"\x00" * (byte_length - written))
+    return filepath
+
+
+def write_stl(model: CrateModel3D, filepath: Path) -> Path:
+    """
+    Write a model as binary STL in inches. Box triangles are generated from
+    the shared unit cube in fixed-size chunks of boxes, each written as one
+    structured NumPy record array; free-form components follow.
+    """
+    filepath = Path(filepath)
+    box_sets = [instances for instances in model.boxes.values() if len(instances)]
+    meshes = [_mesh_buffers(component) for component in model.components]
+    count = len(_CUBE_INDICES) * sum(len(instances) for instances in box_sets)
+    count += sum(len(triangles) for _, triangles in meshes)
+    
+    corners = _CUBE_POSITIONS[_CUBE_INDICES]  # (12, 3, 3) unit-cube triangles
+    normals = _CUBE_NORMALS[_CUBE_INDICES[:, 0]]  # Axis-aligned, unchanged by scaling
+    
+    with open(filepath, "wb") as handle:
+        header = f"AutoCrate {model.length:g}x{model.width:g}x{model.height:g} in".encode("ascii")
+        handle.write(header[:80].ljust(80, b" "))
+        handle.write(struct.pack("<I", count))
+        
+        for instances in box_sets:
+            for start in range(0, len(instances), STL_CHUNK_BOXES):
+                offsets = instances.offsets[start:start + STL_CHUNK_BOXES]
+                sizes = instances.sizes[start:start + STL_CHUNK_BOXES]
+                records = np.zeros((len(offsets), len(_CUBE_INDICES)), dtype=STL_TRIANGLE)
+                records['normal'] = normals
+                records['vertices'] = offsets[:, None, None, :] + corners[None] * sizes[:, None, None, :]
+                handle.write(memoryview(records.ravel()))
+        
+        for positions, triangles in meshes:
+            records = np.zeros(len(triangles), dtype=STL_TRIANGLE)
+            vertices = positions[triangles]
+            normal = np.cross(vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0])
+            length = np.linalg.norm(normal, axis=1, keepdims=True)
+            records['normal'] = np.divide(normal, length, out=np.zeros_like(normal), where=length > 0)
+            records['vertices'] = vertices
+            handle.write(memoryview(records))
+    return filepath
+
+
+class AssemblyAnimation:
+    """
+    Assembly sequence drawn with one Poly3DCollection per component, created
+    once. A frame only moves the component being added and shows or hides
+    components whose step was crossed since the previous frame, so the axes
+    are never cleared and no artists are allocated per frame.
+    """
+    
+    def __init__(self, fig: Figure, model: CrateModel3D,
+                 duration: float = 10.0, fps: int = 30, blit: bool = False):
+        self.fig = fig
+        self.ax = fig.add_subplot(111, projection='3d')
+        self.blit = blit
+        self.fps = fps
+        self.components = model.all_components()
+        self.frames_per_component = self._frames_per_component(len(self.components), duration, fps)
+        self.total_frames = self.frames_per_component * len(self.components)
+        
+        # Face polygons of each component at its assembled position
+        self.polygons = [
+            [component.vertices[face] for face in component.faces]
+            for component in self.components
+        ]
+        self.artists = []
+        for component, polygons in zip(self.components, self.polygons):
+            artist = Poly3DCollection(
+                polygons,
+                facecolors=component.color,
+                edgecolors='black',
+                alpha=component.opacity,
+                linewidths=0.5
+            )
+            artist.set_visible(False)
+            self.ax.add_collection3d(artist)
+            self.artists.append(artist)
+        self.step_label = self.ax.text2D(0.02, 0.95, "", transform=self.ax.transAxes)
+        self._shown = 0  # Components visible after the last update, including the moving one
+        
+        self.ax.set_xlabel('Length (inches)')
+        self.ax.set_ylabel('Width (inches)')
+        self.ax.set_zlabel('Height (inches)')
+        self.ax.set_title('Assembly Animation')
+        min_bound, max_bound = model.get_bounding_box()
+        mid = (max_bound + min_bound) / 2
+        max_range = (max_bound - min_bound).max() / 2
+        self.ax.set_xlim(mid[0] - max_range, mid[0] + max_range)
+        self.ax.set_ylim(mid[1] - max_range, mid[1] + max_range)
+        self.ax.set_zlim(mid[2] - max_range, mid[2] + max_range)
+    
+    @staticmethod
+    def _frames_per_component(num_components: int, duration: float, fps: int) -> int:
+        return max(1, int(fps * duration / max(num_components, 1)))
+    
+    @classmethod
+    def frame_count(cls, model: CrateModel3D, duration: float = 10.0, fps: int = 30) -> int:
+        count = len(model.all_components())
+        return cls._frames_per_component(count, duration, fps) * count
+    
+    def init(self) -> List[Any]:
+        return self.update(0)
+    
+    def update(self, frame_num: int) -> List[Any]:
+        """Bring the artists to the given frame; returns the artists to redraw."""
+        num_components = len(self.components)
+        if not num_components:
+            return []
+        shown = min(frame_num // self.frames_per_component + 1, num_components)
+        progress = (frame_num % self.frames_per_component) / self.frames_per_component
+        
+        # Reset components whose state changed since the previous frame
+        changed = []
+        for index in range(max(min(shown, self._shown) - 1, 0), max(shown, self._shown)):
+            artist = self.artists[index]
+            if index < shown - 1:
+                artist.set_verts(self.polygons[index])
+                artist.set_alpha(self.components[index].opacity)
+                artist.set_visible(True)
+            else:
+                artist.set_visible(False)
+            changed.append(artist)
+        self._shown = shown
+        
+        # Slide the current component in from above
+        moving = self.artists[shown - 1]
+        offset = np.array([0, 0, 20 * (1 - progress)])
+        moving.set_verts([polygon + offset for polygon in self.polygons[shown - 1]])
+        moving.set_alpha(progress)
+        moving.set_visible(True)
+        if moving not in changed:
+            changed.append(moving)
+        
+        self.step_label.set_text(f'Step {shown}/{num_components}')
+        
+        if not self.blit:
+            return changed + [self.step_label]
+        
+        # Blitted artists skip Axes3D.draw, so project and depth-sort them here
+        visible = self.artists[:shown]
+        for zorder, artist in enumerate(sorted(visible, key=lambda a: a.do_3d_projection(), reverse=True)):
+            artist.zorder = 10 + zorder
+        return self.artists + [self.step_label]
+
+
+def _render_assembly_frames(model: CrateModel3D, duration: float, fps: int,
+                            fig_size: Tuple[int, int], dpi: int,
+                            start: int, stop: int) -> List[bytes]:
+    """Render frames [start, stop) as RGBA buffers on a private Agg canvas (runs in a worker)."""
+    fig = Figure(figsize=fig_size, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    assembly = AssemblyAnimation(fig, model, duration=duration, fps=fps)
+    frames = []
+    for frame_num in range(start, stop):
+        assembly.update(frame_num)
+        canvas.draw()
+        frames.append(bytes(canvas.buffer_rgba()))
+    return frames
+
+
+class _FFmpegSink:
+    """Pipes raw RGBA frames into an ffmpeg H.264 encoder."""
+    
+    def __init__(self, path: Path, width: int, height: int, fps: int):
+        binary = rcParams['animation.ffmpeg_path']
+        if shutil.which(binary) is None:
+            raise RuntimeError("MP4 export requires ffmpeg")
+        self.process = subprocess.Popen(
+            [binary, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+             '-i', '-', '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+             '-metadata', 'artist=AutoCrate', str(path)],
+            stdin=subprocess.PIPE
+        )
+    
+    def write(self, frame: bytes):
+        self.process.stdin.write(frame)
+    
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+    
+    def abort(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class _GifSink:
+    """Collects frames as Pillow images and saves them as a looping GIF."""
+    
+    def __init__(self, path: Path, width: int, height: int, fps: int):
+        self.path = path
+        self.size = (width, height)
+        self.fps = fps
+        self.images = []
+    
+    def write(self, frame: bytes):
+        from PIL import Image
+        self.images.append(Image.frombuffer('RGBA', self.size, frame, 'raw', 'RGBA', 0, 1).convert('RGB'))
+    
+    def close(self):
+        if not self.images:
+            raise ValueError("No frames to write")
+        self.images[0].save(
+            self.path, save_all=True, append_images=self.images[1:],
+            duration=int(1000 / self.fps), loop=0
+        )
+    
+    def abort(self):
+        self.images.clear()
+
+
+# Thumbnail style; bump THUMBNAIL_STYLE_VERSION whenever the drawing changes
+# so previously hashed files are not reused
+THUMBNAIL_STYLE_VERSION = 2
+THUMBNAIL_SIZE = (256, 256)  # pixels
+THUMBNAIL_CAMERA = (25, -55)  # elevation, azimuth in degrees
+
+
+class ThumbnailRenderer:
+    """
+    Headless PNG thumbnails for batches of crate designs.
+    
+    Each design is drawn with a fixed camera on a private Agg canvas (no
+    pyplot, no display). Files are named by a hash of the design and the
+    thumbnail settings, so a design whose file already exists is never
+    rendered again and identical designs in one batch are rendered once.
+    """
+    
+    def __init__(self, output_dir: Path, size: Tuple[int, int] = THUMBNAIL_SIZE,
+                 dpi: int = 100, workers: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.size = tuple(size)
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+    
+    def content_hash(self, crate_data: Dict[str, Any]) -> str:
+        payload = json.dumps({
+            "design": crate_data,
+            "size": self.size,
+            "dpi": self.dpi,
+            "camera": THUMBNAIL_CAMERA,
+            "style": THUMBNAIL_STYLE_VERSION,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    
+    def path_for(self, crate_data: Dict[str, Any]) -> Path:
+        return self.output_dir / f"{self.content_hash(crate_data)}.png"
+    
+    def render(self, designs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Render thumbnails for designs that do not have one yet.
+        
+        Args:
+            designs: crate_data dictionaries as taken by create_crate_model
+            
+        Returns:
+            One {"path", "hash", "rendered"} entry per design, in input order
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        results = []
+        pending: Dict[Path, Dict[str, Any]] = {}
+        for crate_data in designs:
+            path = self.path_for(crate_data)
+            rendered = not path.exists()
+            if rendered:
+                pending.setdefault(path, crate_data)
+            results.append({"path": path, "hash": path.stem, "rendered": rendered})
+        
+        jobs = [(crate_data, path, self.size, self.dpi) for path, crate_data in pending.items()]
+        if len(jobs) <= 1 or self.workers == 1:
+            for job in jobs:
+                _render_thumbnail(*job)
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                chunksize = max(1, len(jobs) // (4 * self.workers))
+                list(pool.map(_render_thumbnail, *zip(*jobs), chunksize=chunksize))
+        return results
+
+
+def _render_thumbnail(crate_data: Dict[str, Any], path: Path,
+                      size: Tuple[int, int], dpi: int) -> Path:
+    """Render one thumbnail and move it into place atomically (runs in a worker)."""
+    visualizer = CrateVisualizer(platform='web')
+    visualizer.show_dimensions = False
+    model = visualizer.create_crate_model(crate_data)
+    
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1), projection='3d')
+    ax.view_init(elev=THUMBNAIL_CAMERA[0], azim=THUMBNAIL_CAMERA[1])
+    visualizer._draw_model(ax, model, static=True)
+    ax.set_axis_off()
+    
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    canvas.print_png(str(tmp_path))
+    os.replace(tmp_path, path)
+    return path
+
+
+COMPARISON_PAGE_SIZE = 6  # Designs per page; each is its own WebGL scene
+COMPARISON_SHARED_COLOR = "#B0B0B0"
+COMPARISON_HIGHLIGHT_COLOR = "#E4572E"
+
+
+class DesignComparison:
+    """
+    Side-by-side comparison of many designs, paged.
+    
+    Boxes are keyed by type, position and size (rounded to `decimals`).
+    Boxes present in every design are shared geometry: their mesh is built
+    once and reused as a faint backdrop in every panel, and only each
+    design's remaining boxes are drawn, highlighted. Keys for all designs
+    are computed up front (one array pass per design); meshes and figures
+    are only built for the page requested.
+    """
+    
+    def __init__(self, models: List[CrateModel3D], labels: Optional[List[str]] = None,
+                 page_size: int = COMPARISON_PAGE_SIZE, columns: int = 3, decimals: int = 3):
+        self.models = models
+        self.labels = labels or [f"Design {i+1}" for i in range(len(models))]
+        self.page_size = max(1, page_size)
+        self.columns = max(1, columns)
+        self.decimals = decimals
+        self._boxes = [self._flatten(model) for model in models]
+        keys = [self._keys(rows) for rows, _ in self._boxes]
+        common = keys[0] if keys else np.empty(0)
+        for design_keys in keys[1:]:
+            common = np.intersect1d(common, design_keys)
+        self._shared = [np.isin(design_keys, common) for design_keys in keys]
+        self._shared_mesh: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    def _flatten(self, model: CrateModel3D) -> Tuple[np.ndarray, List[str]]:
+        """All boxes as (type, x, y, z, dx, dy, dz) rows, and their names"""
+        rows, names = [], []
+        for type_index, component_type in enumerate(ComponentType):
+            instances = model.boxes.get(component_type)
+            if instances is None or not len(instances):
+                continue
+            rows.append(np.column_stack([
+                np.full(len(instances), type_index), instances.offsets, instances.sizes
+            ]))
+            names.extend(instances.names)
+        return (np.vstack(rows) if rows else np.empty((0, 7))), names
+    
+    def _keys(self, rows: np.ndarray) -> np.ndarray:
+        # + 0.0 folds -0.0 into 0.0 so equal boxes have equal bytes
+        rounded = np.ascontiguousarray(np.round(rows, self.decimals) + 0.0)
+        return rounded.view(np.dtype((np.void, rounded.dtype.itemsize * rounded.shape[1]))).ravel()
+    
+    def __len__(self) -> int:
+        return len(self.models)
+    
+    @property
+    def page_count(self) -> int:
+        return -(-len(self.models) // self.page_size)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Shared and differing box counts per design"""
+        return [
+            {"label": label, "boxes": len(shared), "shared": int(shared.sum()),
+             "different": int((~shared).sum()) + len(model.components)}
+            for label, model, shared in zip(self.labels, self.models, self._shared)
+        ]
+    
+    def differences(self, index: int) -> List[str]:
+        """Names of the components of one design that are not shared by all designs"""
+        _, names = self._boxes[index]
+        shared = self._shared[index]
+        return [name for name, is_shared in zip(names, shared) if not is_shared] + [
+            component.name for component in self.models[index].components]
+    
+    def shared_mesh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vertices and triangles of the boxes common to all designs, built once"""
+        if self._shared_mesh is None:
+            if self.models:
+                rows = self._boxes[0][0][self._shared[0]]
+            else:
+                rows = np.empty((0, 7))
+            self._shared_mesh = box_mesh(rows[:, 1:4], rows[:, 4:7])
+        return self._shared_mesh
+    
+    def page(self, number: int = 0) -> go.Figure:
+        """Figure for one page of designs (0-based)"""
+        from plotly.subplots import make_subplots
+        
+        if not 0 <= number < max(self.page_count, 1):
+            raise ValueError(f"Page {number} out of range (0-{self.page_count - 1})")
+        indices = list(range(number * self.page_size, min((number + 1) * self.page_size, len(self.models))))
+        cols = min(self.columns, max(len(indices), 1))
+        rows = max(-(-len(indices) // cols), 1)
+        
+        fig = make_subplots(
+            rows=rows, cols=cols,
+            specs=[[{'type': 'scene'} for _ in range(cols)] for _ in range(rows)],
+            subplot_titles=[
+                f"{self.labels[index]} ({int((~self._shared[index]).sum())} changed)" for index in indices
+            ]
+        )
+        
+        shared_vertices, shared_triangles = self.shared_mesh()
+        for position, index in enumerate(indices):
+            row, col = position // cols + 1, position % cols + 1
+            if len(shared_triangles):
+                fig.add_trace(go.Mesh3d(
+                    x=shared_vertices[:, 0], y=shared_vertices[:, 1], z=shared_vertices[:, 2],
+                    i=shared_triangles[:, 0], j=shared_triangles[:, 1], k=shared_triangles[:, 2],
+                    color=COMPARISON_SHARED_COLOR, opacity=0.15, flatshading=True,
+                    hoverinfo='skip', name="Shared"
+                ), row=row, col=col)
+            
+            box_rows, names = self._boxes[index]
+            changed = ~self._shared[index]
+            if changed.any():
+                vertices, triangles = box_mesh(box_rows[changed, 1:4], box_rows[changed, 4:7])
+                fig.add_trace(go.Mesh3d(
+                    x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+                    i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+                    color=COMPARISON_HIGHLIGHT_COLOR, flatshading=True,
+                    customdata=np.repeat(np.array(names, dtype=object)[changed], 8),
+                    hovertemplate="<b>%{customdata}</b><extra></extra>",
+                    name=self.labels[index]
+                ), row=row, col=col)
+            
+            for component in self.models[index].components:
+                positions = np.asarray(component.vertices, dtype=float)
+                triangles = CrateVisualizer._triangulate_faces(component.faces)
+                fig.add_trace(go.Mesh3d(
+                    x=positions[:, 0], y=positions[:, 1], z=positions[:, 2],
+                    i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+                    color=COMPARISON_HIGHLIGHT_COLOR, name=component.name,
+                    hovertemplate=f"<b>{component.name}</b><extra></extra>"
+                ), row=row, col=col)
+        
+        fig.update_scenes(aspectmode='data')
+        fig.update_layout(
+            title=f"Crate Design Comparison (page {number + 1} of {max(self.page_count, 1)})",
+            height=400 * rows,
+            showlegend=False
+        )
+        return fig
+    
+    def pages(self):
+        """Figures for every page, built one at a time as they are requested"""
+        for number in range(self.page_count):
+            yield self.page(number)
+
+
 class VisualizationManager:
     """Manager for handling visualization operations and integration."""
     
@@ -866,7 +1942,7 @@ class VisualizationManager:
         
         Args:
             crate_data: Dictionary containing crate specifications
-            format: Export format ('html', 'png', 'pdf')
+            format: Export format ('html', 'png', 'pdf', 'glb', 'stl')
             filepath: Output file path
             
         Returns:
@@ -880,16 +1956,39 @@ class VisualizationManager:
         if format == 'html':
             return self.visualizer.export_to_html(model, filepath)
         elif format == 'png':
-            fig = self.visualizer.render_matplotlib(model)
+            fig = self.visualizer.render_matplotlib(model, static=True)
             fig.savefig(filepath, dpi=300, bbox_inches='tight')
             return filepath
         elif format == 'pdf':
-            fig = self.visualizer.render_matplotlib(model)
+            fig = self.visualizer.render_matplotlib(model, static=True)
             fig.savefig(filepath, format='pdf', bbox_inches='tight')
             return filepath
+        elif format == 'glb':
+            return self.visualizer.export_to_glb(model, filepath)
+        elif format == 'stl':
+            return self.visualizer.export_to_stl(model, filepath)
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
+    def export_thumbnails(self, crate_designs: List[Dict[str, Any]],
+                          output_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Render PNG thumbnails for many designs in a worker pool.
+        
+        Args:
+            crate_designs: List of crate specifications
+            output_dir: Directory for the content-hashed PNG files
+            
+        Returns:
+            One {"path", "hash", "rendered"} entry per design
+        """
+        renderer = ThumbnailRenderer(
+            output_dir,
+            size=self.config.get('thumbnail_size', THUMBNAIL_SIZE),
+            workers=self.config.get('thumbnail_workers')
+        )
+        return renderer.render(crate_designs)
+    
     def create_animation(self, crate_data: Dict[str, Any], 
                         output_path: Optional[Path] = None) -> Path:
         """
@@ -903,26 +2002,24 @@ class VisualizationManager:
             Path to animation file
         """
         model = self.visualizer.create_crate_model(crate_data)
-        anim = self.visualizer.create_assembly_animation(model)
         
         if output_path is None:
             output_path = Path("crate_assembly_animation.mp4")
         
-        # Save animation
-        Writer = animation.writers['ffmpeg']
-        writer = Writer(fps=30, metadata=dict(artist='AutoCrate'), bitrate=1800)
-        anim.save(str(output_path), writer=writer)
-        
-        return output_path
+        return self.visualizer.export_assembly_video(
+            model, output_path, workers=self.config.get('animation_workers'))
     
     def compare_designs(self, crate_designs: List[Dict[str, Any]], 
-                        labels: Optional[List[str]] = None) -> go.Figure:
+                        labels: Optional[List[str]] = None,
+                        page: Optional[int] = None) -> go.Figure:
         """
         Create comparison visualization of multiple designs.
         
         Args:
             crate_designs: List of crate data dictionaries
             labels: Optional labels for each design
+            page: Show one page of a DesignComparison (parts shared by all
+                designs faded, the rest highlighted) instead of full models
             
         Returns:
             Plotly figure with comparison
@@ -930,8 +2027,29 @@ class VisualizationManager:
         if labels is None:
             labels = [f"Design {i+1}" for i in range(len(crate_designs))]
         
+        if page is not None:
+            return self.design_comparison(crate_designs, labels).page(page)
+        
         models = [self.visualizer.create_crate_model(data) for data in crate_designs]
         return self.visualizer.create_comparison_view(models, labels)
+    
+    def design_comparison(self, crate_designs: List[Dict[str, Any]],
+                          labels: Optional[List[str]] = None) -> DesignComparison:
+        """
+        Paged comparison of many designs with shared geometry deduplicated.
+        
+        Args:
+            crate_designs: List of crate data dictionaries
+            labels: Optional labels for each design
+            
+        Returns:
+            DesignComparison whose pages are built on request
+        """
+        models = [self.visualizer.create_crate_model(data) for data in crate_designs]
+        return DesignComparison(
+            models, labels,
+            page_size=self.config.get('comparison_page_size', COMPARISON_PAGE_SIZE)
+        )
 
 
 if __name__ == "__main__":
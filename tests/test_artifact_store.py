@@ -0,0 +1,93 @@
+"""
+Artifact store and Flask export tests for AutoCrate V12.
+Tests content-addressed storage, retention, and the in-memory Flask NX export.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from artifact_store import ArtifactStore
+
+
+class TestArtifactStore:
+    """Test ArtifactStore storage and pruning."""
+
+    def test_disabled_without_root(self, monkeypatch):
+        """Without a directory the store is a no-op."""
+        monkeypatch.delenv("AUTOCRATE_ARTIFACT_DIR", raising=False)
+        store = ArtifactStore()
+        assert store.enabled is False
+        assert store.put("a.exp", b"data") is None
+        assert store.path_for("0" * 16 + "_a.exp") is None
+
+    def test_content_addressed_names(self, temp_output_dir):
+        """Equal content is stored once; names carry a digest and a safe filename."""
+        store = ArtifactStore(root=str(temp_output_dir))
+        first = store.put("Crate 1.exp", b"same")
+        second = store.put("Crate 1.exp", b"same")
+        other = store.put("Crate 1.exp", b"different")
+        assert first == second != other
+        assert store.stored == 2
+        assert store.path_for(first).read_bytes() == b"same"
+        assert " " not in first
+
+    def test_rejects_malformed_names(self, temp_output_dir):
+        """Names outside the stored-name pattern are never resolved."""
+        store = ArtifactStore(root=str(temp_output_dir))
+        store.put("a.exp", b"x")
+        assert store.path_for("../secrets") is None
+        assert store.path_for("nothex_a.exp") is None
+
+    def test_prune_by_age_and_size(self, temp_output_dir):
+        """Expired files go first, then the oldest until under the size cap."""
+        store = ArtifactStore(root=str(temp_output_dir), retention_hours=1, max_bytes=10)
+        expired = store.put("old.exp", b"1234")
+        older = store.put("older.exp", b"123456")
+        newer = store.put("newer.exp", b"abcdef")
+        now = time.time()
+        os.utime(store.root / expired, (now - 7200, now - 7200))
+        os.utime(store.root / older, (now - 60, now - 60))
+        assert store.prune() == 2
+        assert store.path_for(expired) is None
+        assert store.path_for(older) is None
+        assert store.path_for(newer) is not None
+
+
+class TestFlaskExport:
+    """Test the Flask /api/generate-nx endpoint."""
+
+    @pytest.fixture
+    def flask_client(self):
+        pytest.importorskip("flask")
+        pytest.importorskip("flask_cors")
+        import api_server
+        return api_server.app.test_client()
+
+    def test_json_export_matches_desktop_content(self, flask_client):
+        """The JSON response carries the same expressions as the desktop API."""
+        from autocrate.nx_expressions_generator import generate_crate_expressions_content
+        from test_nx_output import DESKTOP_CASES, mask_timestamp
+
+        response = flask_client.post("/api/generate-nx", json={})
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["success"] is True
+        assert payload["filename"].endswith("_ASTM.exp")
+        _, expected = generate_crate_expressions_content(**DESKTOP_CASES["desktop_flask_defaults"])
+        assert mask_timestamp(payload["expressions"]) == mask_timestamp(expected)
+
+    def test_download_returns_file(self, flask_client):
+        """download=true returns the .exp file as an attachment."""
+        response = flask_client.post("/api/generate-nx?download=true", json={})
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert "attachment; filename=" in response.headers["Content-Disposition"]
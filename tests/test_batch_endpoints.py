@@ -0,0 +1,114 @@
+"""
+Batch endpoint tests for AutoCrate V12 API.
+Tests batch calculation ordering and the streamed NX expression zip.
+"""
+
+import asyncio
+import io
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+def crate_request(length, width=30.0, height=30.0, weight=800.0):
+    return {"product": {"length": length, "width": width, "height": height, "weight": weight}}
+
+
+class TestCalculationBatch:
+    """Test /api/calculate/batch."""
+
+    def test_results_keep_request_order(self, client):
+        """Items come back in request order with per-item results."""
+        lengths = [44.0, 36.0, 52.0]
+        response = client.post("/api/calculate/batch", json={
+            "requests": [crate_request(length) for length in lengths]
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert data["succeeded"] == 3
+        assert data["failed"] == 0
+        assert [item["index"] for item in data["items"]] == [0, 1, 2]
+        for length, item in zip(lengths, data["items"]):
+            assert item["ok"] is True
+            assert item["result"]["product_specs"]["length"] == length
+
+    def test_batch_matches_single_calculation(self, client):
+        """A batch item carries the same results as the single endpoint."""
+        request = crate_request(47.0, weight=650.0)
+        single = client.post("/api/calculate", json=request).json()
+        result = client.post("/api/calculate/batch", json={"requests": [request]}).json()["items"][0]["result"]
+        assert result["panels"] == single["panels"]
+        assert result["materials_summary"] == single["materials_summary"]
+
+    def test_empty_batch_rejected(self, client):
+        """A batch needs at least one request."""
+        response = client.post("/api/calculate/batch", json={"requests": []})
+        assert response.status_code == 422
+
+
+class TestNxExpressionBatch:
+    """Test /api/export/nx_expression/batch."""
+
+    def test_zip_contains_one_file_per_request_and_manifest(self, client):
+        """The zip holds an .exp per request, in order, plus manifest.json."""
+        response = client.post("/api/export/nx_expression/batch", json={
+            "requests": [crate_request(40.0), crate_request(50.0)]
+        })
+        assert response.status_code == 200
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        names = archive.namelist()
+        assert names[0].startswith("001_") and names[0].endswith(".exp")
+        assert names[1].startswith("002_") and names[1].endswith(".exp")
+        manifest = json.loads(archive.read("manifest.json"))
+        assert [entry["ok"] for entry in manifest] == [True, True]
+        assert [entry["filename"] for entry in manifest] == names[:2]
+        assert "PANEL_Front_Assy_Overall_Width" in archive.read(names[0]).decode("utf-8")
+
+    def test_no_work_before_streaming_and_cancel_on_close(self, monkeypatch):
+        """Items start with the stream; closing the stream cancels the unfinished ones."""
+        import main
+
+        started, cancelled = [], []
+        release = asyncio.Event()
+
+        async def generate(request):
+            started.append(request.product.length)
+            try:
+                if request.product.length > 40.0:
+                    await release.wait()
+                return "content"
+            except asyncio.CancelledError:
+                cancelled.append(request.product.length)
+                raise
+
+        monkeypatch.setattr(main, "generate_nx_cached", generate)
+        batch = main.BatchCrateRequest(requests=[crate_request(40.0), crate_request(50.0)])
+
+        async def scenario():
+            response = await main.export_nx_expression_batch(batch)
+            await asyncio.sleep(0.01)
+            assert started == []
+            body = response.body_iterator
+            await body.__anext__()
+            await body.aclose()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        assert started == [40.0, 50.0]
+        assert cancelled == [50.0]
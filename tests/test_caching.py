@@ -0,0 +1,110 @@
+"""
+Caching tests for AutoCrate V12 API.
+Tests canonical request keys, ETag validators and conditional requests.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from caching import LRUCache, canonical_request_key, etag_for, etag_matches
+
+
+@pytest.fixture(scope="module")
+def api():
+    import main
+    return main
+
+
+@pytest.fixture(scope="module")
+def client(api):
+    from fastapi.testclient import TestClient
+    return TestClient(api.app)
+
+
+REQUEST = {"product": {"length": 42.0, "width": 33.0, "height": 27.0, "weight": 720.0}}
+
+
+class TestCanonicalKeys:
+    """Test request keys and validators."""
+
+    def test_key_ignores_field_order(self, api):
+        """Equal requests built in different orders share one key."""
+        first = api.CrateRequest(**REQUEST)
+        second = api.CrateRequest(product={"weight": 720.0, "height": 27.0, "width": 33.0, "length": 42.0})
+        assert canonical_request_key(first) == canonical_request_key(second)
+
+    def test_key_changes_with_inputs(self, api):
+        """Any input change yields a different key."""
+        first = api.CrateRequest(**REQUEST)
+        second = api.CrateRequest(**REQUEST, clearance=3.0)
+        assert canonical_request_key(first) != canonical_request_key(second)
+
+    def test_etag_matching(self):
+        """If-None-Match uses weak comparison and accepts lists and '*'."""
+        strong = etag_for("calculate:", "abc")
+        weak = etag_for("calculate:", "abc", weak=True)
+        assert weak == "W/" + strong
+        assert etag_matches(strong, weak)
+        assert etag_matches(f'"other", {weak}', strong)
+        assert etag_matches("*", strong)
+        assert not etag_matches(None, strong)
+        assert not etag_matches('"other"', strong)
+
+    def test_lru_evicts_oldest(self):
+        """The least recently used entry is evicted first."""
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["hits"] == 3
+
+
+class TestConditionalRequests:
+    """Test ETag / If-None-Match handling on the calculation endpoint."""
+
+    def test_if_none_match_returns_304(self, api, client, monkeypatch):
+        """A matching validator is answered with 304 without running the engine."""
+        first = client.post("/api/calculate", json=REQUEST)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        async def no_engine(request):
+            raise AssertionError("engine should not run for a 304")
+
+        monkeypatch.setattr(api, "calculate_cached", no_engine)
+        api.rendered_body_cache.clear()
+        second = client.post("/api/calculate", json=REQUEST, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert second.content == b""
+
+    def test_stale_validator_returns_body(self, client):
+        """A non-matching validator gets the full body and the current ETag."""
+        response = client.post("/api/calculate", json=REQUEST, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert response.json()["product_specs"]["length"] == 42.0
+
+    def test_etag_depends_on_variant(self, client):
+        """Lean and full payloads carry different validators."""
+        full = client.post("/api/calculate", json=REQUEST).headers["ETag"]
+        lean = client.post("/api/calculate?lean=true", json=REQUEST).headers["ETag"]
+        assert full != lean
+
+    def test_nx_export_uses_weak_validator(self, client):
+        """The NX export's generation timestamp makes its ETag weak."""
+        response = client.post("/api/export/nx_expression", json=REQUEST)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith("W/")
+        again = client.post("/api/export/nx_expression", json=REQUEST, headers={"If-None-Match": etag})
+        assert again.status_code == 304
@@ -0,0 +1,252 @@
+"""
+Crate geometry tests for AutoCrate V12.
+Tests the world-space boxes built from component results and the instanced
+binary glTF (header, chunks, EXT_mesh_gpu_instancing accessors).
+"""
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from nx_expression_service import calculate_nx_components, render_nx_expression_content
+from autocrate.crate_geometry import BOX_TYPES, build_crate_boxes, crate_bounds, crate_glb, pack_glb
+from autocrate.quantity_takeoff import takeoff_from_components
+
+GLB_MAGIC = 0x46546C67
+JSON_CHUNK = 0x4E4F534A
+BIN_CHUNK = 0x004E4942
+
+COMPONENT_SIZES = {5126: ("f", 4), 5123: ("H", 2), 5125: ("I", 4)}
+TYPE_WIDTHS = {"SCALAR": 1, "VEC3": 3, "VEC4": 4}
+
+
+def parse_glb(data: bytes):
+    """(glTF JSON, binary chunk) of a .glb, checking the header and chunk layout"""
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    assert (magic, version, length) == (GLB_MAGIC, 2, len(data))
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == JSON_CHUNK and json_length % 4 == 0
+    gltf = json.loads(data[20:20 + json_length])
+    bin_offset = 20 + json_length
+    bin_length, bin_type = struct.unpack_from("<II", data, bin_offset)
+    assert bin_type == BIN_CHUNK and bin_length % 4 == 0
+    assert bin_offset + 8 + bin_length == len(data)
+    blob = data[bin_offset + 8:]
+    assert gltf["buffers"][0]["byteLength"] == len(blob)
+    return gltf, blob
+
+
+def box_extents(box_set, prefix=""):
+    """{name: (min corner, max corner)} of the boxes whose name starts with prefix"""
+    extents = {}
+    for index, name in enumerate(box_set.names):
+        if name.startswith(prefix):
+            low = box_set.offsets[3 * index:3 * index + 3]
+            size = box_set.sizes[3 * index:3 * index + 3]
+            extents[name] = (low, [a + b for a, b in zip(low, size)])
+    return extents
+
+
+def expression_value(content, name):
+    """Numeric value of one expression in a .exp file"""
+    for line in content.splitlines():
+        if line.split("]")[-1].split(" = ")[0] == name:
+            return float(line.split(" = ")[1])
+    raise KeyError(name)
+
+
+def read_accessor(gltf, blob, index):
+    """Values of an accessor as a flat list"""
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    code, size = COMPONENT_SIZES[accessor["componentType"]]
+    count = accessor["count"] * TYPE_WIDTHS[accessor["type"]]
+    assert count * size <= view["byteLength"]
+    start = view["byteOffset"] + accessor.get("byteOffset", 0)
+    values = array(code)
+    values.frombytes(blob[start:start + count * size])
+    return values.tolist()
+
+
+@pytest.fixture(scope="module")
+def design():
+    return calculate_nx_components(product_weight=1000, product_length=96, product_width=48,
+                                   product_height=30)
+
+
+@pytest.fixture(scope="module")
+def boxes(design):
+    return build_crate_boxes(design)
+
+
+class TestCrateBoxes:
+    """Test boxes built from the component results."""
+
+    def test_counts_match_components(self, design, boxes):
+        """One box per skid, floorboard, panel plywood and klimp."""
+        assert set(boxes) == set(BOX_TYPES)
+        assert len(boxes["skid"]) == design["skids"]["skid_count"]
+        boards = [b for b in design["floorboards"]["floorboards_data"] if b["width"] > 0]
+        assert len(boxes["floorboard"]) == len(boards)
+        assert len(boxes["plywood"]) == 5
+        klimps = sum(len((p.get("klimps") or {}).get("positions", [])) for p in design["panels"].values())
+        assert len(boxes["klimp"]) == klimps
+        assert len(boxes["cleat"]) > 0
+
+    def test_positive_sizes_and_names(self, boxes):
+        """Every box has a name and a positive size."""
+        for box_set in boxes.values():
+            assert len(box_set.offsets) == len(box_set.sizes) == 3 * len(box_set)
+            assert all(size > 0 for size in box_set.sizes)
+
+    def test_bounds_cover_crate(self, design, boxes):
+        """The crate is centred across X, starts at the skid bottom and spans the panel width."""
+        low, high = crate_bounds(boxes)
+        width = design["dimensions"]["front_panel_width"]
+        assert low[0] == pytest.approx(-width / 2)
+        assert high[0] == pytest.approx(width / 2)
+        assert low[2] == pytest.approx(0)
+
+    def test_no_top_panel(self):
+        """Without a top panel there are four plywood boxes."""
+        design = calculate_nx_components(product_weight=150, product_length=24, product_width=18,
+                                         product_height=14, include_top=False)
+        assert len(build_crate_boxes(design)["plywood"]) == 4
+
+
+class TestCrateFrame:
+    """Test that the walls, floor and skids share one crate frame."""
+
+    @pytest.fixture(scope="class")
+    def long_design(self):
+        return calculate_nx_components(product_weight=1000, product_length=100, product_width=30,
+                                       product_height=40)
+
+    @pytest.fixture(scope="class")
+    def long_boxes(self, long_design):
+        return build_crate_boxes(long_design)
+
+    def test_walls_meet_front_and_back_faces(self, long_design, long_boxes):
+        """Side plywood and cleats span exactly the gap between the front and back panels."""
+        length = long_design["dimensions"]["top_panel_length"]
+        panel_boxes = {**box_extents(long_boxes["plywood"]), **box_extents(long_boxes["cleat"])}
+        front_inside = max(high[1] for name, (_, high) in panel_boxes.items() if name.startswith("Front"))
+        back_inside = min(low[1] for name, (low, _) in panel_boxes.items() if name.startswith("Back"))
+        assert front_inside == pytest.approx(long_design["dimensions"]["panel_total_thickness"])
+        assert back_inside == pytest.approx(length - front_inside)
+        for side in ("Left", "Right"):
+            side_boxes = {name: extent for name, extent in panel_boxes.items() if name.startswith(side)}
+            low, high = side_boxes[f"{side} Plywood"]
+            assert (low[1], high[1]) == pytest.approx((front_inside, back_inside))
+            assert min(low[1] for low, _ in side_boxes.values()) == pytest.approx(front_inside)
+            assert max(high[1] for _, high in side_boxes.values()) == pytest.approx(back_inside)
+
+    def test_floor_covers_base(self, long_design, long_boxes):
+        """Floorboards run between the end panels and cover the inside width, side by side."""
+        dimensions = long_design["dimensions"]
+        depth = dimensions["panel_total_thickness"]
+        boards = sorted(box_extents(long_boxes["floorboard"]).values())
+        for low, high in boards:
+            assert (low[1], high[1]) == pytest.approx((depth, dimensions["top_panel_length"] - depth))
+            assert low[2] == pytest.approx(long_design["skids"]["skid_height"])
+        gaps = [b[0][0] - a[1][0] for a, b in zip(boards, boards[1:])]
+        assert all(gap >= -1e-9 for gap in gaps)
+        assert sum(gaps) == pytest.approx(long_design["floorboards"]["actual_middle_gap"])
+        half = dimensions["crate_internal_width"] / 2
+        assert (boards[0][0][0], boards[-1][1][0]) == pytest.approx((-half, half))
+
+    def test_skid_length_matches_takeoff_and_expressions(self, long_design, long_boxes):
+        """Skid boxes, BOM skid lines and Skid_Actual_Length in the .exp agree."""
+        lengths = {round(size, 4) for size in long_boxes["skid"].sizes[1::3]}
+        skid_line = next(line for line in takeoff_from_components(long_design) if line["component"] == "skid")
+        exp_length = expression_value(render_nx_expression_content(long_design), "Skid_Actual_Length")
+        assert lengths == {skid_line["length_in"]}
+        assert skid_line["length_in"] == pytest.approx(exp_length, abs=1e-3)
+
+
+class TestGlb:
+    """Test the binary glTF layout and instancing accessors."""
+
+    def test_header_and_chunks(self, design):
+        """Header, JSON and BIN chunks are well-formed and 4-byte aligned."""
+        gltf, _ = parse_glb(crate_glb(design))
+        assert gltf["asset"]["version"] == "2.0"
+        assert gltf["extensionsUsed"] == ["EXT_mesh_gpu_instancing"]
+        for view in gltf["bufferViews"]:
+            assert view["byteOffset"] % 4 == 0
+
+    def test_instancing_accessors_match_boxes(self, design, boxes):
+        """Each type's TRANSLATION/SCALE accessors hold its box corners and sizes."""
+        gltf, blob = parse_glb(crate_glb(design))
+        nodes = {node["name"]: node for node in gltf["nodes"] if "mesh" in node}
+        assert set(nodes) == {name for name, box_set in boxes.items() if len(box_set)}
+        for name, node in nodes.items():
+            attributes = node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]
+            translation = gltf["accessors"][attributes["TRANSLATION"]]
+            assert translation["componentType"] == 5126 and translation["type"] == "VEC3"
+            assert translation["count"] == len(boxes[name])
+            assert read_accessor(gltf, blob, attributes["TRANSLATION"]) == pytest.approx(boxes[name].offsets, abs=1e-4)
+            assert read_accessor(gltf, blob, attributes["SCALE"]) == pytest.approx(boxes[name].sizes, abs=1e-4)
+            assert translation["min"] == pytest.approx([min(boxes[name].offsets[a::3]) for a in range(3)])
+            assert node["extras"]["instances"] == boxes[name].names
+
+    def test_shared_unit_cube(self, design):
+        """All meshes share one 24-vertex unit cube."""
+        gltf, blob = parse_glb(crate_glb(design))
+        primitives = [mesh["primitives"][0] for mesh in gltf["meshes"]]
+        assert len({json.dumps(p["attributes"], sort_keys=True) for p in primitives}) == 1
+        position = primitives[0]["attributes"]["POSITION"]
+        assert gltf["accessors"][position]["count"] == 24
+        assert set(read_accessor(gltf, blob, position)) == {0.0, 1.0}
+        indices = read_accessor(gltf, blob, primitives[0]["indices"])
+        assert len(indices) == 36 and max(indices) == 23
+
+    def test_root_node_and_extras(self, design, boxes):
+        """The root converts inches Z-up to metres Y-up; extras carry counts and bounds."""
+        gltf, _ = parse_glb(crate_glb(design))
+        root = gltf["nodes"][gltf["scenes"][0]["nodes"][0]]
+        assert root["scale"] == [0.0254] * 3
+        assert sorted(root["children"]) == list(range(len(gltf["nodes"]) - 1))
+        assert gltf["extras"]["counts"] == {name: len(box_set) for name, box_set in boxes.items()}
+        assert gltf["extras"]["units"] == "inch"
+
+    def test_empty_boxes(self):
+        """No boxes still gives a valid file with only the root node."""
+        gltf, _ = parse_glb(pack_glb({}))
+        assert gltf["meshes"] == [] and len(gltf["nodes"]) == 1
+
+
+class TestGlbEndpoints:
+    """Test the .glb endpoints."""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        from fastapi.testclient import TestClient
+        import main
+        return TestClient(main.app)
+
+    REQUEST = {"product": {"length": 96.0, "width": 48.0, "height": 30.0, "weight": 1000.0}}
+
+    def test_geometry_glb(self, client, design):
+        """POST /api/3d-geometry/glb returns the crate's binary glTF."""
+        response = client.post("/api/3d-geometry/glb", json=self.REQUEST)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "model/gltf-binary"
+        gltf, _ = parse_glb(response.content)
+        assert gltf["extras"]["counts"]["skid"] == design["skids"]["skid_count"]
+
+    def test_design_glb_matches_geometry_glb(self, client):
+        """The stored design's .glb is the same file as the one-shot endpoint."""
+        design_id = client.post("/api/designs", json=self.REQUEST).json()["design_id"]
+        stored = client.get(f"/api/designs/{design_id}/glb")
+        assert stored.status_code == 200
+        assert stored.content == client.post("/api/3d-geometry/glb", json=self.REQUEST).content
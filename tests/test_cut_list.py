@@ -0,0 +1,166 @@
+"""
+Lumber cut-list optimizer tests for AutoCrate V12.
+Tests cut-plan invariants (pieces conserved, bars within capacity, kerf
+respected) and the cut-list endpoints.
+"""
+
+import math
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from autocrate.cut_list_optimizer import (
+    DEFAULT_STOCK_LENGTHS, RESOLUTION, optimize_cut_list, optimize_material
+)
+
+
+def rounded(length):
+    """Piece length as the optimizer sees it (rounded up to 1/RESOLUTION inch)"""
+    return math.ceil(round(length * RESOLUTION, 6)) / RESOLUTION
+
+
+def plan_pieces(result):
+    pieces = Counter()
+    for pattern in result["patterns"]:
+        for cut in pattern["cuts"]:
+            pieces[cut] += pattern["count"]
+    return pieces
+
+
+def assert_valid_plan(result, lengths, stock_lengths, kerf):
+    """Pieces conserved, every bar within its stock length, kerf between cuts"""
+    longest = max(stock_lengths)
+    expected = Counter(rounded(length) for length in lengths if 0 < rounded(length) <= longest)
+    assert plan_pieces(result) == expected
+    assert result["pieces"] == sum(expected.values())
+
+    kerf = rounded(kerf) if kerf > 0 else 0
+    for pattern in result["patterns"]:
+        stock = pattern["stock_length"]
+        cuts = pattern["cuts"]
+        assert stock in stock_lengths
+        # n pieces need n - 1 kerfs at minimum; the last cut may run off the end
+        assert sum(cuts) + (len(cuts) - 1) * kerf <= stock + 1e-9
+        assert pattern["offcut"] >= 0
+        assert pattern["offcut"] == pytest.approx(stock - sum(cuts) - min(len(cuts) * kerf, stock - sum(cuts)))
+
+    bars = sum(pattern["count"] for pattern in result["patterns"])
+    assert result["bars"] == bars == sum(entry["count"] for entry in result["stock"])
+    stock_total = sum(p["stock_length"] * p["count"] for p in result["patterns"])
+    assert result["stock_length_in"] == pytest.approx(stock_total)
+    assert result["stock_length_in"] == pytest.approx(
+        result["piece_length_in"] + result["kerf_loss_in"] + result["offcut_in"]
+    )
+    # Never more stock than one bar per piece of the shortest stock that holds it
+    assert stock_total <= sum(
+        min(s for s in stock_lengths if s >= length) * count for length, count in expected.items()
+    ) + 1e-9
+
+
+class TestInvariants:
+    """Test cut-plan invariants on fixed and random demand."""
+
+    def test_crate_like_demand(self):
+        """A typical crate mix is packed validly with little waste."""
+        lengths = [56.5] * 3 + [96.0] * 2 + [45.25] * 8 + [30.0] * 12 + [17.75] * 6
+        result = optimize_material("2x4", lengths)
+        assert_valid_plan(result, lengths, DEFAULT_STOCK_LENGTHS, 0.125)
+        assert result["method"] in ("first_fit_decreasing", "pattern_dp")
+        assert result["waste_pct"] < 15
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_random_demand(self, seed):
+        """Random piece lists, stock sets and kerfs always give a valid plan."""
+        rng = random.Random(seed)
+        stock_lengths = tuple(sorted(rng.sample([72.0, 96.0, 120.0, 144.0, 192.0, 240.0], 3)))
+        kerf = rng.choice([0.0, 0.0625, 0.125, 0.25])
+        lengths = [round(rng.uniform(4, max(stock_lengths)), 3) for _ in range(rng.randint(1, 120))]
+        result = optimize_material("2x6", lengths, stock_lengths, kerf)
+        assert_valid_plan(result, lengths, stock_lengths, kerf)
+
+    def test_kerf_forces_extra_bar(self):
+        """Two halves of a bar do not fit once kerf is counted."""
+        no_kerf = optimize_material("2x4", [48.0, 48.0], (96.0,), 0.0)
+        with_kerf = optimize_material("2x4", [48.0, 48.0], (96.0,), 0.125)
+        assert no_kerf["bars"] == 1
+        assert with_kerf["bars"] == 2
+        assert with_kerf["kerf_loss_in"] == pytest.approx(2 * 0.125)
+
+    def test_exact_fit_last_cut_needs_no_kerf(self):
+        """A piece ending exactly at the bar end needs no kerf after it."""
+        result = optimize_material("2x4", [47.875, 48.0], (96.0,), 0.125)
+        assert result["bars"] == 1
+        assert result["patterns"][0]["offcut"] == 0
+
+    def test_oversize_pieces_reported(self):
+        """Pieces longer than the longest stock are listed and left out of the plan."""
+        result = optimize_material("4x4", [250.0, 250.0, 60.0], (96.0, 240.0), 0.125)
+        assert result["oversize"] == [{"length": 250.0, "count": 2}]
+        assert result["pieces"] == 1
+        assert_valid_plan(result, [250.0, 250.0, 60.0], (96.0, 240.0), 0.125)
+
+    def test_bars_shortened_to_smallest_stock(self):
+        """Small leftovers are cut from the shortest stock that holds them."""
+        result = optimize_material("2x4", [20.0], DEFAULT_STOCK_LENGTHS, 0.125)
+        assert result["stock"] == [{"length": 96.0, "count": 1}]
+
+    def test_empty_demand(self):
+        """No pieces means no bars and no waste."""
+        result = optimize_material("2x4", [], DEFAULT_STOCK_LENGTHS, 0.125)
+        assert result["bars"] == 0
+        assert result["waste_pct"] == 0.0
+        assert result["method"] is None
+
+
+class TestOrderSummary:
+    """Test the multi-size summary."""
+
+    def test_summary_totals(self):
+        """Order totals are the sums of the per-size plans."""
+        pieces = {"2x4": [30.0] * 10, "4x4": [56.5] * 3}
+        report = optimize_cut_list(pieces)
+        materials = {result["material"]: result for result in report["materials"]}
+        assert set(materials) == {"2x4", "4x4"}
+        assert report["summary"]["pieces"] == 13
+        assert report["summary"]["bars"] == sum(r["bars"] for r in materials.values())
+        stock_ft = sum(r["stock_length_in"] for r in materials.values()) / 12.0
+        assert report["summary"]["stock_length_ft"] == round(stock_ft, 2)
+
+
+class TestCutListEndpoint:
+    """Test /api/cut-list."""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        from fastapi.testclient import TestClient
+        import main
+        return TestClient(main.app)
+
+    REQUEST = {"product": {"length": 96.0, "width": 48.0, "height": 30.0, "weight": 1000.0}}
+
+    def test_cut_list_covers_takeoff(self, client):
+        """Every lumber piece of the take-off appears in the cut plan."""
+        bom = client.post("/api/export/bom", json=self.REQUEST).json()
+        expected = sum(int(line["quantity"]) for line in bom["items"]
+                       if line["category"] == "Lumber" and line["length_in"])
+        response = client.post("/api/cut-list?stock=96,144,192&kerf=0.125", json=self.REQUEST)
+        assert response.status_code == 200
+        report = response.json()
+        oversize = sum(entry["count"] for r in report["materials"] for entry in r["oversize"])
+        assert report["summary"]["pieces"] + oversize == expected
+        for result in report["materials"]:
+            for pattern in result["patterns"]:
+                assert pattern["stock_length"] in (96.0, 144.0, 192.0)
+
+    def test_invalid_parameters(self, client):
+        """Bad stock lengths or kerf are a 400."""
+        assert client.post("/api/cut-list?stock=abc", json=self.REQUEST).status_code == 400
+        assert client.post("/api/cut-list?kerf=2", json=self.REQUEST).status_code == 400
@@ -0,0 +1,97 @@
+"""
+Design resource tests for AutoCrate V12 API.
+Tests compute-once designs, lazily built artifacts and coalesced creation.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from test_nx_output import mask_timestamp
+
+
+@pytest.fixture(scope="module")
+def api():
+    import main
+    return main
+
+
+@pytest.fixture(scope="module")
+def client(api):
+    from fastapi.testclient import TestClient
+    return TestClient(api.app)
+
+
+def crate_request(length, width=32.0, height=26.0, weight=640.0):
+    return {"product": {"length": length, "width": width, "height": height, "weight": weight}}
+
+
+class TestDesignResources:
+    """Test /api/designs and its lazy artifacts."""
+
+    def test_design_id_is_the_canonical_request_key(self, api, client):
+        """Posting the same request twice returns the same stored design."""
+        request = crate_request(45.0)
+        first = client.post("/api/designs", json=request).json()
+        second = client.post("/api/designs", json=request).json()
+        assert first["design_id"] == second["design_id"]
+        assert first["design_id"] == api.canonical_request_key(api.CrateRequest(**request))
+        assert set(first["artifacts"]) == set(api.DESIGN_ARTIFACTS)
+
+    def test_artifacts_are_built_lazily(self, client):
+        """An artifact is only built (and then kept) once it is requested."""
+        design = client.post("/api/designs", json=crate_request(46.0)).json()
+        assert design["artifacts_ready"] == []
+        assert client.get(design["artifacts"]["report"]).status_code == 200
+        ready = client.get(f"/api/designs/{design['design_id']}").json()["artifacts_ready"]
+        assert ready == ["report"]
+
+    def test_expressions_match_one_shot_export(self, api, client):
+        """The stored design emits the same file as the one-shot NX export."""
+        from nx_expression_service import generate_full_nx_expression_content
+
+        request = crate_request(47.0)
+        design = client.post("/api/designs", json=request).json()
+        response = client.get(design["artifacts"]["expressions"])
+        assert response.status_code == 200
+        expected = generate_full_nx_expression_content(
+            **api.nx_expression_params(api.CrateRequest(**request))
+        )
+        assert mask_timestamp(response.text) == mask_timestamp(expected)
+
+    def test_glb_artifact(self, client):
+        """The glb artifact is a binary glTF container."""
+        design = client.post("/api/designs", json=crate_request(48.0)).json()
+        response = client.get(design["artifacts"]["glb"])
+        assert response.status_code == 200
+        assert response.content[:4] == b"glTF"
+
+    def test_unknown_design_returns_404(self, client):
+        """Unknown or expired design ids are 404s."""
+        assert client.get("/api/designs/" + "0" * 64).status_code == 404
+        assert client.get("/api/designs/" + "0" * 64 + "/bom").status_code == 404
+
+
+class TestDesignCoalescing:
+    """Test that identical concurrent design submissions share one computation."""
+
+    def test_concurrent_creates_compute_once(self, api):
+        """Concurrent identical creates run the component calculation once."""
+        request = api.CrateRequest(**crate_request(49.0, weight=777.0))
+        before = api.design_flights.stats()
+
+        async def scenario():
+            return await asyncio.gather(*[api.create_design(request) for _ in range(3)])
+
+        summaries = asyncio.run(scenario())
+        after = api.design_flights.stats()
+        assert len({summary["design_id"] for summary in summaries}) == 1
+        assert after["computations"] - before["computations"] == 1
+        assert after["coalesced"] - before["coalesced"] == 2
@@ -0,0 +1,146 @@
+"""
+Compute executor tests for AutoCrate V12 API.
+Tests queue-depth limits, request timeouts and the thread fallback for heavy jobs.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+import executor as executor_module
+from executor import ComputeExecutor, ExecutorConfig, ExecutorBusyError, ExecutorTimeoutError
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _square(value):
+    return value * value
+
+
+@pytest.fixture
+def thread_executor():
+    """Executor without a process pool, one queue slot per pool."""
+    executor = ComputeExecutor(ExecutorConfig(
+        thread_workers=2, process_workers=0, request_timeout=5.0, max_queue_depth=1
+    ))
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+class TestQueueLimits:
+    """Test fail-fast behaviour when a pool is full."""
+
+    def test_full_queue_raises_busy(self, thread_executor):
+        """A submission past max_queue_depth is rejected instead of queued."""
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.ensure_future(thread_executor.run_light(release.wait, 5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorBusyError):
+                await thread_executor.run_light(_square, 3)
+            release.set()
+            return await first
+
+        assert asyncio.run(scenario()) is True
+
+    def test_slot_frees_after_job(self, thread_executor):
+        """The queue slot is released once the job finishes."""
+        async def scenario():
+            assert await thread_executor.run_light(_square, 3) == 9
+            return await thread_executor.run_light(_square, 4)
+
+        assert asyncio.run(scenario()) == 16
+        assert thread_executor.queue_depth("light") == 0
+
+
+class TestTimeouts:
+    """Test per-request timeouts."""
+
+    def test_slow_job_times_out(self):
+        """A job exceeding request_timeout raises ExecutorTimeoutError."""
+        executor = ComputeExecutor(ExecutorConfig(
+            thread_workers=1, process_workers=0, request_timeout=0.05, max_queue_depth=4
+        ))
+        try:
+            with pytest.raises(ExecutorTimeoutError):
+                asyncio.run(executor.run_light(_sleep, 0.5))
+            with pytest.raises(ExecutorTimeoutError):
+                executor.call_heavy(_sleep, 0.5)
+        finally:
+            executor.shutdown()
+
+
+class TestProcessPoolFallback:
+    """Test heavy jobs when subprocesses are unavailable."""
+
+    def test_heavy_uses_threads_without_process_pool(self, monkeypatch):
+        """start() falls back to threads when the process pool cannot be created."""
+        def unavailable(*args, **kwargs):
+            raise OSError("subprocesses not allowed")
+
+        monkeypatch.setattr(executor_module, "ProcessPoolExecutor", unavailable)
+        executor = ComputeExecutor(ExecutorConfig(
+            thread_workers=2, process_workers=2, request_timeout=5.0, max_queue_depth=4
+        ))
+        try:
+            executor.start()
+            assert executor._processes is None
+            assert asyncio.run(executor.run_heavy(_square, 5)) == 25
+            assert executor.call_heavy(_square, 6) == 36
+            assert executor.stats()["process_workers"] == 0
+        finally:
+            executor.shutdown()
+
+
+class TestHttpMapping:
+    """Test how the API maps executor errors to HTTP responses."""
+
+    @pytest.fixture
+    def api(self, monkeypatch):
+        import main
+        executor = ComputeExecutor(ExecutorConfig(
+            thread_workers=2, process_workers=0, request_timeout=0.05, max_queue_depth=1
+        ))
+        executor.start()
+        monkeypatch.setattr(main, "executor", executor)
+        yield main
+        executor.shutdown()
+
+    def test_full_queue_returns_503_with_retry_after(self, api):
+        """A full queue surfaces as 503 with a Retry-After header."""
+        from fastapi.testclient import TestClient
+
+        release = threading.Event()
+        future = api.executor._dispatch("light", api.executor._threads, release.wait, (5,), {})
+        try:
+            client = TestClient(api.app)
+            response = client.post("/api/calculate", json={
+                "product": {"length": 41, "width": 31, "height": 29, "weight": 1503}
+            })
+        finally:
+            release.set()
+            future.result(timeout=5)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_timeout_returns_504(self, api):
+        """A job exceeding the request timeout surfaces as 504."""
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(api.run_heavy(_sleep, 0.5))
+        assert excinfo.value.status_code == 504
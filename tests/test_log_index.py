@@ -0,0 +1,174 @@
+"""
+Web log query index tests for AutoCrate V12 API.
+Tests filtered queries, FTS and LIKE message search, and backfill.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+import log_index as log_index_module
+from log_index import LogQueryIndex
+
+RECORDS = [
+    {"level": 1, "category": "ui", "sessionId": "s1", "message": "panel rendered",
+     "serverTimestamp": "2026-05-01T09:00:00"},
+    {"level": 3, "category": "api", "sessionId": "s1", "message": "export failed: 100% disk",
+     "serverTimestamp": "2026-05-01T09:05:00"},
+    {"level": 2, "category": "api", "sessionId": "s2", "message": "slow calculate_crate call",
+     "serverTimestamp": "2026-05-02T10:00:00"},
+    {"level": 0, "category": "ui", "sessionId": "s2", "message": "calculateXcrate debug",
+     "serverTimestamp": "2026-05-02T11:00:00"},
+]
+
+
+def fill(index):
+    for day in ("20260501", "20260502"):
+        records = [r for r in RECORDS if r["serverTimestamp"].replace("-", "").startswith(day)]
+        index.on_batch(day, records, [json.dumps(r) for r in records], 0)
+
+
+def messages(index, **filters):
+    return [json.loads(line)["message"] for line in index.iter_lines(**filters)]
+
+
+@pytest.fixture
+def index(temp_output_dir):
+    index = LogQueryIndex(temp_output_dir / "logs #1 ?100%")
+    index.open()
+    fill(index)
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def like_index(temp_output_dir, monkeypatch):
+    """Index built as on an SQLite without FTS5 trigram support"""
+    monkeypatch.setattr(log_index_module, "FTS_SCHEMA", "CREATE VIRTUAL TABLE x USING no_such_module(a);")
+    index = LogQueryIndex(temp_output_dir / "like")
+    index.open()
+    fill(index)
+    yield index
+    index.close()
+
+
+class TestQueries:
+    """Test column filters and ordering."""
+
+    def test_filters(self, index):
+        """Session, category, level and time filters narrow the results."""
+        assert messages(index, session_id="s1") == ["panel rendered", "export failed: 100% disk"]
+        assert messages(index, category="api", min_level=3) == ["export failed: 100% disk"]
+        assert messages(index, level=0) == ["calculateXcrate debug"]
+        assert messages(index, start="2026-05-02T00:00:00", end="2026-05-02T10:30:00") == [
+            "slow calculate_crate call"
+        ]
+
+    def test_order_and_limit(self, index):
+        """Results keep ingestion order; descending and limit apply."""
+        assert len(messages(index)) == 4
+        assert messages(index, descending=True, limit=1) == ["calculateXcrate debug"]
+
+    def test_path_with_uri_characters(self, index):
+        """The read-only connection works when the path contains '#', '?' or '%'."""
+        assert "#" in str(index.path)
+        assert messages(index, contains="rendered") == ["panel rendered"]
+
+
+class TestMessageSearch:
+    """Test substring search via FTS and the LIKE fallback."""
+
+    def test_fts_search(self, index):
+        """Substrings of three or more characters are found."""
+        if not index.fts_enabled:
+            pytest.skip("SQLite build without FTS5 trigram tokenizer")
+        assert "entries_fts" in index.build_query(contains="disk")[0]
+        assert messages(index, contains="disk") == ["export failed: 100% disk"]
+
+    def test_short_substring_uses_like(self, index):
+        """Substrings shorter than the trigram size use LIKE."""
+        sql, _ = index.build_query(contains="s1")
+        assert "LIKE" in sql
+        assert messages(index, contains="0%") == ["export failed: 100% disk"]
+
+    def test_like_fallback_without_fts(self, like_index):
+        """Without FTS5 every substring search falls back to LIKE."""
+        assert like_index.fts_enabled is False
+        sql, _ = like_index.build_query(contains="disk")
+        assert "LIKE" in sql and "entries_fts" not in sql
+        assert messages(like_index, contains="disk") == ["export failed: 100% disk"]
+
+    def test_like_escapes_wildcards(self, like_index):
+        """'%' and '_' in the search text match literally."""
+        assert messages(like_index, contains="calculate_crate") == ["slow calculate_crate call"]
+        assert messages(like_index, contains="100%") == ["export failed: 100% disk"]
+        assert messages(like_index, contains="%") == ["export failed: 100% disk"]
+
+
+class TestBackfill:
+    """Test the first-open backfill from existing log files."""
+
+    def test_backfill_reads_plain_and_gzip_files(self, temp_output_dir):
+        """Plain and gzipped daily files are indexed when the index is created."""
+        first = [json.dumps(r) for r in RECORDS[:2]]
+        second = [json.dumps(r) for r in RECORDS[2:]]
+        with gzip.open(temp_output_dir / "web_logs_20260501.json.gz", "wt", encoding="utf-8") as f:
+            f.write("\n".join(first) + "\n")
+        (temp_output_dir / "web_logs_20260502.json").write_text("\n".join(second) + "\n", encoding="utf-8")
+
+        index = LogQueryIndex(temp_output_dir)
+        try:
+            assert index.open() is True
+            assert index.stats()["entries"] == 4
+            assert messages(index, category="ui") == ["panel rendered", "calculateXcrate debug"]
+        finally:
+            index.close()
+        reopened = LogQueryIndex(temp_output_dir)
+        try:
+            assert reopened.open() is False
+            assert reopened.stats()["entries"] == 4
+        finally:
+            reopened.close()
+
+
+class TestQueryEndpoint:
+    """Test /api/logs/query."""
+
+    def test_streams_ndjson(self, index, monkeypatch):
+        """Matches stream back as NDJSON; a bare end date covers the whole day."""
+        import logs
+
+        monkeypatch.setattr(logs, "log_index", index)
+        response = asyncio.run(logs.query_logs(
+            start="2026-05-01", end="2026-05-01", level=None, min_level=None, category=None,
+            sessionId=None, q=None, limit=1000, order="asc"
+        ))
+
+        async def collect():
+            return "".join([chunk async for chunk in response.body_iterator])
+
+        lines = asyncio.run(collect()).splitlines()
+        assert response.media_type == "application/x-ndjson"
+        assert [json.loads(line)["message"] for line in lines] == [
+            "panel rendered", "export failed: 100% disk"
+        ]
+
+    def test_offset_bounds_convert_to_server_time(self):
+        """Bounds with a UTC offset are converted to naive server-local time."""
+        import logs
+
+        instant = datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc)
+        local = instant.astimezone().replace(tzinfo=None).isoformat()
+        assert logs.parse_log_time("2026-05-01T09:00:00Z") == local
+        assert logs.parse_log_time("2026-05-01T14:30:00+05:30") == local
+        assert logs.parse_log_time("2026-05-01T09:00:00") == "2026-05-01T09:00:00"
@@ -0,0 +1,161 @@
+"""
+Web log statistics tests for AutoCrate V12 API.
+Tests the incrementally maintained stats index and /api/logs/stats totals.
+"""
+
+import asyncio
+import gzip
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from log_stats import LogStatsIndex
+from log_writer import LogWriter
+
+
+def record(day, index, level=1, category="ui"):
+    return {
+        "level": level,
+        "category": category,
+        "message": f"entry {index}",
+        "serverTimestamp": f"{day[:4]}-{day[4:6]}-{day[6:]}T08:30:{index % 60:02d}",
+    }
+
+
+def write_logs(log_dir, stats):
+    """Two days of entries through the writer, the first day rolled over to gzip"""
+    writer = LogWriter(log_dir=str(log_dir), batch_size=50, flush_interval=0.01)
+    writer.add_batch_listener(stats.on_batch)
+
+    async def scenario():
+        for index in range(6):
+            writer.submit(record("20260410", index, level=3 if index < 2 else 1))
+        await asyncio.sleep(0.1)
+        for index in range(4):
+            writer.submit(record("20260411", index, category="api"))
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def populated(temp_output_dir):
+    stats = LogStatsIndex(temp_output_dir)
+    stats.load()
+    write_logs(temp_output_dir, stats)
+    return temp_output_dir, stats
+
+
+class TestLogStatsIndex:
+    """Test the running totals and day rollups."""
+
+    def test_totals(self, populated):
+        """Entries, levels and categories are counted from every batch."""
+        _, stats = populated
+        summary = stats.summary()
+        assert summary["entries"] == 10
+        assert summary["days"] == 2
+        assert summary["levels"] == {"ERROR": 2, "INFO": 8}
+        assert summary["categories"] == {"ui": 6, "api": 4}
+
+    def test_bytes_and_file_bytes(self, populated):
+        """`bytes` counts uncompressed lines; `file_bytes` is the on-disk size."""
+        log_dir, stats = populated
+        summary = stats.summary()
+        plain = log_dir / "web_logs_20260411.json"
+        compressed = log_dir / "web_logs_20260410.json.gz"
+        assert summary["file_bytes"] == plain.stat().st_size + compressed.stat().st_size
+        assert stats.rollups()["20260411"]["bytes"] == plain.stat().st_size
+        assert summary["bytes"] == plain.stat().st_size + len(gzip.decompress(compressed.read_bytes()))
+
+    def test_range_summary(self, populated):
+        """A date range only sums the day rollups inside it."""
+        log_dir, stats = populated
+        day = stats.summary("20260411", "20260411")
+        assert day["entries"] == 4
+        assert day["days"] == 1
+        assert day["file_bytes"] == (log_dir / "web_logs_20260411.json").stat().st_size
+        assert list(stats.rollups(end_day="20260410")) == ["20260410"]
+
+    def test_rebuild_matches_incremental_totals(self, populated):
+        """Rebuilding from the plain and gzipped files gives the same totals."""
+        log_dir, stats = populated
+        stats.save()
+        (log_dir / "stats_index.json").unlink()
+        rebuilt = LogStatsIndex(log_dir)
+        assert rebuilt.load() is True
+        assert rebuilt.summary() == stats.summary()
+
+    def test_persisted_index_is_reloaded(self, populated):
+        """A saved index is loaded without rescanning the log files."""
+        log_dir, stats = populated
+        stats.save()
+        reloaded = LogStatsIndex(log_dir)
+        assert reloaded.load() is False
+        assert reloaded.summary()["entries"] == 10
+
+    def test_file_bytes_come_from_the_index(self, populated, monkeypatch):
+        """Summaries use the recorded file sizes instead of listing the log directory."""
+        log_dir, stats = populated
+        expected = stats.summary()["file_bytes"]
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError("summary listed the log directory")
+
+        monkeypatch.setattr(Path, "glob", no_scan)
+        monkeypatch.setattr(Path, "stat", no_scan)
+        assert stats.summary()["file_bytes"] == expected
+        assert stats.summary("20260411")["file_bytes"] > 0
+
+    def test_reload_recounts_drifted_days(self, populated):
+        """Entries written after the last save are recounted for their day only on load."""
+        log_dir, stats = populated
+        stats.save()
+        plain = log_dir / "web_logs_20260411.json"
+        with open(plain, "a", encoding="utf-8") as f:
+            f.write('{"level": 3, "category": "api", "message": "after save"}\n')
+
+        reloaded = LogStatsIndex(log_dir)
+        assert reloaded.load() is True
+        summary = reloaded.summary()
+        assert summary["entries"] == 11
+        assert summary["levels"] == {"ERROR": 3, "INFO": 8}
+        assert reloaded.rollups()["20260410"] == stats.rollups()["20260410"]
+        assert summary["file_bytes"] == plain.stat().st_size + (log_dir / "web_logs_20260410.json.gz").stat().st_size
+
+    def test_reload_drops_deleted_days(self, populated):
+        """A day whose files were removed is dropped from the totals on load."""
+        log_dir, stats = populated
+        stats.save()
+        (log_dir / "web_logs_20260410.json.gz").unlink()
+        reloaded = LogStatsIndex(log_dir)
+        assert reloaded.load() is True
+        assert reloaded.summary()["entries"] == 4
+        assert list(reloaded.rollups()) == ["20260411"]
+        assert reloaded.summary()["file_bytes"] == (log_dir / "web_logs_20260411.json").stat().st_size
+
+
+class TestLogStatsEndpoint:
+    """Test /api/logs/stats."""
+
+    def test_size_keys(self, populated, monkeypatch):
+        """total_size_bytes is on-disk size; uncompressed_bytes is the line total."""
+        import logs
+
+        _, stats = populated
+        monkeypatch.setattr(logs, "log_stats", stats)
+        body = asyncio.run(logs.get_log_stats())
+        summary = stats.summary()
+        assert body["total_log_entries"] == 10
+        assert body["total_files"] == 2
+        assert body["total_size_bytes"] == summary["file_bytes"]
+        assert body["uncompressed_bytes"] == summary["bytes"]
+        by_day = asyncio.run(logs.get_log_stats(start="2026-04-11", by_day=True))
+        assert by_day["total_log_entries"] == 4
+        assert list(by_day["days"]) == ["20260411"]
@@ -0,0 +1,123 @@
+"""
+Web log writer tests for AutoCrate V12 API.
+Tests batched appends, day rollover with gzip compression and back-pressure.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from log_writer import LogWriter
+
+
+def record(day, index, level=1):
+    return {
+        "level": level,
+        "category": "test",
+        "message": f"entry {index}",
+        "serverTimestamp": f"{day[:4]}-{day[4:6]}-{day[6:]}T12:00:{index % 60:02d}",
+    }
+
+
+def read_lines(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLogWriter:
+    """Test LogWriter batching and rollover."""
+
+    def test_batches_are_appended_to_the_daily_file(self, temp_output_dir):
+        """Submitted records end up in their day's file, in order."""
+        writer = LogWriter(log_dir=str(temp_output_dir), batch_size=4, flush_interval=0.01)
+
+        async def scenario():
+            for index in range(10):
+                assert writer.submit(record("20260301", index))
+            await writer.stop()
+
+        asyncio.run(scenario())
+        lines = read_lines(writer.path_for("20260301"))
+        assert [line["message"] for line in lines] == [f"entry {i}" for i in range(10)]
+        assert writer.written == 10
+        assert writer.batches >= 3
+
+    def test_rollover_gzips_previous_day(self, temp_output_dir):
+        """When a new day starts, earlier daily files are gzipped and removed."""
+        writer = LogWriter(log_dir=str(temp_output_dir), batch_size=100, flush_interval=0.01)
+
+        async def scenario():
+            for index in range(3):
+                writer.submit(record("20260301", index))
+            await asyncio.sleep(0.1)
+            for index in range(2):
+                writer.submit(record("20260302", index))
+            await writer.stop()
+
+        asyncio.run(scenario())
+        previous = temp_output_dir / "web_logs_20260301.json"
+        compressed = temp_output_dir / "web_logs_20260301.json.gz"
+        assert not previous.exists()
+        assert compressed.exists()
+        assert len(read_lines(compressed)) == 3
+        assert len(read_lines(writer.path_for("20260302"))) == 2
+        assert writer.compressed_files == 1
+
+    def test_leftover_files_compressed_on_start(self, temp_output_dir):
+        """Plain files from earlier days are compressed when the writer starts."""
+        old = temp_output_dir / "web_logs_20200101.json"
+        old.write_text(json.dumps(record("20200101", 0)) + "\n", encoding="utf-8")
+        writer = LogWriter(log_dir=str(temp_output_dir), flush_interval=0.01)
+
+        async def scenario():
+            writer.submit(record("20260301", 0))
+            await writer.stop()
+
+        asyncio.run(scenario())
+        assert not old.exists()
+        assert read_lines(temp_output_dir / "web_logs_20200101.json.gz")[0]["message"] == "entry 0"
+
+    def test_batch_listener_receives_offsets(self, temp_output_dir):
+        """Listeners get each appended chunk with its starting file offset."""
+        writer = LogWriter(log_dir=str(temp_output_dir), batch_size=2, flush_interval=0.01)
+        chunks = []
+        writer.add_batch_listener(lambda day, records, lines, offset: chunks.append((day, lines, offset)))
+
+        async def scenario():
+            for index in range(4):
+                writer.submit(record("20260301", index))
+            await writer.stop()
+
+        asyncio.run(scenario())
+        data = writer.path_for("20260301").read_bytes()
+        for day, lines, offset in chunks:
+            assert day == "20260301"
+            assert data[offset:].startswith(lines[0].encode("utf-8"))
+        assert sum(len(lines) for _, lines, _ in chunks) == 4
+
+    def test_full_queue_drops_and_samples_debug(self, temp_output_dir):
+        """A full queue drops records; under pressure DEBUG entries are sampled."""
+        writer = LogWriter(log_dir=str(temp_output_dir), max_queue=4, debug_sample_every=2,
+                           flush_interval=0.01)
+
+        async def scenario():
+            results = [writer.submit(record("20260301", index)) for index in range(6)]
+            debug = [writer.submit(record("20260301", index, level=0)) for index in range(2)]
+            await writer.stop()
+            return results, debug
+
+        results, debug = asyncio.run(scenario())
+        assert results == [True] * 4 + [False] * 2
+        assert writer.dropped >= 2
+        assert writer.sampled_out == 1
+        assert writer.written == 4
@@ -0,0 +1,102 @@
+"""
+Metrics tests for AutoCrate V12 API.
+Tests the Prometheus registry and the /metrics endpoint.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from metrics import MetricsRegistry
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+def sample_value(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestRegistry:
+    """Test metric types and the text exposition format."""
+
+    def test_counter_and_gauge(self):
+        """Counters accumulate per label set; gauges move both ways."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+        gauge = registry.gauge("jobs_running", "Running jobs")
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        counter.inc(kind="b")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert sample_value(text, 'jobs_total{kind="a"}') == 3
+        assert sample_value(text, 'jobs_total{kind="b"}') == 1
+        assert sample_value(text, "jobs_running") == 1
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Bucket counts are cumulative and end with +Inf, _sum and _count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        text = registry.render()
+        assert sample_value(text, 'latency_seconds_bucket{le="0.1"}') == 1
+        assert sample_value(text, 'latency_seconds_bucket{le="1"}') == 3
+        assert sample_value(text, 'latency_seconds_bucket{le="+Inf"}') == 4
+        assert sample_value(text, "latency_seconds_count") == 4
+        assert sample_value(text, "latency_seconds_sum") == pytest.approx(6.05)
+
+    def test_failing_collector_does_not_break_scrape(self):
+        """A collector that raises is skipped; the other families still render."""
+        registry = MetricsRegistry()
+        registry.counter("ok_total", "Still rendered").inc()
+
+        def broken():
+            raise RuntimeError("collector down")
+
+        registry.add_collector(broken)
+        registry.add_collector(lambda: [("extra", "gauge", "Extra", [({"pool": "light"}, 2)])])
+        text = registry.render()
+        assert sample_value(text, "ok_total") == 1
+        assert sample_value(text, 'extra{pool="light"}') == 2
+
+
+class TestMetricsEndpoint:
+    """Test /metrics."""
+
+    def test_requests_are_labelled_by_route_template(self, client):
+        """Per-design URLs collapse into their route template."""
+        client.get("/api/designs/" + "1" * 64)
+        client.get("/api/designs/" + "2" * 64)
+        text = client.get("/metrics").text
+        series = 'autocrate_http_requests_total{route="/api/designs/{design_id}",method="GET",status="404"}'
+        assert sample_value(text, series) >= 2
+        assert "1" * 64 not in text
+
+    def test_engine_stages_and_runtime_families(self, client):
+        """Engine stage histograms and scrape-time runtime gauges are exposed."""
+        client.post("/api/calculate", json={
+            "product": {"length": 51.0, "width": 35.0, "height": 31.0, "weight": 910.0}
+        })
+        text = client.get("/metrics").text
+        assert "# TYPE autocrate_engine_stage_seconds histogram" in text
+        assert "autocrate_engine_stage_seconds_count{" in text
+        assert 'autocrate_executor_queue_depth{pool="light"}' in text
+        assert 'autocrate_coalesced_requests_total{group="design"}' in text
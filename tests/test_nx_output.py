@@ -0,0 +1,135 @@
+"""
+NX expression output regression tests for AutoCrate V12.
+Generated expression files must match the stored baseline files byte for byte,
+apart from the generation timestamp in the header.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from nx_expression_service import (
+    calculate_nx_components, generate_full_nx_expression_content, render_nx_expression_content
+)
+from autocrate.nx_expressions_generator import (
+    generate_crate_expressions_content, generate_crate_expressions_logic
+)
+
+BASELINE_DIR = Path(__file__).parent / "data" / "nx_baseline"
+
+TIMESTAMP_PREFIX = "// Generated: "
+
+SERVICE_CASES = {
+    "standard": dict(product_weight=1000, product_length=96, product_width=48, product_height=30),
+    "small_no_top": dict(product_weight=150, product_length=24, product_width=18, product_height=14,
+                         include_top=False),
+    "heavy_large": dict(product_weight=9500, product_length=120, product_width=84, product_height=72,
+                        clearance=3.0, panel_thickness=1.0, lumber_sizes=["1.5x5.5", "3.5x3.5"]),
+    "thin_panels": dict(product_weight=420, product_length=60, product_width=36, product_height=44,
+                        clearance=1.5, panel_thickness=0.5),
+}
+
+DESKTOP_DEFAULTS = dict(
+    allow_3x4_skids_bool=True, panel_thickness_in=0.75, cleat_thickness_in=1.5,
+    cleat_member_actual_width_in=3.5, clearance_above_product_in=1.5, ground_clearance_in=1.0,
+    floorboard_actual_thickness_in=1.5, selected_std_lumber_widths=[5.5, 7.25, 9.25, 11.25],
+    max_allowable_middle_gap_in=0.25, min_custom_lumber_width_in=2.5,
+    force_small_custom_board_bool=False,
+)
+
+DESKTOP_CASES = {
+    "desktop_standard": dict(DESKTOP_DEFAULTS, product_weight_lbs=1000, product_length_in=96,
+                             product_width_in=48, clearance_each_side_in=2.0,
+                             product_actual_height_in=30),
+    "desktop_heavy": dict(DESKTOP_DEFAULTS, product_weight_lbs=6000, product_length_in=110,
+                          product_width_in=70, clearance_each_side_in=2.5, allow_3x4_skids_bool=False,
+                          panel_thickness_in=1.0, cleat_member_actual_width_in=5.5,
+                          product_actual_height_in=60, clearance_above_product_in=2.0,
+                          selected_std_lumber_widths=[5.5, 9.25], max_allowable_middle_gap_in=0.5,
+                          force_small_custom_board_bool=True),
+    # The Flask /api/generate-nx defaults
+    "desktop_flask_defaults": dict(DESKTOP_DEFAULTS, product_weight_lbs=1000, product_length_in=48,
+                                   product_width_in=48, clearance_each_side_in=2.0,
+                                   cleat_thickness_in=0.75, product_actual_height_in=48,
+                                   clearance_above_product_in=2.0, force_small_custom_board_bool=True,
+                                   plywood_panel_selections={"FP": True, "BP": True, "LP": True,
+                                                             "RP": True, "TP": True}),
+}
+
+
+def mask_timestamp(content: str) -> str:
+    """Blank the generation timestamp so runs can be compared byte for byte"""
+    return "\n".join(
+        TIMESTAMP_PREFIX if line.startswith(TIMESTAMP_PREFIX) else line
+        for line in content.split("\n")
+    )
+
+
+def baseline(name: str) -> str:
+    with open(BASELINE_DIR / f"{name}.exp", "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+class TestServiceOutput:
+    """Test the web NX expression service against the baseline files."""
+
+    @pytest.mark.parametrize("name", sorted(SERVICE_CASES))
+    def test_full_content_matches_baseline(self, name):
+        """generate_full_nx_expression_content is unchanged apart from the timestamp."""
+        content = generate_full_nx_expression_content(**SERVICE_CASES[name])
+        assert mask_timestamp(content) == mask_timestamp(baseline(name))
+
+    @pytest.mark.parametrize("name", sorted(SERVICE_CASES))
+    def test_split_calculate_and_render_matches_baseline(self, name):
+        """Rendering stored components emits the same file as the one-shot call."""
+        design = calculate_nx_components(**SERVICE_CASES[name])
+        content = render_nx_expression_content(design)
+        assert mask_timestamp(content) == mask_timestamp(baseline(name))
+
+    def test_only_the_timestamp_line_is_masked(self):
+        """The mask touches the header timestamp and nothing else."""
+        content = baseline("standard")
+        masked = mask_timestamp(content)
+        changed = [
+            (before, after) for before, after in zip(content.split("\n"), masked.split("\n"))
+            if before != after
+        ]
+        assert len(changed) == 1
+        assert changed[0][0].startswith(TIMESTAMP_PREFIX)
+
+
+class TestDesktopOutput:
+    """Test the desktop generator's in-memory and file outputs against the baseline files."""
+
+    @pytest.mark.parametrize("name", sorted(DESKTOP_CASES))
+    def test_in_memory_content_matches_baseline(self, name):
+        """generate_crate_expressions_content returns the baseline file text."""
+        success, content = generate_crate_expressions_content(**DESKTOP_CASES[name])
+        assert success, content
+        assert mask_timestamp(content) == mask_timestamp(baseline(name))
+
+    @pytest.mark.parametrize("name", sorted(DESKTOP_CASES))
+    def test_written_file_matches_in_memory_content(self, name, temp_output_dir, monkeypatch):
+        """The file-writing API writes exactly the in-memory content."""
+        monkeypatch.chdir(temp_output_dir)
+        success, message = generate_crate_expressions_logic(output_filename=f"{name}.exp",
+                                                            **DESKTOP_CASES[name])
+        assert success, message
+        written = (temp_output_dir / f"{name}.exp").read_text(encoding="utf-8")
+        _, content = generate_crate_expressions_content(**DESKTOP_CASES[name])
+        assert mask_timestamp(written) == mask_timestamp(content)
+        assert mask_timestamp(written) == mask_timestamp(baseline(name))
+
+    def test_invalid_input_reports_failure(self):
+        """Rejected inputs return (False, message) without raising."""
+        success, message = generate_crate_expressions_content(
+            **dict(DESKTOP_CASES["desktop_standard"], product_weight_lbs=-5)
+        )
+        assert success is False
+        assert message
@@ -0,0 +1,190 @@
+"""
+Pricing tests for AutoCrate V12 API.
+Tests versioned price catalogs, the quantity ledger and re-quoting stored designs.
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from pricing import DEFAULT_RATES, PriceBook, PriceCatalog, QuantityLedger, quote_vector
+
+VECTORS = {
+    "a": {"Lumber|2x4|linear ft": 40.0, "Plywood|0.75 in|sheets": 3.0, "Hardware|klimp|each": 8.0},
+    "b": {"Lumber|2x4|linear ft": 12.5, "Lumber|4x4|linear ft": 14.0, "Plywood|0.75 in|sheets": 1.0},
+    "c": {"Lumber|4x4|linear ft": 20.0},
+}
+
+CATALOG = PriceCatalog("test", prices={"Lumber|4x4|linear ft": 3.25},
+                       defaults={"Lumber|linear ft": 1.10, "Plywood|sheets": 52.00})
+
+
+@pytest.fixture
+def ledger():
+    ledger = QuantityLedger(max_entries=100, path="")
+    for design_id, vector in VECTORS.items():
+        ledger.add(design_id, vector)
+    return ledger
+
+
+class TestCatalogs:
+    """Test catalog lookups and the price book."""
+
+    def test_exact_price_then_default(self):
+        """Exact keys win over the category/unit default; unknown keys have no price."""
+        assert CATALOG.unit_price("Lumber|4x4|linear ft") == 3.25
+        assert CATALOG.unit_price("Lumber|2x6|linear ft") == 1.10
+        assert CATALOG.unit_price("Hardware|klimp|each") is None
+
+    def test_negative_prices_rejected(self):
+        """Catalogs refuse negative prices."""
+        with pytest.raises(ValueError):
+            PriceCatalog("bad", prices={"Lumber|2x4|linear ft": -1})
+
+    def test_round_trip(self):
+        """to_dict/from_dict preserve the catalog."""
+        copy = PriceCatalog.from_dict(CATALOG.to_dict())
+        assert copy.to_dict() == CATALOG.to_dict()
+
+    def test_price_book_versions(self, monkeypatch):
+        """Publishing makes a version current; old versions stay available and are immutable."""
+        monkeypatch.delenv("AUTOCRATE_PRICE_CATALOG", raising=False)
+        book = PriceBook()
+        assert book.get().defaults == DEFAULT_RATES
+        book.publish(CATALOG)
+        assert book.get() is CATALOG
+        assert book.get("default").version == "default"
+        assert [v["version"] for v in book.versions() if v["current"]] == ["test"]
+        with pytest.raises(ValueError):
+            book.publish(PriceCatalog("test"))
+        with pytest.raises(KeyError):
+            book.get("missing")
+
+
+class TestQuotes:
+    """Test single-design quotes and ledger totals."""
+
+    def test_quote_vector_totals(self):
+        """Line totals are quantity x unit price; unpriced keys are listed and left out."""
+        quote = quote_vector(VECTORS["a"], CATALOG)
+        assert quote["catalog_version"] == "test"
+        assert quote["total_cost"] == round(40.0 * 1.10 + 3.0 * 52.00, 2)
+        assert quote["unpriced"] == ["Hardware|klimp|each"]
+        priced = [item for item in quote["items"] if item["unit_cost"] is not None]
+        assert sum(item["total_cost"] for item in priced) == pytest.approx(quote["total_cost"])
+
+    def test_ledger_totals_match_quote_vector(self, ledger):
+        """Batch totals equal the per-design quote totals."""
+        result = ledger.quote_totals(CATALOG)
+        assert result["count"] == 3
+        assert list(result["totals"]) == ["a", "b", "c"]
+        for design_id, vector in VECTORS.items():
+            assert result["totals"][design_id] == pytest.approx(quote_vector(vector, CATALOG)["total_cost"])
+        assert result["unpriced"] == ["Hardware|klimp|each"]
+
+    def test_requested_ids_and_missing(self, ledger):
+        """Only requested designs are priced, in order; unknown ids are reported."""
+        result = ledger.quote_totals(CATALOG, ["c", "zzz", "b"])
+        assert list(result["totals"]) == ["c", "b"]
+        assert result["missing"] == ["zzz"]
+        assert result["unpriced"] == []
+
+    def test_replace_and_evict(self):
+        """Re-adding replaces a vector; the oldest designs are evicted past max_entries."""
+        ledger = QuantityLedger(max_entries=2, path="")
+        ledger.add("a", VECTORS["a"])
+        ledger.add("a", VECTORS["c"])
+        assert ledger.vector("a") == VECTORS["c"]
+        ledger.add("b", VECTORS["b"])
+        ledger.add("c", VECTORS["c"])
+        assert "a" not in ledger and len(ledger) == 2
+        assert ledger.evictions == 1
+        totals = ledger.quote_totals(CATALOG)["totals"]
+        assert totals == {"b": quote_vector(VECTORS["b"], CATALOG)["total_cost"],
+                          "c": quote_vector(VECTORS["c"], CATALOG)["total_cost"]}
+
+    def test_save_and_load(self, ledger, temp_output_dir):
+        """Saved vectors load back into a new ledger."""
+        ledger.path = temp_output_dir / "ledger.json"
+        ledger.save()
+        restored = QuantityLedger(path=str(ledger.path))
+        assert restored.load() == 3
+        assert restored.quote_totals(CATALOG)["totals"] == ledger.quote_totals(CATALOG)["totals"]
+
+
+class TestPricingEndpoints:
+    """Test the catalog, quote and requote endpoints."""
+
+    @pytest.fixture(scope="class")
+    def api(self):
+        import main
+        return main
+
+    @pytest.fixture(scope="class")
+    def client(self, api):
+        from fastapi.testclient import TestClient
+        return TestClient(api.app)
+
+    @pytest.fixture
+    def version(self, api, monkeypatch):
+        """A freshly published catalog; the previous current version is restored afterwards"""
+        monkeypatch.setattr(api.price_book, "current_version", api.price_book.current_version)
+        return f"test-{uuid.uuid4().hex[:8]}"
+
+    def create(self, client, length):
+        response = client.post("/api/designs", json={
+            "product": {"length": length, "width": 40.0, "height": 30.0, "weight": 800.0}
+        })
+        assert response.status_code == 200
+        design_id = response.json()["design_id"]
+        assert client.get(f"/api/designs/{design_id}/quote").status_code == 200
+        return design_id
+
+    def test_requote_matches_design_quotes(self, client, version):
+        """Requote totals equal each design's quote under the same catalog."""
+        ids = [self.create(client, 60.0), self.create(client, 84.0)]
+        response = client.post("/api/pricing/catalog", json={
+            "version": version, "defaults": {"Lumber|linear ft": 2.0, "Plywood|sheets": 60.0}
+        })
+        assert response.status_code == 201
+
+        requote = client.post("/api/pricing/requote", json={"design_ids": ids + ["missing"],
+                                                            "catalog_version": version})
+        assert requote.status_code == 200
+        result = requote.json()
+        assert result["catalog_version"] == version
+        assert result["missing"] == ["missing"]
+        for design_id in ids:
+            quote = client.get(f"/api/designs/{design_id}/quote?catalog_version={version}").json()
+            assert quote["catalog_version"] == version
+            assert result["totals"][design_id] == pytest.approx(quote["total_cost"])
+
+    def test_price_change_changes_totals_only(self, client, version):
+        """Doubling prices doubles the totals without recalculating quantities."""
+        design_id = self.create(client, 72.0)
+        rates = {"Lumber|linear ft": 1.5, "Plywood|sheets": 40.0}
+        client.post("/api/pricing/catalog", json={"version": version, "defaults": rates})
+        client.post("/api/pricing/catalog", json={
+            "version": version + "-x2", "defaults": {key: 2 * value for key, value in rates.items()}
+        })
+        single = client.post("/api/pricing/requote", json={"design_ids": [design_id],
+                                                           "catalog_version": version}).json()
+        double = client.post("/api/pricing/requote", json={"design_ids": [design_id]}).json()
+        assert double["catalog_version"] == version + "-x2"
+        assert double["totals"][design_id] == pytest.approx(2 * single["totals"][design_id], abs=0.02)
+
+    def test_catalog_errors(self, client, version):
+        """Unknown versions are a 404, duplicates a 409, negative prices a 400."""
+        assert client.get("/api/pricing/catalog?version=nope").status_code == 404
+        assert client.post("/api/pricing/requote", json={"catalog_version": "nope"}).status_code == 404
+        assert client.post("/api/pricing/catalog", json={"version": version}).status_code == 201
+        assert client.post("/api/pricing/catalog", json={"version": version}).status_code == 409
+        bad = {"version": version + "-bad", "prices": {"Lumber|2x4|linear ft": -1}}
+        assert client.post("/api/pricing/catalog", json=bad).status_code == 400
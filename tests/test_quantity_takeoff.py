@@ -0,0 +1,195 @@
+"""
+Quantity take-off tests for AutoCrate V12.
+Tests BOM lines taken off from component results and the CSV/XLSX exports.
+"""
+
+import csv
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from nx_expression_service import calculate_nx_components
+from autocrate.quantity_takeoff import (
+    TAKEOFF_COLUMNS, cut_pieces, lumber_label, quantity_vector, summarize_takeoff,
+    takeoff_from_components
+)
+
+
+@pytest.fixture(scope="module")
+def design():
+    return calculate_nx_components(product_weight=1000, product_length=96, product_width=48,
+                                   product_height=30)
+
+
+@pytest.fixture(scope="module")
+def lines(design):
+    return takeoff_from_components(design)
+
+
+def lines_for(lines, component):
+    return [line for line in lines if line["component"] == component]
+
+
+class TestTakeoffLines:
+    """Test take-off lines against the component results."""
+
+    def test_line_shape(self, lines):
+        """Every line has the take-off columns; lumber totals are length x quantity."""
+        for line in lines:
+            assert list(line) == TAKEOFF_COLUMNS
+            if line["length_in"] is not None:
+                assert line["total_length_in"] == pytest.approx(line["length_in"] * line["quantity"])
+
+    def test_skids_match_expressions(self, design, lines):
+        """Skid count and length match CALC_Skid_Count and Skid_Actual_Length in the .exp."""
+        skids = lines_for(lines, "skid")
+        assert len(skids) == 1
+        assert skids[0]["quantity"] == design["skids"]["skid_count"] == 3
+        assert skids[0]["length_in"] == design["dimensions"]["front_panel_width"] == 56.5
+        assert skids[0]["material"] == "4x4"
+
+    def test_floorboards_cover_every_board(self, design, lines):
+        """Floorboard lines account for every board, grouped by width."""
+        boards = design["floorboards"]["floorboards_data"]
+        floorboards = lines_for(lines, "floorboard")
+        assert sum(line["quantity"] for line in floorboards) == len([b for b in boards if b["width"] > 0])
+        widths = [line["material"] for line in floorboards]
+        assert len(widths) == len(set(widths))
+
+    def test_panel_lines(self, design, lines):
+        """Each panel contributes plywood, cleats and its klimps."""
+        for panel in ("front", "back", "left", "right", "top"):
+            panel_lines = [line for line in lines if line["panel"] == panel]
+            assert any(line["category"] == "Plywood" for line in panel_lines)
+            assert any(line["component"].endswith("cleat") for line in panel_lines)
+        klimps = sum(line["quantity"] for line in lines_for(lines, "klimp fastener"))
+        expected = sum((p.get("klimps") or {}).get("count", 0) for p in design["panels"].values())
+        assert klimps == expected
+
+    def test_no_top_panel(self):
+        """A crate without a top has no top panel lines."""
+        design = calculate_nx_components(product_weight=150, product_length=24, product_width=18,
+                                         product_height=14, include_top=False)
+        assert not [line for line in takeoff_from_components(design) if line["panel"] == "top"]
+
+    def test_lumber_label(self):
+        """Dressed sizes map to nominal labels; others are rips."""
+        assert lumber_label(1.5, 3.5) == "2x4"
+        assert lumber_label(3.5, 3.5) == "4x4"
+        assert lumber_label(1.5, 4.25) == "1.5x4.25 rip"
+
+
+class TestTotals:
+    """Test purchase totals derived from the lines."""
+
+    def test_lumber_summarized_in_linear_feet(self, lines):
+        """Lumber totals are the summed piece lengths per size, in feet."""
+        summary = summarize_takeoff(lines)
+        for row in summary:
+            if row["category"] == "Lumber":
+                inches = sum(line["total_length_in"] for line in lines
+                             if line["category"] == "Lumber" and line["material"] == row["material"])
+                assert row["unit"] == "linear ft"
+                assert row["quantity"] == round(inches / 12.0, 2)
+            else:
+                count = sum(line["quantity"] for line in lines
+                            if line["category"] == row["category"] and line["material"] == row["material"])
+                assert row["quantity"] == count
+
+    def test_cut_pieces_one_entry_per_piece(self, lines):
+        """cut_pieces lists every lumber piece once."""
+        pieces = cut_pieces(lines)
+        for material, lengths in pieces.items():
+            expected = sum(int(line["quantity"]) for line in lines
+                           if line["category"] == "Lumber" and line["material"] == material)
+            assert len(lengths) == expected
+
+    def test_quantity_vector_keys(self, lines):
+        """The quantity vector is keyed category|material|unit."""
+        vector = quantity_vector(lines)
+        assert "Lumber|4x4|linear ft" in vector
+        assert all(key.count("|") == 2 for key in vector)
+
+
+class TestBomExport:
+    """Test the BOM export endpoints."""
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        from fastapi.testclient import TestClient
+        import main
+        return TestClient(main.app)
+
+    REQUEST = {"product": {"length": 96.0, "width": 48.0, "height": 30.0, "weight": 1000.0}}
+
+    def test_json_bom_matches_takeoff(self, client, lines):
+        """The JSON BOM items are the take-off lines for the request."""
+        bom = client.post("/api/export/bom", json=self.REQUEST).json()
+        assert lines_for(bom["items"], "skid") == lines_for(lines, "skid")
+        assert bom["summary"] == summarize_takeoff(bom["items"])
+        assert bom["quote"]["total_cost"] > 0
+
+    def test_csv_rows(self, client):
+        """CSV has a header and one row per take-off line, tagged with the crate number."""
+        json_items = client.post("/api/export/bom", json=self.REQUEST).json()["items"]
+        response = client.post("/api/export/bom?format=csv", json=self.REQUEST)
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["crate"] + TAKEOFF_COLUMNS
+        assert len(rows) - 1 == len(json_items)
+        assert {row[0] for row in rows[1:]} == {"1"}
+
+    def test_batch_xlsx(self, client):
+        """Batch XLSX has BOM rows for every crate and a summary sheet."""
+        openpyxl = pytest.importorskip("openpyxl")
+        response = client.post("/api/export/bom/batch?format=xlsx", json={
+            "requests": [self.REQUEST, {"product": {"length": 40.0, "width": 30.0, "height": 30.0, "weight": 500.0}}]
+        })
+        assert response.status_code == 200
+        workbook = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True)
+        assert workbook.sheetnames == ["BOM", "Summary"]
+        crates = {row[0] for row in workbook["BOM"].iter_rows(min_row=2, values_only=True)}
+        assert crates == {1, 2}
+
+    def test_csv_takeoff_errors_map_to_status(self, client, monkeypatch):
+        """Take-off failures surface as 4xx/5xx, not as a 200 with a truncated CSV."""
+        from fastapi import HTTPException
+        import main
+
+        async def invalid(request):
+            raise ValueError("bad crate")
+
+        async def busy(request):
+            raise HTTPException(status_code=503, detail="busy", headers={"Retry-After": "1"})
+
+        monkeypatch.setattr(main, "takeoff_cached", invalid)
+        response = client.post("/api/export/bom?format=csv", json=self.REQUEST)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "bad crate"
+
+        monkeypatch.setattr(main, "takeoff_cached", busy)
+        response = client.post("/api/export/bom/batch?format=csv", json={"requests": [self.REQUEST] * 3})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_batch_csv_keeps_crate_order(self, client):
+        """Batch CSV rows follow the request order across computation windows."""
+        import main
+        requests = [{"product": {"length": 40.0 + index, "width": 30.0, "height": 30.0, "weight": 500.0}}
+                    for index in range(main.batch_concurrency() + 2)]
+        response = client.post("/api/export/bom/batch?format=csv", json={"requests": requests})
+        assert response.status_code == 200
+        crates = [int(row[0]) for row in list(csv.reader(io.StringIO(response.text)))[1:]]
+        assert crates == sorted(crates)
+        assert set(crates) == set(range(1, len(requests) + 1))
+
+    def test_unsupported_format(self, client):
+        """Unknown formats are a 400."""
+        assert client.post("/api/export/bom?format=pdf", json=self.REQUEST).status_code == 400
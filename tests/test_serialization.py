@@ -0,0 +1,146 @@
+"""
+Serialization tests for AutoCrate V12 API.
+Tests lean payloads, `fields=` projection and response compression.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from serialization import (
+    LEAN_DROP_KEYS, compress, dumps, negotiate_encoding, parse_fields, project, shape_payload,
+    strip_lean, variant_key
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+REQUEST = {"product": {"length": 58.0, "width": 40.0, "height": 36.0, "weight": 1200.0}}
+
+PAYLOAD = {
+    "design_key": "abc",
+    "panels": {
+        "front": {"width": 10, "height": 20, "klimps": {"placement_zones": [1, 2], "count": 3}},
+        "back": {"width": 11, "height": 21, "spacing_analysis": {"gaps": [4]}},
+    },
+    "materials_summary": {"plywood_sheets": 4},
+}
+
+
+def _contains_key(obj, keys):
+    if isinstance(obj, dict):
+        return any(k in keys or _contains_key(v, keys) for k, v in obj.items())
+    if isinstance(obj, list):
+        return any(_contains_key(v, keys) for v in obj)
+    return False
+
+
+class TestShaping:
+    """Test lean stripping and projection helpers."""
+
+    def test_strip_lean_drops_klimp_analysis_at_any_depth(self):
+        """Lean payloads keep everything except the klimp analysis keys."""
+        lean = strip_lean(PAYLOAD)
+        assert not _contains_key(lean, LEAN_DROP_KEYS)
+        assert lean["panels"]["front"]["klimps"] == {"count": 3}
+        assert lean["materials_summary"] == PAYLOAD["materials_summary"]
+        assert "placement_zones" in PAYLOAD["panels"]["front"]["klimps"]
+
+    def test_parse_fields(self):
+        """Field lists are trimmed, deduplicated and sorted."""
+        assert parse_fields(None) is None
+        assert parse_fields(" , ") is None
+        assert parse_fields("b, a,b") == ["a", "b"]
+
+    def test_project_with_wildcard(self):
+        """`*` selects every key at its level."""
+        projected = project(PAYLOAD, ["design_key", "panels.*.width"])
+        assert projected == {
+            "design_key": "abc",
+            "panels": {"front": {"width": 10}, "back": {"width": 11}},
+        }
+
+    def test_project_merges_overlapping_paths(self):
+        """An ancestor path wins over its descendants; siblings merge."""
+        assert project(PAYLOAD, ["panels.front", "panels.front.width"]) == {
+            "panels": {"front": PAYLOAD["panels"]["front"]}
+        }
+        assert project(PAYLOAD, ["panels.*.width", "panels.front.height"]) == {
+            "panels": {"front": {"width": 10, "height": 20}, "back": {"width": 11}}
+        }
+
+    def test_project_skips_missing_paths(self):
+        """Unknown paths are ignored rather than raising."""
+        assert project(PAYLOAD, ["missing", "panels.top.width"]) == {"panels": {}}
+
+    def test_shape_payload_and_variant_key(self):
+        """Lean and fields combine, and each shape has its own cache variant."""
+        shaped = shape_payload(PAYLOAD, ["panels.front.klimps"], lean=True)
+        assert shaped == {"panels": {"front": {"klimps": {"count": 3}}}}
+        assert variant_key() != variant_key(lean=True)
+        assert variant_key(["a"]) != variant_key(["b"])
+
+
+class TestEncoding:
+    """Test JSON encoding and content negotiation."""
+
+    def test_dumps_is_compact_json(self):
+        """dumps produces JSON that round-trips."""
+        body = dumps(PAYLOAD)
+        assert isinstance(body, bytes)
+        assert json.loads(body) == PAYLOAD
+
+    def test_negotiate_encoding_honours_q_values(self):
+        """gzip is picked unless refused; q=0 disables an encoding."""
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+
+    def test_gzip_is_deterministic(self):
+        """gzip output has no timestamp, so equal bodies compress equally."""
+        body = dumps(PAYLOAD) * 50
+        assert compress(body, "gzip") == compress(body, "gzip")
+        assert gzip.decompress(compress(body, "gzip")) == body
+        with pytest.raises(ValueError):
+            compress(body, "deflate")
+
+
+class TestCalculateEndpoint:
+    """Test lean and projected /api/calculate responses."""
+
+    def test_lean_response_drops_klimp_analysis(self, client):
+        """lean=true removes the klimp analysis but keeps the panels."""
+        full = client.post("/api/calculate", json=REQUEST).json()
+        lean = client.post("/api/calculate?lean=true", json=REQUEST).json()
+        assert not _contains_key(lean, LEAN_DROP_KEYS)
+        assert set(lean["panels"]) == set(full["panels"])
+        assert lean["design_key"] == full["design_key"]
+
+    def test_fields_projection(self, client):
+        """fields= returns exactly the requested paths."""
+        response = client.post("/api/calculate?fields=design_key,product_specs.length", json=REQUEST)
+        assert response.status_code == 200
+        assert response.json() == {
+            "design_key": response.json()["design_key"],
+            "product_specs": {"length": 58.0},
+        }
+
+    def test_large_response_is_compressed(self, client):
+        """Bodies over the threshold are gzip encoded when the client accepts it."""
+        response = client.post("/api/calculate", json=REQUEST, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.json()["product_specs"]["width"] == 40.0
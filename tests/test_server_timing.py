@@ -0,0 +1,77 @@
+"""
+Server-Timing tests for AutoCrate V12 API.
+Tests the header format and the debug_timing body breakdown.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+import server_timing
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+REQUEST = {"product": {"length": 53.0, "width": 37.0, "height": 33.0, "weight": 930.0}}
+
+
+class TestFormatting:
+    """Test header and breakdown formatting."""
+
+    def test_format_header(self):
+        """Stages become `name;dur=ms` tokens followed by the total."""
+        header = server_timing.format_header({"panels.front": 0.0012, "od cascade": 0.0005}, 0.01)
+        assert header == "panels.front;dur=1.200, od_cascade;dur=0.500, total;dur=10.000"
+
+    def test_breakdown(self):
+        """The body form carries the same timings in milliseconds."""
+        assert server_timing.breakdown({"skids": 0.002}, 0.005) == {
+            "stages_ms": {"skids": 2.0},
+            "total_ms": 5.0,
+        }
+
+    def test_debug_requested(self):
+        """Only truthy values switch the debug breakdown on."""
+        assert server_timing.debug_requested("true")
+        assert server_timing.debug_requested("1")
+        assert not server_timing.debug_requested("false")
+        assert not server_timing.debug_requested(None)
+
+
+class TestMiddleware:
+    """Test the Server-Timing middleware."""
+
+    def test_header_on_every_response(self, client):
+        """Responses carry Server-Timing ending in the request total."""
+        response = client.get("/health")
+        assert response.headers["Timing-Allow-Origin"] == "*"
+        assert response.headers["Server-Timing"].split(", ")[-1].startswith("total;dur=")
+
+    def test_engine_stages_reported(self, client):
+        """A cold calculation reports engine stages, not just the total."""
+        response = client.post("/api/calculate", json=REQUEST)
+        entries = response.headers["Server-Timing"].split(", ")
+        assert len(entries) > 1
+
+    def test_debug_timing_adds_breakdown_and_bypasses_304(self, client):
+        """debug_timing returns a full uncached body with the breakdown."""
+        etag = client.post("/api/calculate", json=REQUEST).headers["ETag"]
+        response = client.post("/api/calculate?debug_timing=true", json=REQUEST,
+                               headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Cache-Control"] == "no-store"
+        body = response.json()
+        assert set(body[server_timing.DEBUG_PARAM]) == {"stages_ms", "total_ms"}
+        assert body["product_specs"]["length"] == 53.0
@@ -0,0 +1,138 @@
+"""
+Single-flight coalescing tests for AutoCrate V12 API.
+Tests that concurrent identical requests share one computation.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight.do."""
+
+    def test_concurrent_identical_calls_coalesce(self):
+        """Callers with the same key share one computation and result."""
+        flights = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        async def scenario():
+            return await asyncio.gather(*[flights.do("key", compute) for _ in range(5)])
+
+        results = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        stats = flights.stats()
+        assert stats["computations"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["max_waiters"] == 5
+        assert stats["in_flight"] == 0
+
+    def test_distinct_keys_run_separately(self):
+        """Different keys never share a computation."""
+        flights = SingleFlight("test")
+
+        async def scenario():
+            async def compute(value):
+                await asyncio.sleep(0.01)
+                return value
+            return await asyncio.gather(
+                flights.do("a", lambda: compute("a")),
+                flights.do("b", lambda: compute("b"))
+            )
+
+        assert asyncio.run(scenario()) == ["a", "b"]
+        assert flights.stats()["computations"] == 2
+
+    def test_finished_key_recomputes(self):
+        """Coalescing only covers calls that overlap in time."""
+        flights = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        async def scenario():
+            first = await flights.do("key", compute)
+            second = await flights.do("key", compute)
+            return first, second
+
+        assert asyncio.run(scenario()) == (1, 2)
+
+    def test_errors_reach_every_waiter(self):
+        """A failed computation raises for all waiters and clears the key."""
+        flights = SingleFlight("test")
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def scenario():
+            return await asyncio.gather(
+                *[flights.do("key", compute) for _ in range(3)], return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.stats()["in_flight"] == 0
+
+    def test_cancelled_waiter_does_not_cancel_computation(self):
+        """One client going away leaves the shared computation running."""
+        flights = SingleFlight("test")
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def scenario():
+            first = asyncio.ensure_future(flights.do("key", compute))
+            second = asyncio.ensure_future(flights.do("key", compute))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(scenario()) == "done"
+
+
+class TestCalculationCoalescing:
+    """Test coalescing through the API's cached calculation path."""
+
+    def test_concurrent_calculations_run_engine_once(self, monkeypatch):
+        """Identical concurrent calculate requests share one engine run."""
+        import main
+
+        engine_runs = []
+        lock = threading.Lock()
+        original = main.CalculationEngine.calculate_crate
+
+        def counted(request):
+            with lock:
+                engine_runs.append(1)
+            return original(request)
+
+        monkeypatch.setattr(main.CalculationEngine, "calculate_crate", staticmethod(counted))
+        request = main.CrateRequest(product={"length": 39.0, "width": 29.0, "height": 23.0, "weight": 444.0})
+        main.calculation_cache.clear()
+
+        async def scenario():
+            return await asyncio.gather(*[main.calculate_cached(request) for _ in range(4)])
+
+        results = asyncio.run(scenario())
+        assert len(engine_runs) == 1
+        assert all(result == results[0] for result in results)
@@ -0,0 +1,588 @@
+"""
+Visualization system tests for AutoCrate V12.
+Tests the instanced crate model, derived views, renderers and exporters
+headlessly (Agg backend).
+"""
+
+import sys
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+# Add api and project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "api"))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import autocrate.visualization_system as visualization_system
+from autocrate.visualization_system import (
+    AssemblyAnimation, Component3D, ComponentType, CrateVisualizer, DesignComparison,
+    ThumbnailRenderer, ViewMode, VisualizationManager, _render_assembly_frames, write_glb, write_stl
+)
+from autocrate.crate_geometry import build_crate_boxes, crate_bounds
+from nx_expression_service import calculate_nx_components
+from test_crate_geometry import parse_glb, read_accessor
+
+CRATE_DATA = {
+    'length': 48,
+    'width': 40,
+    'height': 36,
+    'plywood_thickness': 0.75,
+    'cleat_width': 2.0,
+    'cleat_height': 4.0,
+    'skid_width': 4.0,
+    'skid_height': 4.0,
+    'num_skids': 3,
+    'floorboard_width': 5.5,
+    'floorboard_thickness': 0.75
+}
+
+
+@pytest.fixture
+def visualizer():
+    return CrateVisualizer(platform='web')
+
+
+@pytest.fixture
+def model(visualizer):
+    return visualizer.create_crate_model(CRATE_DATA)
+
+
+class TestMergedMeshes:
+    """Test Plotly meshes merged per material."""
+
+    def test_one_trace_per_material(self, visualizer, model):
+        """Boxes are merged into one Mesh3d per material, covering every box."""
+        fig = visualizer.render_plotly(model)
+        materials = {instances.material for instances in model.boxes.values()}
+        assert len(fig.data) == len(materials)
+        boxes = model.component_count()
+        assert sum(len(trace.x) for trace in fig.data) == 8 * boxes
+        assert sum(len(trace.i) for trace in fig.data) == 12 * boxes
+
+    def test_hover_names_every_component(self, visualizer, model):
+        """Per-vertex customdata carries each component's name."""
+        fig = visualizer.render_plotly(model)
+        names = {row[0] for trace in fig.data for row in trace.customdata}
+        assert names == set(model.assembly_sequence)
+
+    def test_merged_matches_per_component_geometry(self, visualizer, model):
+        """Merged and per-component traces hold the same triangles."""
+        def triangles(fig):
+            result = set()
+            for trace in fig.data:
+                vertices = np.column_stack([trace.x, trace.y, trace.z])
+                for i, j, k in zip(trace.i, trace.j, trace.k):
+                    result.add(tuple(sorted(map(tuple, np.round(vertices[[i, j, k]], 6)))))
+            return result
+
+        merged = triangles(visualizer.render_plotly(model))
+        visualizer.merge_meshes = False
+        separate = visualizer.render_plotly(model)
+        assert len(separate.data) == model.component_count()
+        assert merged == triangles(separate)
+
+    def test_triangulate_mixed_faces(self):
+        """Quads and pentagons are fan-triangulated."""
+        triangles = CrateVisualizer._triangulate_faces([[0, 1, 2, 3], [4, 5, 6, 7, 8], [9, 10]])
+        assert sorted(map(tuple, triangles.tolist())) == sorted([
+            (0, 1, 2), (0, 2, 3), (4, 5, 6), (4, 6, 7), (4, 7, 8)
+        ])
+
+
+class TestBoxInstances:
+    """Test boxes stored as per-type instance arrays."""
+
+    def test_boxes_grouped_by_type(self, model):
+        """Each component type is one BoxInstances with (N, 3) offsets and sizes."""
+        assert len(model.boxes[ComponentType.SKID]) == CRATE_DATA['num_skids']
+        for instances in model.boxes.values():
+            assert instances.offsets.shape == instances.sizes.shape == (len(instances), 3)
+        assert model.component_count() == len(model.assembly_sequence)
+
+    def test_component_copies(self, model):
+        """all_components expands boxes to Component3D copies in assembly order."""
+        components = model.all_components()
+        assert [component.name for component in components] == model.assembly_sequence
+        skids = model.boxes[ComponentType.SKID]
+        first = next(component for component in components if component.name == skids.names[0])
+        assert first.vertices.min(axis=0) == pytest.approx(skids.offsets[0])
+        assert first.vertices.max(axis=0) == pytest.approx(skids.offsets[0] + skids.sizes[0])
+
+    def test_bounding_box(self, model):
+        """The bounding box covers panels and skids below them."""
+        low, high = model.get_bounding_box()
+        assert low == pytest.approx([0, 0, -CRATE_DATA['skid_height']])
+        assert high == pytest.approx([CRATE_DATA['length'], CRATE_DATA['width'], CRATE_DATA['height']])
+
+    def test_repeated_renders_do_not_drift(self, visualizer, model):
+        """Rendering an exploded view again and again leaves the boxes where they were."""
+        offsets = {t: instances.offsets.copy() for t, instances in model.boxes.items()}
+        visualizer.view_mode = ViewMode.EXPLODED
+        first = visualizer.render_plotly(model)
+        for _ in range(3):
+            again = visualizer.render_plotly(model)
+        assert [list(trace.x) for trace in again.data] == [list(trace.x) for trace in first.data]
+        for component_type, instances in model.boxes.items():
+            np.testing.assert_array_equal(instances.offsets, offsets[component_type])
+
+
+class TestDerivedViews:
+    """Test exploded, transparent and cutaway views derived without mutation."""
+
+    def test_explode_does_not_mutate(self, model):
+        """explode() returns a new model and leaves the original untouched."""
+        offsets = {t: instances.offsets.copy() for t, instances in model.boxes.items()}
+        version = model.version
+        exploded = model.explode(2.0)
+        assert exploded is not model
+        assert model.version == version
+        for component_type, instances in model.boxes.items():
+            np.testing.assert_array_equal(instances.offsets, offsets[component_type])
+            moved = exploded.boxes[component_type].offsets - instances.offsets
+            assert np.linalg.norm(moved, axis=1) == pytest.approx(20.0)
+
+    def test_views_are_cached_per_version(self, visualizer, model):
+        """The same view is returned until the model changes."""
+        exploded = model.view(ViewMode.EXPLODED)
+        assert model.view(ViewMode.EXPLODED) is exploded
+        assert model.explode(1.5) is exploded
+        assert model.explode(3.0) is not exploded
+        model.translate([1.0, 0.0, 0.0])
+        rebuilt = model.view(ViewMode.EXPLODED)
+        assert rebuilt is not exploded
+        fresh = visualizer.create_crate_model(CRATE_DATA)
+        fresh.translate([1.0, 0.0, 0.0])
+        for component_type, instances in fresh.view(ViewMode.EXPLODED).boxes.items():
+            np.testing.assert_allclose(rebuilt.boxes[component_type].offsets, instances.offsets)
+
+    def test_view_cache_keeps_latest_factor_per_mode(self, model):
+        """Sweeping a factor keeps one cached view per mode, not one per factor."""
+        for step in range(50):
+            model.view(ViewMode.EXPLODED, 1.0 + step / 10)
+        model.view(ViewMode.TRANSPARENT, 0.4)
+        assert len(model._views) == 2
+        latest = model.view(ViewMode.EXPLODED, 5.9)
+        assert model.view(ViewMode.EXPLODED, 5.9) is latest
+        assert model.view(ViewMode.EXPLODED, 1.0) is not latest
+
+    def test_plain_modes_return_model(self, model):
+        """Assembled and wireframe modes are the model itself."""
+        assert model.view(ViewMode.ASSEMBLED) is model
+        assert model.view(ViewMode.WIREFRAME) is model
+
+    def test_transparent(self, model):
+        """The transparent view only changes opacity."""
+        transparent = model.view(ViewMode.TRANSPARENT, 0.25)
+        for component_type, instances in transparent.boxes.items():
+            assert instances.opacity == 0.25
+            assert model.boxes[component_type].opacity == 1.0
+            np.testing.assert_array_equal(instances.offsets, model.boxes[component_type].offsets)
+
+    def test_cutaway_clips_boxes(self, model):
+        """Boxes are clipped to the far side of the cut plane; boxes in front are dropped."""
+        cut = model.width * 0.5
+        cutaway = model.view(ViewMode.CUTAWAY)
+        front = model.boxes[ComponentType.FRONT_PANEL]
+        assert len(cutaway.boxes[ComponentType.FRONT_PANEL]) == 0
+        assert len(front) == 1
+        for instances in cutaway.boxes.values():
+            if len(instances):
+                assert (instances.offsets[:, 1] >= cut - 1e-9).all()
+                assert (instances.sizes[:, 1] > 0).all()
+        assert set(cutaway.assembly_sequence) <= set(model.assembly_sequence)
+
+
+class TestAssemblyAnimation:
+    """Test the assembly animation's artists and frames."""
+
+    def test_frame_and_artist_counts(self, model):
+        """One artist per component, created once; frames split evenly per component."""
+        assembly = AssemblyAnimation(Figure(), model, duration=2.0, fps=10)
+        count = model.component_count()
+        assert len(assembly.artists) == count
+        assert assembly.total_frames == AssemblyAnimation.frame_count(model, 2.0, 10)
+        assert assembly.total_frames == assembly.frames_per_component * count
+        collections = len(assembly.ax.collections)
+        assert collections == count
+        for frame in range(assembly.total_frames):
+            assembly.update(frame)
+        assert len(assembly.ax.collections) == collections
+
+    def test_visibility_follows_steps(self, model):
+        """Components appear one step at a time, in assembly order."""
+        assembly = AssemblyAnimation(Figure(), model, duration=2.0, fps=10)
+        per = assembly.frames_per_component
+        assembly.init()
+        assert [artist.get_visible() for artist in assembly.artists].count(True) == 1
+        assembly.update(3 * per)
+        assert [artist.get_visible() for artist in assembly.artists] == [
+            index <= 3 for index in range(len(assembly.artists))
+        ]
+        # Going back hides the later components again
+        assembly.update(per)
+        assert sum(artist.get_visible() for artist in assembly.artists) == 2
+        assembly.update(assembly.total_frames - 1)
+        assert all(artist.get_visible() for artist in assembly.artists)
+        assert assembly.step_label.get_text() == f"Step {len(assembly.artists)}/{len(assembly.artists)}"
+
+    def test_blit_returns_all_artists(self, model):
+        """With blitting every artist is returned so the depth order is redrawn."""
+        fig = Figure()
+        assembly = AssemblyAnimation(fig, model, duration=1.0, fps=10, blit=True)
+        FigureCanvasAgg(fig).draw()  # FuncAnimation starts blitting after the first draw
+        assert len(assembly.update(0)) == len(assembly.artists) + 1
+        zorders = [artist.zorder for artist in assembly.artists[:1]]
+        assert zorders == [10]
+
+    def test_offline_frames(self, model):
+        """Frame chunks are full RGBA buffers at the requested size."""
+        frames = _render_assembly_frames(model, 1.0, 10, (2, 2), 50, 0, 3)
+        assert len(frames) == 3
+        assert all(len(frame) == 100 * 100 * 4 for frame in frames)
+        assert frames[0] != frames[2]
+
+    def test_gif_export(self, visualizer, model, temp_output_dir):
+        """A GIF is written in-process; unknown formats are rejected."""
+        Image = pytest.importorskip("PIL.Image")
+        path = visualizer.export_assembly_video(model, temp_output_dir / "assembly.gif", duration=1.0,
+                                                fps=4, fig_size=(2, 2), dpi=40, workers=1)
+        with Image.open(path) as image:
+            assert image.size == (80, 80)
+            assert 1 < image.n_frames <= AssemblyAnimation.frame_count(model, 1.0, 4)
+        with pytest.raises(ValueError):
+            visualizer.export_assembly_video(model, temp_output_dir / "assembly.avi", workers=1)
+
+
+class TestThumbnails:
+    """Test content-hashed thumbnail rendering."""
+
+    def test_hash_is_stable_and_settings_sensitive(self, temp_output_dir):
+        """Equal designs hash equally regardless of key order; size changes the hash."""
+        renderer = ThumbnailRenderer(temp_output_dir)
+        reordered = dict(reversed(list(CRATE_DATA.items())))
+        assert renderer.content_hash(CRATE_DATA) == ThumbnailRenderer(temp_output_dir).content_hash(reordered)
+        assert renderer.content_hash(CRATE_DATA) != renderer.content_hash(dict(CRATE_DATA, length=50))
+        smaller = ThumbnailRenderer(temp_output_dir, size=(128, 128))
+        assert renderer.content_hash(CRATE_DATA) != smaller.content_hash(CRATE_DATA)
+
+    def test_duplicates_rendered_once_and_files_reused(self, temp_output_dir, monkeypatch):
+        """Identical designs in a batch render once; existing files are never rendered again."""
+        Image = pytest.importorskip("PIL.Image")
+        calls = []
+        render = visualization_system._render_thumbnail
+        monkeypatch.setattr(visualization_system, "_render_thumbnail",
+                            lambda *args: calls.append(args[1]) or render(*args))
+        renderer = ThumbnailRenderer(temp_output_dir, workers=1)
+        other = dict(CRATE_DATA, length=60)
+
+        first = renderer.render([CRATE_DATA, CRATE_DATA, other])
+        assert [entry["rendered"] for entry in first] == [True, True, True]
+        assert first[0]["path"] == first[1]["path"] != first[2]["path"]
+        assert len(calls) == 2
+        with Image.open(first[0]["path"]) as image:
+            assert image.size == renderer.size
+        mtime = first[0]["path"].stat().st_mtime_ns
+
+        second = renderer.render([other, CRATE_DATA])
+        assert [entry["rendered"] for entry in second] == [False, False]
+        assert [entry["hash"] for entry in second] == [first[2]["hash"], first[0]["hash"]]
+        assert len(calls) == 2
+        assert first[0]["path"].stat().st_mtime_ns == mtime
+        assert sorted(p.name for p in temp_output_dir.iterdir()) == sorted(
+            entry["path"].name for entry in first[1:])
+
+    def test_worker_pool(self, temp_output_dir):
+        """A batch rendered by the process pool writes every file without leftovers."""
+        designs = [dict(CRATE_DATA, length=length) for length in (40, 48, 56)]
+        results = ThumbnailRenderer(temp_output_dir, size=(64, 64), workers=2).render(designs)
+        assert all(entry["path"].exists() for entry in results)
+        assert not list(temp_output_dir.glob("*.tmp"))
+
+
+def add_pyramid(model):
+    """A free-form square pyramid above the crate"""
+    vertices = np.array([[0, 0, 40], [4, 0, 40], [4, 4, 40], [0, 4, 40], [2, 2, 44]], dtype=float)
+    faces = [[0, 3, 2, 1], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+    model.add_component(Component3D("Pyramid", ComponentType.CLEAT, vertices, faces, material="steel"))
+
+
+class TestExports:
+    """Test the binary glTF and STL writers."""
+
+    def test_glb_nodes_match_boxes(self, model, temp_output_dir):
+        """Every box is a node with its corner as translation and its size as scale."""
+        gltf, blob = parse_glb(write_glb(model, temp_output_dir / "crate.glb").read_bytes())
+        nodes = {node["name"]: node for node in gltf["nodes"]}
+        for component_type, instances in model.boxes.items():
+            group = nodes[component_type.value]
+            assert [gltf["nodes"][child]["name"] for child in group["children"]] == instances.names
+            for name, offset, size in zip(instances.names, instances.offsets, instances.sizes):
+                assert nodes[name]["translation"] == pytest.approx(offset.tolist())
+                assert nodes[name]["scale"] == pytest.approx(size.tolist())
+        root = gltf["nodes"][gltf["scenes"][0]["nodes"][0]]
+        assert root["scale"] == [0.0254] * 3
+        cube = gltf["meshes"][0]["primitives"][0]
+        assert set(read_accessor(gltf, blob, cube["attributes"]["POSITION"])) == {0.0, 1.0}
+        assert gltf["extras"]["length"] == model.length
+
+    def test_glb_free_form_and_transparency(self, visualizer, model, temp_output_dir):
+        """Free-form components get their own mesh; transparent views blend."""
+        add_pyramid(model)
+        visualizer.view_mode = ViewMode.TRANSPARENT
+        path = visualizer.export_to_glb(model, temp_output_dir / "crate.glb")
+        gltf, blob = parse_glb(path.read_bytes())
+        mesh = next(mesh for mesh in gltf["meshes"] if mesh["name"] == "Pyramid")
+        primitive = mesh["primitives"][0]
+        assert read_accessor(gltf, blob, primitive["attributes"]["POSITION"]) == pytest.approx(
+            model.components[0].vertices.ravel().tolist())
+        assert len(read_accessor(gltf, blob, primitive["indices"])) == 3 * 6
+        assert all(material["alphaMode"] == "BLEND" for material in gltf["materials"])
+
+    def test_glb_loads_with_trimesh(self, model, temp_output_dir):
+        """A glTF reader places the boxes where the model has them."""
+        trimesh = pytest.importorskip("trimesh")
+        scene = trimesh.load(str(write_glb(model, temp_output_dir / "crate.glb")))
+        low, high = model.get_bounding_box()
+        # Metres, Y up: (x, y, z) inches -> (x, z, -y) * 0.0254
+        expected = np.array([[low[0], low[2], -high[1]], [high[0], high[2], -low[1]]]) * 0.0254
+        np.testing.assert_allclose(scene.bounds, expected, atol=1e-6)
+
+    def test_stl_triangles(self, model, temp_output_dir):
+        """One record per box triangle plus free-form triangles, within the model bounds."""
+        add_pyramid(model)
+        data = write_stl(model, temp_output_dir / "crate.stl").read_bytes()
+        boxes = sum(len(instances) for instances in model.boxes.values())
+        count = int.from_bytes(data[80:84], "little")
+        assert count == 12 * boxes + 6
+        assert len(data) == 84 + 50 * count
+        assert data[:80].decode("ascii").startswith("AutoCrate 48x40x36 in")
+        records = np.frombuffer(data[84:], dtype=visualization_system.STL_TRIANGLE)
+        low, high = model.get_bounding_box()
+        vertices = records['vertices'].reshape(-1, 3)
+        np.testing.assert_allclose(vertices.min(axis=0), low, atol=1e-4)
+        np.testing.assert_allclose(vertices.max(axis=0), high, atol=1e-4)
+        np.testing.assert_allclose(np.linalg.norm(records['normal'], axis=1), 1.0, atol=1e-6)
+
+    def test_stl_chunking_does_not_change_output(self, model, temp_output_dir, monkeypatch):
+        """Writing boxes in small chunks gives the same file."""
+        whole = write_stl(model, temp_output_dir / "whole.stl").read_bytes()
+        monkeypatch.setattr(visualization_system, "STL_CHUNK_BOXES", 2)
+        assert write_stl(model, temp_output_dir / "chunked.stl").read_bytes() == whole
+
+
+class TestDesignComparison:
+    """Test the paged comparison with shared geometry deduplicated."""
+
+    @pytest.fixture
+    def models(self, visualizer):
+        # Same footprint; only the height differs, so skids and floorboards are shared
+        return [visualizer.create_crate_model(dict(CRATE_DATA, height=height)) for height in (36, 36, 42)]
+
+    def test_shared_and_changed_counts(self, models):
+        """Boxes common to every design are shared; the rest are counted as changed."""
+        comparison = DesignComparison(models, ["A", "B", "C"])
+        boxes = models[0].component_count()
+        floor = [ComponentType.SKID, ComponentType.FLOORBOARD]
+        shared = sum(len(models[0].boxes[t]) for t in floor)
+        # A and B match but C is taller, so only the skids and floorboards are in all three
+        for entry in comparison.summary():
+            assert entry["boxes"] == boxes
+            assert entry["shared"] == shared
+            assert entry["different"] == boxes - shared
+        floor_names = {name for t in floor for name in models[2].boxes[t].names}
+        assert set(comparison.differences(2)) == set(models[2].assembly_sequence) - floor_names
+
+    def test_identical_designs_share_everything(self, visualizer):
+        """Equal designs have no changed boxes."""
+        models = [visualizer.create_crate_model(CRATE_DATA) for _ in range(2)]
+        summary = DesignComparison(models).summary()
+        assert [entry["different"] for entry in summary] == [0, 0]
+        assert summary[0]["shared"] == models[0].component_count()
+
+    def test_shared_mesh_built_once(self, models):
+        """The shared backdrop mesh covers the shared boxes and is reused."""
+        comparison = DesignComparison(models)
+        vertices, triangles = comparison.shared_mesh()
+        shared = comparison.summary()[0]["shared"]
+        assert len(vertices) == 8 * shared and len(triangles) == 12 * shared
+        assert comparison.shared_mesh()[0] is vertices
+
+    def test_pages(self, visualizer):
+        """Designs are split into pages; each panel has a backdrop and a highlight trace."""
+        models = [visualizer.create_crate_model(dict(CRATE_DATA, height=30 + i)) for i in range(5)]
+        comparison = DesignComparison(models, page_size=2)
+        assert comparison.page_count == 3
+        pages = list(comparison.pages())
+        assert len(pages) == 3
+        assert [len(fig.data) for fig in pages] == [4, 4, 2]
+        assert pages[2].layout.annotations[0].text.startswith("Design 5 (")
+        with pytest.raises(ValueError):
+            comparison.page(3)
+
+    def test_manager_page(self):
+        """VisualizationManager.compare_designs returns one page when asked."""
+        manager = VisualizationManager({"platform": "web", "comparison_page_size": 2})
+        designs = [dict(CRATE_DATA, length=length) for length in (40, 48, 56)]
+        fig = manager.compare_designs(designs, page=1)
+        assert [annotation.text for annotation in fig.layout.annotations][0].startswith("Design 3")
+
+
+@pytest.fixture(scope="module")
+def design():
+    return calculate_nx_components(product_weight=1000, product_length=96, product_width=48,
+                                   product_height=30)
+
+
+class TestModelFromResults:
+    """Test models built from calculate_nx_components results."""
+
+    def test_box_counts_match_engine(self, visualizer, design):
+        """Skids, floorboards, panels, cleats and klimps come from the engine geometry."""
+        model = visualizer.create_model_from_results(design)
+        boxes = build_crate_boxes(design)
+        assert len(model.boxes[ComponentType.SKID]) == design["skids"]["skid_count"]
+        boards = [b for b in design["floorboards"]["floorboards_data"] if b["width"] > 0]
+        assert len(model.boxes[ComponentType.FLOORBOARD]) == len(boards)
+        for panel in ("FRONT", "BACK", "LEFT", "RIGHT", "TOP"):
+            assert len(model.boxes[ComponentType[f"{panel}_PANEL"]]) == 1
+        assert len(model.boxes[ComponentType.CLEAT]) == len(boxes["cleat"])
+        klimps = sum(len((p.get("klimps") or {}).get("positions", [])) for p in design["panels"].values())
+        assert len(model.boxes[ComponentType.KLIMP]) == klimps
+        assert model.component_count() == sum(len(box_set) for box_set in boxes.values())
+
+    def test_frame_conversion(self, visualizer, design):
+        """Engine Y becomes model X; the width runs from 0; sizes follow the axes."""
+        model = visualizer.create_model_from_results(design)
+        engine_low, engine_high = crate_bounds(build_crate_boxes(design))
+        low, high = model.get_bounding_box()
+        np.testing.assert_allclose(low, [engine_low[1], 0, engine_low[2]], atol=1e-9)
+        np.testing.assert_allclose(high, [engine_high[1], engine_high[0] - engine_low[0], engine_high[2]],
+                                   atol=1e-9)
+        assert model.width == design["dimensions"]["front_panel_width"]
+        assert model.height == pytest.approx(engine_high[2])
+        skids = model.boxes[ComponentType.SKID]
+        assert skids.sizes[:, 0] == pytest.approx(design["dimensions"]["front_panel_width"])
+        assert skids.sizes[:, 1] == pytest.approx(design["skids"]["skid_width"])
+
+    def test_boxes_match_engine_dimensions(self, visualizer, design):
+        """Panel, skid and floorboard sizes are the engine's, in the model's axes."""
+        model = visualizer.create_model_from_results(design)
+        dimensions = design["dimensions"]
+        thickness = design["inputs"]["panel_thickness"]
+        inside_length = dimensions["top_panel_length"] - 2 * dimensions["panel_total_thickness"]
+        assert (model.length, model.width) == (dimensions["top_panel_length"], dimensions["front_panel_width"])
+
+        def plywood_size(component_type):
+            (size,) = model.boxes[component_type].sizes
+            return size
+
+        for panel in ("FRONT", "BACK"):
+            np.testing.assert_allclose(plywood_size(ComponentType[f"{panel}_PANEL"]),
+                                       [thickness, dimensions["front_panel_width"], dimensions["front_panel_height"]])
+        for panel in ("LEFT", "RIGHT"):
+            np.testing.assert_allclose(plywood_size(ComponentType[f"{panel}_PANEL"]),
+                                       [inside_length, thickness, dimensions["left_panel_height"]])
+        np.testing.assert_allclose(plywood_size(ComponentType.TOP_PANEL),
+                                   [dimensions["top_panel_length"], dimensions["top_panel_width"], thickness])
+
+        skids = design["skids"]
+        for size in model.boxes[ComponentType.SKID].sizes:
+            np.testing.assert_allclose(size, [dimensions["front_panel_width"], skids["skid_width"],
+                                              skids["skid_height"]])
+        boards = [b["width"] for b in design["floorboards"]["floorboards_data"] if b["width"] > 0]
+        floor = model.boxes[ComponentType.FLOORBOARD].sizes
+        assert sorted(floor[:, 1]) == pytest.approx(sorted(boards))
+        assert floor[:, 0] == pytest.approx(inside_length)
+        assert floor[:, 2] == pytest.approx(design["inputs"]["floorboard_thickness"])
+
+    def test_dispatch_and_no_top(self, visualizer):
+        """create_crate_model recognises engine results; a crate without a top has no top panel."""
+        design = calculate_nx_components(product_weight=150, product_length=24, product_width=18,
+                                         product_height=14, include_top=False)
+        model = visualizer.create_crate_model(design)
+        assert visualizer.current_model is model
+        assert ComponentType.TOP_PANEL not in model.boxes
+        assert ComponentType.FRONT_PANEL in model.boxes
+
+
+class TestLevelOfDetail:
+    """Test level-of-detail tiers and occlusion culling."""
+
+    def test_tier_contents(self, visualizer, design):
+        """'far' has one slab per panel plus skids, 'mid' drops fasteners, 'near' is the model."""
+        model = visualizer.create_model_from_results(design)
+        far, mid = model.lod('far'), model.lod('mid')
+        assert model.lod('near') is model
+
+        panels = [t for t in model.boxes if t.value.endswith('_panel')]
+        assert set(far.boxes) == set(panels) | {ComponentType.SKID}
+        for component_type in panels:
+            slab = far.boxes[component_type]
+            assert len(slab) == 1
+            low, high = model.boxes[component_type].bounds()
+            np.testing.assert_allclose(slab.offsets[0], low)
+            np.testing.assert_allclose(slab.offsets[0] + slab.sizes[0], high)
+        assert far.boxes[ComponentType.SKID] is model.boxes[ComponentType.SKID]
+        assert far.assembly_sequence[:len(panels)] == [far.boxes[t].names[0] for t in panels]
+
+        assert set(mid.boxes) == set(model.boxes) - {ComponentType.KLIMP}
+        assert mid.component_count() == model.component_count() - len(model.boxes[ComponentType.KLIMP])
+
+    def test_tiers_cached_until_change(self, model):
+        """Tiers are built once per model version; unknown tiers are rejected."""
+        far = model.lod('far')
+        assert model.lod('far') is far
+        model.translate([0.0, 0.0, 1.0])
+        assert model.lod('far') is not far
+        with pytest.raises(ValueError):
+            model.lod('tiny')
+
+    def test_tier_from_rendered_size(self, visualizer, model):
+        """'auto' picks the tier from pixels per inch; a fixed tier overrides it."""
+        extent = (np.subtract(*model.get_bounding_box()[::-1])).max()
+        assert visualizer._lod_tier(model, extent * 5) == 'near'
+        assert visualizer._lod_tier(model, extent * 2) == 'mid'
+        assert visualizer._lod_tier(model, extent * 1) == 'far'
+        visualizer.level_of_detail = 'mid'
+        assert visualizer._lod_tier(model, extent * 5) == 'mid'
+
+    def test_occluded_from_above(self, model):
+        """Looking down, the top panel hides floorboards, skids and cleats but not the walls."""
+        hidden = model.occluded_boxes(np.array([0.0, 0.0, 1.0]))
+        assert set(hidden) == set(model.boxes)
+        for component_type in (ComponentType.FLOORBOARD, ComponentType.SKID, ComponentType.CLEAT):
+            assert hidden[component_type].all()
+        for component_type in (ComponentType.TOP_PANEL, ComponentType.LEFT_PANEL, ComponentType.FRONT_PANEL):
+            assert not hidden[component_type].any()
+
+    def test_occluded_from_front(self, model):
+        """Looking from the front, the front panel hides the back panel and floorboards, not the skids."""
+        hidden = model.occluded_boxes(np.array([0.0, -1.0, 0.0]))
+        assert hidden[ComponentType.BACK_PANEL].all()
+        assert hidden[ComponentType.FLOORBOARD].all()
+        assert not hidden[ComponentType.SKID].any()
+        assert not hidden[ComponentType.FRONT_PANEL].any()
+
+    def test_transparent_panels_hide_nothing(self, model):
+        """Panels that are not opaque do not occlude."""
+        hidden = model.view(ViewMode.TRANSPARENT).occluded_boxes(np.array([0.0, 0.0, 1.0]))
+        assert not any(mask.any() for mask in hidden.values())
+
+    def test_static_render_culls(self, visualizer, model):
+        """A static render draws fewer polygons than an interactive one."""
+        def polygons(fig):
+            fig.canvas.draw()
+            return sum(len(collection.get_paths()) for collection in fig.axes[0].collections)
+
+        interactive = visualizer.render_matplotlib(model, fig_size=(4, 3))
+        static = visualizer.render_matplotlib(model, fig_size=(4, 3), static=True)
+        assert 0 < polygons(static) < polygons(interactive)
+        matplotlib.pyplot.close('all')